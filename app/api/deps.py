@@ -4,6 +4,7 @@ from jose import JWTError, jwt
 from pydantic import ValidationError
 
 from app.core.config import settings
+from app.db.identity_map import get_document
 from app.models.user import User
 from app.schemas.token import TokenPayload
 from app.schemas.types import RoleType
@@ -65,7 +66,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
             headers={"WWW-Authenticate": "Bearer"},
         ) from e
 
-    user = await User.get(token_data.sub)
+    user = await get_document(User, token_data.sub)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -2,9 +2,13 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from loguru import logger
 
 from app.api.deps import get_current_user
+from app.clients.arq_client import get_arq
 from app.models.account import Account
 from app.models.user import User
 from app.schemas.account import AccountCreate, AccountRead, AccountUpdate
+from app.schemas.deletion import DeletionRead
+from app.schemas.types import DeletionResourceType
+from app.utils.deletion_utils import get_deletion_progress, save_deletion_progress
 
 router = APIRouter()
 
@@ -184,8 +188,11 @@ async def update_account(
 
 @router.delete(
     "/{account_id}",
-    status_code=status.HTTP_204_NO_CONTENT,
-    description="Delete an account under an organization.",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=DeletionRead,
+    description="Delete an account under an organization. Its sessions, messages, "
+    "artifacts, CRM records, embeddings and vector stores are deleted in the "
+    "background, poll `/{account_id}/deletion` to follow the progress.",
     responses={
         status.HTTP_404_NOT_FOUND: {
             "description": "Account could not be found within the organization."
@@ -204,6 +211,8 @@ async def delete_account(
     ):
         logger.info("Delete account request received.")
 
+        arq = await get_arq()
+
         # Check if account exists in the organization the current user is in
         account = await Account.find_one(
             Account.organization_id == current_user.organization_id,
@@ -217,6 +226,22 @@ async def delete_account(
             )
 
         try:
+            # Track and enqueue the cascade before deleting the account, so a
+            # failure leaves the account in place instead of orphaning its
+            # children. The cascade deletes the account again as its last step.
+            progress = DeletionRead(
+                resource=DeletionResourceType.ACCOUNT,
+                id=account.id,
+                organization_id=account.organization_id,
+            )
+            await save_deletion_progress(progress)
+            await arq.enqueue_job(
+                "delete_account_cascade",
+                account.id,
+                account.organization_id,
+                _queue_name="sessions",
+            )
+
             # Delete the account
             await account.delete()
             logger.success("Account deleted successfully.")
@@ -228,3 +253,37 @@ async def delete_account(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Error deleting account.",
             ) from e
+
+        return progress
+
+
+@router.get(
+    "/{account_id}/deletion",
+    response_model=DeletionRead,
+    description="Retrieve the progress of an account's background deletion.",
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Account deletion could not be found."
+        },
+    },
+)
+async def get_account_deletion(
+    account_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    with logger.contextualize(
+        user_id=current_user.id,
+        organization_id=current_user.organization_id,
+        account_id=account_id,
+    ):
+        logger.info("Retrieve account deletion request received.")
+
+        progress = await get_deletion_progress(DeletionResourceType.ACCOUNT, account_id)
+        if not progress or progress.organization_id != current_user.organization_id:
+            logger.warning("Account deletion could not be found.")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Account deletion could not be found.",
+            )
+
+        return progress
@@ -1,13 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import datetime as dt
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from loguru import logger
 
 from app.api.deps import get_current_user
 from app.clients.arq_client import get_arq
+from app.core.config import settings
 from app.models.account import Account
 from app.models.artifact import Artifact
 from app.models.session import Session
 from app.models.user import User
-from app.schemas.artifact import ArtifactCreate, ArtifactRead, ArtifactUpdate
+from app.schemas.artifact import (
+    ArtifactCreate,
+    ArtifactRead,
+    ArtifactSummaryRead,
+    ArtifactUpdate,
+)
+from app.schemas.types import ListFieldsType
+from app.utils.pagination_utils import paginate, set_page_headers
+from app.utils.streaming_utils import stream_ndjson, wants_ndjson
 
 router = APIRouter()
 
@@ -97,10 +108,12 @@ async def create_artifact(
 
 @router.get(
     "/",
-    response_model=list[ArtifactRead],
+    response_model=list[ArtifactRead] | list[ArtifactSummaryRead],
     status_code=status.HTTP_200_OK,
-    description="List artifacts.",
+    description="List artifacts, sorted from latest to oldest. "
+    "Send `Accept: application/x-ndjson` to stream every artifact as NDJSON instead.",
     responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid pagination cursor."},
         status.HTTP_404_NOT_FOUND: {
             "description": "Account does not exist or is not accessible."
         },
@@ -108,8 +121,20 @@ async def create_artifact(
 )
 async def list_artifacts(
     account_id: str,
+    request: Request,
+    response: Response,
     opportunity_id: str | None = None,
     contact_id: str | None = None,
+    limit: int = Query(100, ge=1, le=500),
+    before: str | None = Query(
+        None, description="Return artifacts older than this cursor"
+    ),
+    after: str | None = Query(
+        None, description="Return artifacts newer than this cursor"
+    ),
+    fields: ListFieldsType = Query(
+        ListFieldsType.FULL, description="'summary' leaves the artifact bodies out"
+    ),
     current_user: User = Depends(get_current_user),
 ):
     with logger.contextualize(
@@ -137,15 +162,80 @@ async def list_artifacts(
         if contact_id:
             query["contact_id"] = contact_id
 
-        artifacts = await Artifact.find(
+        artifacts_query = Artifact.find(
             Artifact.account_id == account_id,
             Artifact.organization_id == current_user.organization_id,
             query,
-        ).to_list()
+        )
+
+        schema = ArtifactRead
+        if fields == ListFieldsType.SUMMARY:
+            schema = ArtifactSummaryRead
+            artifacts_query = artifacts_query.project(ArtifactSummaryRead)
+
+        # Stream every artifact straight from the cursor in export mode
+        if wants_ndjson(request):
+            logger.info("Streaming artifacts as NDJSON.")
+            return stream_ndjson(
+                artifacts_query,
+                schema,
+                batch_size=settings.NDJSON_EXPORT_BATCH_SIZE,
+            )
+
+        try:
+            page = await paginate(
+                artifacts_query,
+                limit=limit,
+                before=before,
+                after=after,
+            )
+        except ValueError as e:
+            logger.warning(f"Invalid pagination cursor. {before=} {after=}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor.",
+            ) from e
 
-        logger.info(f"Found {len(artifacts)} artifacts.")
+        set_page_headers(response, page)
 
-        return artifacts
+        logger.info(f"Found {len(page.items)} artifacts.")
+
+        return page.items
+
+
+@router.get(
+    "/{artifact_id}",
+    response_model=ArtifactRead,
+    status_code=status.HTTP_200_OK,
+    description="Retrieve an artifact with its full body by its id.",
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "Artifact does not exist."},
+    },
+)
+async def get_artifact(
+    artifact_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    with logger.contextualize(
+        user_id=current_user.id,
+        organization_id=current_user.organization_id,
+        artifact_id=artifact_id,
+    ):
+        logger.info("Retrieve artifact request received.")
+
+        artifact = await Artifact.find_one(
+            Artifact.id == artifact_id,
+            Artifact.organization_id == current_user.organization_id,
+        )
+        if not artifact:
+            logger.warning(f"Artifact does not exist. {artifact_id=}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Artifact does not exist.",
+            )
+
+        logger.success("Artifact retrieved successfully.")
+        return artifact
 
 
 @router.patch(
@@ -166,6 +256,8 @@ async def update_artifact(
     current_user: User = Depends(get_current_user),
 ):
 
+    arq = await get_arq()
+
     with logger.contextualize(
         user_id=current_user.id, organization_id=current_user.organization_id
     ):
@@ -185,7 +277,17 @@ async def update_artifact(
 
         try:
             # Update the artifact
-            await artifact.set(artifact_in)
+            await artifact.set(
+                {
+                    **artifact_in.model_dump(),
+                    Artifact.updated_at: dt.datetime.now(dt.timezone.utc),
+                }
+            )
+            await arq.enqueue_job(
+                "post_artifact_update",
+                artifact.id,
+                _queue_name="artifacts",
+            )
             logger.success("Artifact updated successfully.")
         except Exception as e:
             logger.exception(
@@ -210,6 +312,8 @@ async def delete_artifact(
     artifact_id: str,
     current_user: User = Depends(get_current_user),
 ):
+    arq = await get_arq()
+
     with logger.contextualize(
         user_id=current_user.id,
         organization_id=current_user.organization_id,
@@ -229,6 +333,11 @@ async def delete_artifact(
         try:
             # Delete the artifact
             await artifact.delete()
+            await arq.enqueue_job(
+                "post_artifact_deletion",
+                artifact.id,
+                _queue_name="artifacts",
+            )
             logger.success("Session deleted successfully.")
         except Exception as e:
             logger.exception(
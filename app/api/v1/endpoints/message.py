@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from loguru import logger
 
 from app.api.deps import get_current_user
@@ -6,7 +6,9 @@ from app.models.account import Account
 from app.models.message import Message
 from app.models.session import Session
 from app.models.user import User
-from app.schemas.message import MessageRead
+from app.schemas.message import MessageRead, MessageSummaryRead
+from app.schemas.types import ListFieldsType
+from app.utils.pagination_utils import paginate, set_page_headers
 
 router = APIRouter()
 
@@ -14,8 +16,10 @@ router = APIRouter()
 @router.get(
     "/",
     response_model=list[MessageRead],
-    description="List messages in a session under an account, sorted from oldest to latest.",
+    description="List messages in a session under an account, sorted from oldest to latest. "
+    "Paginate with the cursors returned in the X-Before-Cursor and X-After-Cursor headers.",
     responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid pagination cursor."},
         status.HTTP_404_NOT_FOUND: {
             "description": "Account or session could not be found."
         },
@@ -24,10 +28,22 @@ router = APIRouter()
 async def list_messages(
     account_id: str,
     session_id: str,
+    response: Response,
+    limit: int = Query(150, ge=1, le=500),
+    before: str | None = Query(
+        None, description="Return messages older than this cursor"
+    ),
+    after: str | None = Query(
+        None, description="Return messages newer than this cursor"
+    ),
+    fields: ListFieldsType = Query(
+        ListFieldsType.FULL,
+        description="'summary' leaves tool payloads out of the assistant outputs",
+    ),
     current_user: User = Depends(get_current_user),
 ):
     """
-    Retrieve all messages for a given session in a given account.
+    Retrieve a page of messages for a given session in a given account.
 
     Parameters
     ----------
@@ -35,17 +51,29 @@ async def list_messages(
         The ID of the account containing the session.
     session_id : str
         The ID of the session to retrieve messages from.
+    response : Response
+        The response used to expose the pagination cursors.
+    limit : int
+        The maximum number of messages to return.
+    before : str | None
+        Only return messages older than this cursor.
+    after : str | None
+        Only return messages newer than this cursor.
+    fields : ListFieldsType
+        Whether to return the full messages or their summary projection.
     current_user : User
         The authenticated user making the request.
 
     Returns
     -------
     list[MessageRead]
-        List of messages sorted from oldest to latest, limited to 150 messages.
+        List of messages sorted from oldest to latest. Without a cursor, the
+        latest `limit` messages of the session are returned.
 
     Raises
     ------
     HTTPException
+        400 if a pagination cursor is invalid.
         404 if the account or session could not be found.
     """
     with logger.contextualize(
@@ -83,17 +111,65 @@ async def list_messages(
                 detail="Session could not be found.",
             )
 
-        # Retrieve messages for the session, sorted from oldest to latest, limited to 150
-        messages = (
-            await Message.find(
-                Message.session_id == session_id,
-                Message.account_id == account_id,
-                Message.organization_id == current_user.organization_id,
+        query = Message.find(
+            Message.session_id == session_id,
+            Message.account_id == account_id,
+            Message.organization_id == current_user.organization_id,
+        )
+        if fields == ListFieldsType.SUMMARY:
+            query = query.project(MessageSummaryRead)
+
+        # Retrieve a page of messages for the session, sorted from oldest to latest
+        try:
+            page = await paginate(
+                query,
+                limit=limit,
+                before=before,
+                after=after,
+                newest_first=False,
             )
-            .sort("created_at")  # Sort from oldest to latest
-            .limit(150)  # Limit to 150 messages
-            .to_list()
+        except ValueError as e:
+            logger.warning(f"Invalid pagination cursor. {before=} {after=}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor.",
+            ) from e
+
+        set_page_headers(response, page)
+
+        logger.success(f"Found {len(page.items)} messages for session.")
+        return page.items
+
+
+@router.get(
+    "/{message_id}",
+    response_model=MessageRead,
+    description="Retrieve a message with its full output by its id.",
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "Message could not be found."},
+    },
+)
+async def get_message(
+    message_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    with logger.contextualize(
+        user_id=current_user.id,
+        organization_id=current_user.organization_id,
+        message_id=message_id,
+    ):
+        logger.info("Retrieve message request received.")
+
+        message = await Message.find_one(
+            Message.id == message_id,
+            Message.organization_id == current_user.organization_id,
         )
+        if not message:
+            logger.warning("Message could not be found.")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Message could not be found.",
+            )
 
-        logger.success(f"Found {len(messages)} messages for session.")
-        return messages
+        logger.success("Message retrieved successfully.")
+        return message
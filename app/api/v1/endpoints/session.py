@@ -1,4 +1,14 @@
-from fastapi import APIRouter, Depends, UploadFile, HTTPException, File, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    UploadFile,
+    HTTPException,
+    File,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from loguru import logger
 
 from app.api.deps import get_current_user
@@ -11,8 +21,15 @@ from app.models.account import Account
 from app.models.assistant import Assistant
 from app.models.session import Session
 from app.models.user import User
+from app.schemas.deletion import DeletionRead
 from app.schemas.session import SessionCreate, SessionRead, SessionUpdate
+from app.schemas.types import DeletionResourceType, SessionSortType
+from app.clients.arq_client import get_arq
 from app.clients.openai_client import get_openai_async_client
+from app.core.config import settings
+from app.utils.deletion_utils import get_deletion_progress, save_deletion_progress
+from app.utils.pagination_utils import paginate, set_page_headers
+from app.utils.streaming_utils import stream_ndjson, wants_ndjson
 
 router = APIRouter()
 
@@ -109,13 +126,28 @@ async def create_session(
 @router.get(
     "/",
     response_model=list[SessionRead],
-    description="List sessions under an account.",
+    description="List sessions under an account, sorted from latest to oldest "
+    "creation or, with `sort=last_message_at`, from most to least recently active. "
+    "Send `Accept: application/x-ndjson` to stream every session as NDJSON instead.",
     responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid pagination cursor."},
         status.HTTP_404_NOT_FOUND: {"description": "Session could not be found."},
     },
 )
 async def list_sessions(
     account_id: str,
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    before: str | None = Query(
+        None, description="Return sessions older than this cursor"
+    ),
+    after: str | None = Query(
+        None, description="Return sessions newer than this cursor"
+    ),
+    sort: SessionSortType = Query(
+        SessionSortType.CREATED_AT, description="The date sessions are sorted by"
+    ),
     current_user: User = Depends(get_current_user),
 ):
     with logger.contextualize(
@@ -138,18 +170,41 @@ async def list_sessions(
                 detail="Account could not be found.",
             )
 
-        # Check if session exists
-        sessions = (
-            await Session.find(
-                Session.account_id == account.id,
-                Session.organization_id == current_user.organization_id,
-            )
-            .sort("-created_at")
-            .to_list()
+        query = Session.find(
+            Session.account_id == account.id,
+            Session.organization_id == current_user.organization_id,
         )
 
-        logger.success(f"Found {len(sessions)} sessions.")
-        return sessions
+        # Stream every session straight from the cursor in export mode
+        if wants_ndjson(request):
+            logger.info("Streaming sessions as NDJSON.")
+            return stream_ndjson(
+                query,
+                SessionRead,
+                batch_size=settings.NDJSON_EXPORT_BATCH_SIZE,
+                sort_field=sort.value,
+            )
+
+        # Retrieve a page of sessions, sorted from latest to oldest
+        try:
+            page = await paginate(
+                query,
+                limit=limit,
+                before=before,
+                after=after,
+                sort_field=sort.value,
+            )
+        except ValueError as e:
+            logger.warning(f"Invalid pagination cursor. {before=} {after=}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor.",
+            ) from e
+
+        set_page_headers(response, page)
+
+        logger.success(f"Found {len(page.items)} sessions.")
+        return page.items
 
 
 @router.get(
@@ -235,8 +290,11 @@ async def update_session(
 
 @router.delete(
     "/{session_id}",
-    description="Delete a session.",
-    status_code=status.HTTP_204_NO_CONTENT,
+    response_model=DeletionRead,
+    description="Delete a session. Its messages, artifacts, embeddings and vector "
+    "store are deleted in the background, poll `/{session_id}/deletion` to follow "
+    "the progress.",
+    status_code=status.HTTP_202_ACCEPTED,
     responses={
         status.HTTP_404_NOT_FOUND: {"description": "Session could not be found."},
     },
@@ -252,6 +310,8 @@ async def delete_session(
     ):
         logger.info("Delete session request received.")
 
+        arq = await get_arq()
+
         # Check if session exists.
         session = await Session.find_one(
             Session.id == session_id,
@@ -264,6 +324,23 @@ async def delete_session(
                 detail="Session could not be found.",
             )
         try:
+            # Track and enqueue the cascade before deleting the session, so a
+            # failure leaves the session in place instead of orphaning its
+            # children. The cascade deletes the session again as its last step.
+            progress = DeletionRead(
+                resource=DeletionResourceType.SESSION,
+                id=session.id,
+                organization_id=session.organization_id,
+            )
+            await save_deletion_progress(progress)
+            await arq.enqueue_job(
+                "delete_session_cascade",
+                session.id,
+                session.organization_id,
+                session.vector_store_id,
+                _queue_name="sessions",
+            )
+
             await session.delete()
             logger.success("Session deleted successfully.")
         except Exception as e:
@@ -275,6 +352,40 @@ async def delete_session(
                 detail="Error deleting session.",
             ) from e
 
+        return progress
+
+
+@router.get(
+    "/{session_id}/deletion",
+    response_model=DeletionRead,
+    description="Retrieve the progress of a session's background deletion.",
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Session deletion could not be found."
+        },
+    },
+)
+async def get_session_deletion(
+    session_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    with logger.contextualize(
+        user_id=current_user.id,
+        organization_id=current_user.organization_id,
+        session_id=session_id,
+    ):
+        logger.info("Retrieve session deletion request received.")
+
+        progress = await get_deletion_progress(DeletionResourceType.SESSION, session_id)
+        if not progress or progress.organization_id != current_user.organization_id:
+            logger.warning("Session deletion could not be found.")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Session deletion could not be found.",
+            )
+
+        return progress
+
 
 @router.post(
     "/{session_id}/file",
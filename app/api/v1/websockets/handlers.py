@@ -7,6 +7,7 @@ from app.models.session import Session
 from app.models.user import User
 from app.schemas.message import IngestMessageSchema
 from app.schemas.types import SenderType
+from app.utils.session_utils import record_session_messages
 from app.utils.websocket.handlers import register_handler
 
 
@@ -44,6 +45,9 @@ async def ingest_message(connection_id: str, user: User, data: IngestMessageSche
             embed_after_insert=True,
         )
         await new_message.insert()
+        await record_session_messages(
+            session.id, SenderType.USER, 1, new_message.created_at
+        )
         await arq.enqueue_job(
             "post_message_creation",
             new_message.id,
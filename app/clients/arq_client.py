@@ -1,7 +1,13 @@
 import asyncio
 
+from typing import Any, Iterable
+from uuid import uuid4
+
 from arq import create_pool
 from arq.connections import ArqRedis, RedisSettings
+from arq.constants import job_key_prefix
+from arq.jobs import Job, serialize_job
+from arq.utils import timestamp_ms
 from loguru import logger
 
 from app.core.config import settings
@@ -29,6 +35,62 @@ async def get_arq() -> ArqRedis:
     return _arq_redis
 
 
+async def enqueue_jobs(
+    arq: ArqRedis, function: str, args_list: Iterable[tuple[Any, ...]], queue_name: str
+) -> list[Job]:
+    """
+    Enqueue several jobs of the same function in a single pipelined Redis call.
+
+    Unlike `ArqRedis.enqueue_job`, this does not check for existing jobs with the
+    same ID, every job is given a fresh ID.
+
+    Parameters
+    ----------
+    arq : ArqRedis
+        The ARQ Redis pool.
+    function : str
+        Name of the function to call.
+    args_list : Iterable[tuple]
+        The positional arguments of each job.
+    queue_name : str
+        The queue the jobs are enqueued in.
+
+    Returns
+    -------
+    list[Job]
+        The enqueued jobs.
+    """
+    jobs = []
+    enqueue_time_ms = timestamp_ms()
+
+    async with arq.pipeline(transaction=True) as pipe:
+        for args in args_list:
+            job_id = uuid4().hex
+            job = serialize_job(
+                function,
+                args,
+                {},
+                None,
+                enqueue_time_ms,
+                serializer=arq.job_serializer,
+            )
+            pipe.psetex(job_key_prefix + job_id, arq.expires_extra_ms, job)
+            pipe.zadd(queue_name, {job_id: enqueue_time_ms})
+            jobs.append(
+                Job(
+                    job_id,
+                    redis=arq,
+                    _queue_name=queue_name,
+                    _deserializer=arq.job_deserializer,
+                )
+            )
+
+        if jobs:
+            await pipe.execute()
+
+    return jobs
+
+
 async def close_arq_pool():
     """
     Close the ARQ Redis pool and reset the global variable.
@@ -0,0 +1,53 @@
+from loguru import logger
+
+from app.core.config import settings
+from app.embedding_providers.base import EmbeddingProvider
+
+
+class EmbeddingProviderSingleton:
+    """
+    Singleton class for managing the embedding provider of the process.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            match settings.EMBEDDING_PROVIDER:
+                case "openai":
+                    from app.embedding_providers.openai_provider import (
+                        OpenAIEmbeddingProvider,
+                    )
+
+                    cls._instance = OpenAIEmbeddingProvider(
+                        dimensions=settings.EMBEDDING_DIMENSIONS
+                    )
+                case "hashing":
+                    from app.embedding_providers.hashing_provider import (
+                        HashingEmbeddingProvider,
+                    )
+
+                    cls._instance = HashingEmbeddingProvider(
+                        dimensions=settings.EMBEDDING_DIMENSIONS
+                    )
+                case _:
+                    raise ValueError(
+                        f"Unknown embedding provider: {settings.EMBEDDING_PROVIDER}"
+                    )
+            logger.success(
+                f"Embedding provider initialized with the '{cls._instance.model}' "
+                f"model and {cls._instance.dimensions} dimensions"
+            )
+        return cls._instance
+
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """
+    Get the embedding provider of the process.
+
+    Returns
+    -------
+    EmbeddingProvider
+        The embedding provider selected by `EMBEDDING_PROVIDER`.
+    """
+    return EmbeddingProviderSingleton()
@@ -0,0 +1,191 @@
+import threading
+
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from pymongo.read_preferences import ReadPreference
+
+from app.core.config import settings
+
+READ_PREFERENCES = {
+    read_preference.mongos_mode: read_preference
+    for read_preference in (
+        ReadPreference.PRIMARY,
+        ReadPreference.PRIMARY_PREFERRED,
+        ReadPreference.SECONDARY,
+        ReadPreference.SECONDARY_PREFERRED,
+        ReadPreference.NEAREST,
+    )
+}
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    Connection pool listener keeping counters of the Motor client's pools.
+
+    Events are published from pymongo's background threads, so counters are
+    updated under a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open_connections = 0
+        self.checked_out_connections = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.total_checkout_wait = 0.0
+        self.max_checkout_wait = 0.0
+
+    def snapshot(self) -> dict:
+        """
+        Return the current values of the pool metrics.
+
+        Returns
+        -------
+        dict
+            The pool metrics, wait times are in milliseconds.
+        """
+        with self._lock:
+            return {
+                "open_connections": self.open_connections,
+                "checked_out_connections": self.checked_out_connections,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "avg_checkout_wait_ms": (
+                    self.total_checkout_wait / self.checkouts * 1000
+                    if self.checkouts
+                    else 0.0
+                ),
+                "max_checkout_wait_ms": self.max_checkout_wait * 1000,
+            }
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections -= 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checked_out_connections += 1
+            self.checkouts += 1
+            self.total_checkout_wait += event.duration
+            self.max_checkout_wait = max(self.max_checkout_wait, event.duration)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out_connections -= 1
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+
+pool_metrics = PoolMetricsListener()
+
+
+class MongoClientSingleton:
+    """
+    Singleton class for managing the process wide asynchronous Motor client.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            if not settings.MONGODB_URL:
+                logger.warning("MONGODB_URL is not set. Using default MongoDB URL.")
+                mongodb_url = "mongodb://localhost:27017"
+            else:
+                mongodb_url = str(settings.MONGODB_URL)
+
+            options = {
+                "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+                "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+                "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+                "connectTimeoutMS": settings.MONGODB_CONNECT_TIMEOUT_MS,
+                "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+                "waitQueueTimeoutMS": settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+            }
+            if settings.MONGODB_COMPRESSORS:
+                options["compressors"] = settings.MONGODB_COMPRESSORS
+
+            try:
+                cls._instance = AsyncIOMotorClient(
+                    mongodb_url, event_listeners=[pool_metrics], **options
+                )
+                logger.success("Asynchronous Motor client initialized")
+            except Exception as e:
+                logger.exception(f"Error initializing Motor client: {str(e)}")
+                raise
+        return cls._instance
+
+
+def get_mongo_async_client():
+    """
+    Get the shared asynchronous Motor client.
+
+    Returns
+    -------
+    AsyncIOMotorClient
+        An asynchronous Motor client instance.
+    """
+    return MongoClientSingleton()
+
+
+def get_listing_read_preference():
+    """
+    Get the read preference used by the listing endpoints.
+
+    Returns
+    -------
+    pymongo.read_preferences._ServerMode
+        The read preference configured by `MONGODB_LISTING_READ_PREFERENCE`.
+
+    Raises
+    ------
+    ValueError
+        If the configured read preference is unknown.
+    """
+    name = settings.MONGODB_LISTING_READ_PREFERENCE
+    if name not in READ_PREFERENCES:
+        raise ValueError(
+            f"Unknown read preference '{name}'. Expected one of {list(READ_PREFERENCES)}"
+        )
+    return READ_PREFERENCES[name]
+
+
+def get_pool_metrics() -> dict:
+    """
+    Get the connection pool metrics of the shared Motor client.
+
+    Returns
+    -------
+    dict
+        The pool configuration and its current metrics.
+    """
+    return {
+        "max_pool_size": settings.MONGODB_MAX_POOL_SIZE,
+        "min_pool_size": settings.MONGODB_MIN_POOL_SIZE,
+        **pool_metrics.snapshot(),
+    }
@@ -86,6 +86,46 @@ class AsyncRedisClient:
                 logger.warning(f"Error closing async Redis connection: {str(e)}")
 
 
+class AsyncBinaryRedisClient:
+    """
+    Singleton class for managing an asynchronous Redis client returning raw
+    bytes, used to store binary values like packed embeddings.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            try:
+                cls._instance = aioredis.Redis(
+                    host=settings.REDIS_HOST,
+                    port=settings.REDIS_PORT,
+                    db=settings.REDIS_DB,
+                    decode_responses=False,
+                    password=settings.REDIS_PASSWORD,
+                )
+                logger.success("Asynchronous binary Redis client initialized")
+            except Exception as e:
+                logger.exception(
+                    f"Error initializing async binary Redis client: {str(e)}"
+                )
+                raise
+        return cls._instance
+
+    @staticmethod
+    async def close():
+        """
+        Close the asynchronous binary Redis connection.
+        """
+        if AsyncBinaryRedisClient._instance is not None:
+            try:
+                await AsyncBinaryRedisClient._instance.close()
+                AsyncBinaryRedisClient._instance = None
+                logger.success("Asynchronous binary Redis connection closed")
+            except Exception as e:
+                logger.warning(f"Error closing async binary Redis connection: {str(e)}")
+
+
 def get_redis_client():
     """
     Get a synchronous Redis client instance.
@@ -110,6 +150,18 @@ async def get_redis_async_client():
     return AsyncRedisClient()
 
 
+async def get_redis_async_binary_client():
+    """
+    Get an asynchronous Redis client instance returning raw bytes.
+
+    Returns
+    -------
+    redis.asyncio.Redis
+        An asynchronous Redis client instance without response decoding.
+    """
+    return AsyncBinaryRedisClient()
+
+
 async def close_redis_connections():
     """
     Close all Redis connections.
@@ -118,3 +170,4 @@ async def close_redis_connections():
     """
     RedisClient.close()
     await AsyncRedisClient.close()
+    await AsyncBinaryRedisClient.close()
@@ -0,0 +1,55 @@
+from loguru import logger
+
+from app.core.config import settings
+from app.vector_stores.base import VectorStore
+
+
+class VectorStoreSingleton:
+    """
+    Singleton class for managing the vector store of the process.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            match settings.VECTOR_STORE_BACKEND:
+                case "qdrant":
+                    from app.vector_stores.qdrant_store import QdrantVectorStore
+
+                    cls._instance = QdrantVectorStore()
+                case "numpy":
+                    from app.vector_stores.numpy_store import NumpyVectorStore
+
+                    cls._instance = NumpyVectorStore()
+                case _:
+                    raise ValueError(
+                        f"Unknown vector store backend: {settings.VECTOR_STORE_BACKEND}"
+                    )
+            logger.success(
+                f"Vector store initialized with the '{settings.VECTOR_STORE_BACKEND}' backend"
+            )
+        return cls._instance
+
+
+def get_vector_store() -> VectorStore:
+    """
+    Get the vector store of the process.
+
+    Returns
+    -------
+    VectorStore
+        The vector store selected by `VECTOR_STORE_BACKEND`.
+    """
+    return VectorStoreSingleton()
+
+
+async def close_vector_store():
+    """
+    Flush the pending writes of the vector store.
+
+    This function should be called during worker shutdown so no buffered
+    point is lost.
+    """
+    if VectorStoreSingleton._instance is not None:
+        await VectorStoreSingleton._instance.close()
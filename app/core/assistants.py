@@ -1,19 +1,28 @@
+import asyncio
 import pprint
 
 from agents import Agent, FileSearchTool, RunContextWrapper, WebSearchTool
 from agents.mcp.server import MCPServerStdio
 from loguru import logger
-from qdrant_client.models import FieldCondition, Filter, MatchValue
+from qdrant_client.models import FieldCondition, Filter, MatchValue, ScoredPoint
 
 from app.core.config import settings
 from app.external.ai_service import create_summary_for_search, get_embeddings
+from app.models.artifact import Artifact
 from app.models.assistant import Assistant
+from app.models.message import Message
 from app.models.session import Session
 from app.models.user import User
 from app.schemas.agent_context import AgentContext, InstructionsContext
 from app.schemas.types import SenderType
 from app.utils.prompt_utils import render_prompt_template
-from app.utils.qdrant_utils import search_vectors
+from app.utils.qdrant_utils import (
+    fetch_point_documents,
+    hybrid_search_vectors,
+    search_vector_groups,
+    search_vectors,
+)
+from app.utils.rerank_utils import collapse_chunks, flatten_groups, mmr_rerank
 from app.utils.tool_utils import get_tool
 
 
@@ -126,12 +135,15 @@ class AssistantsManager:
             search_query = await create_summary_for_search(context.history)
             logger.info(f"Search query: {search_query}")
 
-            # Fetch related objects
-            related_artifacts = await self._search_related_artifacts(
-                search_query, context.account.id
-            )
-            related_messages = await self._search_related_messages(
-                search_query, context.account.id, context.session.id
+            # Fetch related objects, both searches share the same embedding
+            query_embedding = await get_embeddings(search_query)
+            related_artifacts, related_messages = await asyncio.gather(
+                self._search_related_artifacts(
+                    search_query, query_embedding, context.account.id
+                ),
+                self._search_related_messages(
+                    query_embedding, context.account.id, context.session.id
+                ),
             )
             logger.debug(f"Related artifacts: {pprint.pformat(related_artifacts)}")
             logger.debug(f"Related messages: {pprint.pformat(related_messages)}")
@@ -147,41 +159,58 @@ class AssistantsManager:
                 related_messages=related_messages,
             )
 
-    def _parse_related_artifacts(self, artifacts: list[dict]) -> list[dict]:
+    def _parse_related_artifacts(
+        self, artifacts: list[ScoredPoint], documents: dict[str, Artifact]
+    ) -> list[dict]:
         """
         Parse the related artifacts into a list of dictionaries.
         """
         related_artifacts = []
         for artifact in artifacts:
+            document = documents.get(artifact.payload["id"])
+            if document is None:
+                continue
+
             related_artifacts.append(
                 {
-                    "id": artifact.id,
-                    "title": artifact.payload["title"],
-                    "body": artifact.payload["body"],
-                    "type": artifact.payload["type"],
+                    "id": document.id,
+                    "title": document.title,
+                    "body": document.body,
+                    "type": document.type,
                 }
             )
         return related_artifacts
 
-    def _parse_related_messages(self, messages: list[dict]) -> list[dict]:
+    def _parse_related_messages(
+        self, messages: list[ScoredPoint], documents: dict[str, Message]
+    ) -> list[dict]:
         """
         Parse the related messages into a list of dictionaries.
         """
         related_messages = []
         for message in messages:
             data = {
-                "id": message.id,
+                "id": message.payload["id"],
                 "sender": message.payload["sender"],
             }
 
-            if data["sender"] == SenderType.USER.value:
+            # User messages are short enough to be read from the payload preview
+            if data["sender"] == SenderType.USER.value and "preview" in message.payload:
+                data["content"] = message.payload["preview"]
+                related_messages.append(data)
+                continue
+
+            document = documents.get(data["id"])
+            if document is None:
+                continue
+
+            if document.sender == SenderType.USER:
+                content = document.input["content"]
                 data["content"] = (
-                    message.payload["input"]["content"][:150] + "..."
-                    if len(message.payload["input"]["content"]) > 150
-                    else message.payload["input"]["content"]
+                    content[:150] + "..." if len(content) > 150 else content
                 )
             else:
-                data["content"] = message.payload["output"]
+                data["content"] = dict(document.output)
                 data["content"].pop("id", None)
                 data["content"].pop("annotations", None)
 
@@ -209,15 +238,18 @@ class AssistantsManager:
         }
 
     async def _search_related_artifacts(
-        self, search_query: str, account_id: str
+        self, search_query: str, query_embedding: list[float], account_id: str
     ) -> list[dict]:
         """
         Search for related artifacts in the database.
+
+        Long artifacts are indexed by chunk, only their best chunk is kept.
         """
-        related_artifacts = await search_vectors(
+        related_artifacts = await hybrid_search_vectors(
             collection_name="Artifacts",
-            query_embedding=await get_embeddings(search_query),
-            top_k=10,
+            query_embedding=query_embedding,
+            query_text=search_query,
+            top_k=10 * settings.CHUNK_SEARCH_OVERSAMPLING,
             score_threshold=settings.RELATED_ARTIFACTS_SCORE_THRESHOLD,
             filter=Filter(
                 must=[
@@ -230,21 +262,27 @@ class AssistantsManager:
                     ),
                 ],
             ),
+            with_payload=["id"],
         )
-        return self._parse_related_artifacts(related_artifacts)
+        related_artifacts = collapse_chunks(related_artifacts, limit=10)
+        documents = await fetch_point_documents(Artifact, related_artifacts)
+        return self._parse_related_artifacts(related_artifacts, documents)
 
     async def _search_related_messages(
-        self, search_query: str, account_id: str, session_id: str
+        self, query_embedding: list[float], account_id: str, session_id: str
     ) -> list[dict]:
         """
         Search for related messages in the database.
+
+        Messages are optionally grouped by session, so a single old session
+        cannot fill the context, and reranked with MMR to skip near duplicates.
+        Long messages are indexed by chunk, only their best chunk is kept.
         """
-        related_messages = await search_vectors(
-            collection_name="Messages",
-            query_embedding=await get_embeddings(search_query),
-            top_k=20,
-            score_threshold=settings.RELATED_MESSAGES_SCORE_THRESHOLD,
-            filter=Filter(
+        search = {
+            "collection_name": "Messages",
+            "query_embedding": query_embedding,
+            "score_threshold": settings.RELATED_MESSAGES_SCORE_THRESHOLD,
+            "filter": Filter(
                 must=[
                     FieldCondition(
                         key="account_id", match=MatchValue(value=account_id)
@@ -254,8 +292,46 @@ class AssistantsManager:
                     FieldCondition(key="session_id", match=MatchValue(value=session_id))
                 ],
             ),
+            "with_payload": ["id", "sender", "preview"],
+            "with_vectors": settings.RELATED_MESSAGES_MMR,
+        }
+        if settings.RELATED_MESSAGES_GROUP_BY_SESSION:
+            groups = await search_vector_groups(
+                group_by="session_id",
+                group_size=settings.RELATED_MESSAGES_PER_SESSION,
+                limit=settings.RELATED_MESSAGES_MAX_SESSIONS,
+                **search,
+            )
+            related_messages = collapse_chunks(flatten_groups(groups))
+        else:
+            related_messages = await search_vectors(
+                top_k=settings.RELATED_MESSAGES_TOP_K
+                * settings.CHUNK_SEARCH_OVERSAMPLING,
+                **search,
+            )
+            related_messages = collapse_chunks(
+                related_messages, limit=settings.RELATED_MESSAGES_TOP_K
+            )
+
+        if settings.RELATED_MESSAGES_MMR:
+            related_messages = mmr_rerank(
+                query_embedding,
+                related_messages,
+                top_k=settings.RELATED_MESSAGES_MMR_TOP_K,
+                lambda_=settings.RELATED_MESSAGES_MMR_LAMBDA,
+            )
+
+        # Only fetch the messages whose content is not in the payload preview
+        documents = await fetch_point_documents(
+            Message,
+            [
+                message
+                for message in related_messages
+                if message.payload["sender"] != SenderType.USER.value
+                or "preview" not in message.payload
+            ],
         )
-        return self._parse_related_messages(related_messages)
+        return self._parse_related_messages(related_messages, documents)
 
     def get_tools(self, assistant: Assistant, session: Session) -> list:
         """
@@ -34,10 +34,32 @@ class Settings(BaseSettings):
     # MongoDB
     MONGODB_URL: str | None = None
     MONGODB_DB_NAME: str = "journeyai"
+    MONGODB_REPORT_QUERY_PLANS: bool = True
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_MAX_IDLE_TIME_MS: int | None = None
+    MONGODB_CONNECT_TIMEOUT_MS: int = 20000
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 30000
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int | None = None
+    MONGODB_COMPRESSORS: str | None = None  # e.g. "zstd,snappy"
+    MONGODB_LISTING_READ_PREFERENCE: str = "secondaryPreferred"
+
+    # Vector store
+    VECTOR_STORE_BACKEND: str = "qdrant"  # "qdrant" or the in-process "numpy"
 
     # Qdrant
     QDRANT_URL: str | None = None
     QDRANT_API_KEY: str | None = None
+    QDRANT_VECTORS_ON_DISK: bool = False
+    QDRANT_QUANTIZATION: str | None = None  # "scalar" or "binary"
+    QDRANT_QUANTIZATION_ALWAYS_RAM: bool = True
+    QDRANT_QUANTIZATION_RESCORE: bool = True
+    QDRANT_QUANTIZATION_OVERSAMPLING: float = 2.0
+    QDRANT_HNSW_M: int = 16
+    QDRANT_HNSW_EF_CONSTRUCT: int = 100
+    QDRANT_UPSERT_BATCH_SIZE: int = 64
+    QDRANT_UPSERT_FLUSH_INTERVAL_MS: int = 200
+    EMBEDDING_WORKER_MAX_JOBS: int = 64  # Concurrent jobs sharing an upsert batch
 
     # Redis
     REDIS_HOST: str = "localhost"
@@ -58,11 +80,53 @@ class Settings(BaseSettings):
     # MCP Keys
     SEARCH1_API_KEY: str | None = None
 
+    # Listing
+    NDJSON_EXPORT_BATCH_SIZE: int = 500
+
+    # Deletion
+    DELETION_PROGRESS_TTL_SECONDS: int = 60 * 60 * 24
+
+    # Embeddings
+    EMBEDDING_PROVIDER: str = "openai"  # "openai" or "hashing" (offline, for tests)
+    # Size of the embeddings and of the Qdrant collections, text-embedding-3-small
+    # supports up to 1536. Changing it requires re-indexing the collections.
+    EMBEDDING_DIMENSIONS: int = 1536
+    EMBEDDING_BATCH_SIZE: int = 64  # Inputs per embeddings call
+    EMBEDDING_BATCH_MAX_CHARACTERS: int = 500_000  # Keeps calls under the token limit
+    EMBEDDING_COALESCE_WINDOW_MS: int = 5
+
+    # Chunking
+    CHUNK_MAX_TOKENS: int = 512
+    CHUNK_OVERLAP_TOKENS: int = 64
+    # Chunks fetched per requested document, several can belong to one document
+    CHUNK_SEARCH_OVERSAMPLING: int = 3
+
+    # Embedding Cache
+    EMBEDDING_CACHE_ENABLED: bool = True
+    # Entries are refreshed on read, set Redis' maxmemory-policy to volatile-lru
+    # to evict the least recently used embeddings first under memory pressure.
+    EMBEDDING_CACHE_TTL_SECONDS: int = 60 * 60 * 24 * 7
+
     # Similarity Search Thresholds
     RELATED_ARTIFACTS_SCORE_THRESHOLD: float = 0.4
     RELATED_MESSAGES_SCORE_THRESHOLD: float = 0.4
     SEARCH_ARTIFACTS_SCORE_THRESHOLD: float = 0.5
 
+    # Hybrid Search
+    # Sparse candidates are not held to the dense score threshold, so they need
+    # a BM25 score of their own to keep matches on common terms out
+    HYBRID_SPARSE_SCORE_THRESHOLD: float = 1.0
+    HYBRID_SPARSE_MAX_CANDIDATES: int = 20
+
+    # Related Messages Retrieval
+    RELATED_MESSAGES_TOP_K: int = 20
+    RELATED_MESSAGES_GROUP_BY_SESSION: bool = True
+    RELATED_MESSAGES_PER_SESSION: int = 3
+    RELATED_MESSAGES_MAX_SESSIONS: int = 5
+    RELATED_MESSAGES_MMR: bool = True
+    RELATED_MESSAGES_MMR_TOP_K: int = 10
+    RELATED_MESSAGES_MMR_LAMBDA: float = 0.7  # 1.0 is pure relevance
+
     class Config:
         case_sensitive = True
         extra = "allow"
@@ -1,8 +1,8 @@
 from loguru import logger
 
+from app.clients.vector_store_client import get_vector_store
 from app.core.config import settings
-from app.db.init_mongo import init_db
-from app.db.init_qdrant import init_qdrant_db
+from app.db.init_mongo import init_db, report_query_plans
 from app.utils.loki_logger import setup_logger
 from app.utils.prompt_utils import insert_preloaded_assistant
 from app.utils.websocket.redis_listener import start_redis_listener
@@ -26,8 +26,8 @@ async def initialize_app():
     """
     Initialize the main application.
 
-    This function sets up the Loki logger, initializes the MongoDB and Qdrant
-    databases, and starts the Redis listener for WebSocket messages.
+    This function sets up the Loki logger, initializes the MongoDB database and
+    the vector store, and starts the Redis listener for WebSocket messages.
     """
     await setup_loki_logger()
 
@@ -37,9 +37,13 @@ async def initialize_app():
     await init_db()
     logger.success("Database initialized successfully")
 
-    logger.info("Initializing Qdrant database...")
-    await init_qdrant_db()
-    logger.success("Qdrant database initialized successfully")
+    if settings.MONGODB_REPORT_QUERY_PLANS:
+        logger.info("Reporting query plans...")
+        await report_query_plans()
+
+    logger.info("Initializing vector store...")
+    await get_vector_store().initialize()
+    logger.success("Vector store initialized successfully")
 
     logger.info("Starting Redis listener...")
     await start_redis_listener()
@@ -60,8 +64,8 @@ async def initialize_worker(name: str):
     """
     Initialize a worker group.
 
-    This function sets up the Loki logger and initializes the MongoDB and Qdrant
-    databases for a specific worker group.
+    This function sets up the Loki logger and initializes the MongoDB database and
+    the vector store for a specific worker group.
 
     Parameters
     ----------
@@ -76,6 +80,6 @@ async def initialize_worker(name: str):
     await init_db()
     logger.success("Database initialized successfully")
 
-    logger.info("Initializing Qdrant database...")
-    await init_qdrant_db()
-    logger.success("Qdrant database initialized successfully")
+    logger.info("Initializing vector store...")
+    await get_vector_store().initialize()
+    logger.success("Vector store initialized successfully")
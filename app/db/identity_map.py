@@ -0,0 +1,145 @@
+"""
+Job scoped identity map for Beanie documents.
+
+Documents fetched by id through `get_document` are cached for the duration of
+the current scope, and concurrent fetches of the same model are batched into a
+single `$in` query. Scopes are opened by the ARQ tasks that fetch the same
+documents several times; API requests fetch each document once and run
+outside of any scope.
+"""
+
+import asyncio
+import contextlib
+import functools
+from contextvars import ContextVar
+from typing import Callable, TypeVar
+
+from beanie import Document
+from beanie.operators import In
+
+DocumentType = TypeVar("DocumentType", bound=Document)
+
+_current_identity_map: ContextVar["IdentityMap | None"] = ContextVar(
+    "identity_map", default=None
+)
+
+
+class IdentityMap:
+    """
+    Cache of documents keyed by model and id, with batched loading.
+    """
+
+    def __init__(self):
+        self._futures: dict[tuple[type[Document], str], asyncio.Future] = {}
+        self._pending: dict[type[Document], list[str]] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def get(self, model: type[DocumentType], id: str) -> DocumentType | None:
+        """
+        Get a document by its id, fetching it with the other pending ids of
+        the same model if it is not cached yet.
+
+        Parameters
+        ----------
+        model : type[Document]
+            The document model to fetch.
+        id : str
+            The ID of the document.
+
+        Returns
+        -------
+        Document | None
+            The cached instance of the document, or None if it does not exist.
+        """
+        key = (model, id)
+        if key not in self._futures:
+            self._futures[key] = asyncio.get_running_loop().create_future()
+
+            # The first id of a batch schedules the flush of the whole batch
+            if model not in self._pending:
+                self._pending[model] = []
+                task = asyncio.create_task(self._flush(model))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            self._pending[model].append(id)
+
+        return await asyncio.shield(self._futures[key])
+
+    async def _flush(self, model: type[Document]):
+        """
+        Fetch every pending id of a model with one `$in` query.
+        """
+        # Let the other coroutines of this loop iteration join the batch
+        await asyncio.sleep(0)
+
+        ids = self._pending.pop(model)
+        try:
+            documents = await model.find(In(model.id, ids)).to_list()
+        except Exception as e:
+            for id in ids:
+                future = self._futures.pop((model, id))
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        documents_by_id = {document.id: document for document in documents}
+        for id in ids:
+            future = self._futures[(model, id)]
+            if not future.done():
+                future.set_result(documents_by_id.get(id))
+
+
+@contextlib.contextmanager
+def identity_map_scope():
+    """
+    Open a new identity map for the current job.
+
+    Yields
+    ------
+    IdentityMap
+        The identity map of the scope.
+    """
+    identity_map = IdentityMap()
+    token = _current_identity_map.set(identity_map)
+    try:
+        yield identity_map
+    finally:
+        _current_identity_map.reset(token)
+
+
+def with_identity_map(func: Callable) -> Callable:
+    """
+    Decorator running an ARQ task within its own identity map scope.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        with identity_map_scope():
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
+async def get_document(model: type[DocumentType], id: str) -> DocumentType | None:
+    """
+    Get a document by its id through the current identity map.
+
+    Falls back to a plain `get` when called outside of an identity map scope.
+
+    Parameters
+    ----------
+    model : type[Document]
+        The document model to fetch.
+    id : str
+        The ID of the document.
+
+    Returns
+    -------
+    Document | None
+        The document, or None if it does not exist.
+    """
+    identity_map = _current_identity_map.get()
+    if identity_map is None:
+        return await model.get(id)
+
+    return await identity_map.get(model, id)
@@ -1,7 +1,9 @@
 from beanie import init_beanie
+from beanie.odm.queries.find import FindMany
 from loguru import logger
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING
 
+from app.clients.mongo_client import get_mongo_async_client
 from app.core.config import settings
 from app.models.account import Account
 from app.models.artifact import Artifact
@@ -15,16 +17,12 @@ from app.models.user import User
 
 async def init_db():
     """
-    Initialize database connection and register document models
-    """
-    if not settings.MONGODB_URL:
-        logger.warning("MONGODB_URL is not set. Using default MongoDB URL.")
-        mongodb_url = "mongodb://localhost:27017"
-    else:
-        mongodb_url = str(settings.MONGODB_URL)
+    Initialize database connection and register document models.
 
-    # Create motor client
-    client = AsyncIOMotorClient(mongodb_url)
+    Beanie creates the indexes declared on each model's `Settings` while
+    registering the document models.
+    """
+    client = get_mongo_async_client()
 
     # Initialize beanie with the document models
     await init_beanie(
@@ -43,3 +41,94 @@ async def init_db():
     )
 
     logger.info("Database initialized successfully")
+
+
+def _get_hot_queries() -> dict[str, FindMany]:
+    """
+    Build the queries issued on the hot paths of the API and workers.
+
+    The filter values are placeholders, only the shape of the query matters
+    to the query planner.
+    """
+    return {
+        "fetch_message_history": Message.find(Message.session_id == "")
+        .sort("-created_at")
+        .limit(100),
+        "list_messages": Message.find(
+            Message.session_id == "",
+            Message.account_id == "",
+            Message.organization_id == "",
+        )
+        .sort([("created_at", DESCENDING), ("_id", DESCENDING)])
+        .limit(150),
+        "first_user_messages": Message.find(
+            Message.session_id == "", Message.sender == "user"
+        )
+        .sort([("created_at", ASCENDING)])
+        .limit(2),
+        "list_sessions": Session.find(
+            Session.account_id == "", Session.organization_id == ""
+        )
+        .sort([("created_at", DESCENDING), ("_id", DESCENDING)])
+        .limit(100),
+        "list_recent_sessions": Session.find(
+            Session.account_id == "", Session.organization_id == ""
+        )
+        .sort([("last_message_at", DESCENDING), ("_id", DESCENDING)])
+        .limit(100),
+        "list_artifacts": Artifact.find(
+            Artifact.account_id == "", Artifact.organization_id == ""
+        )
+        .sort([("created_at", DESCENDING), ("_id", DESCENDING)])
+        .limit(100),
+        "list_accounts": Account.find(Account.organization_id == ""),
+        "get_current_user_api_key": User.find(User.access_token == "").limit(1),
+        "login": User.find(User.email == "").limit(1),
+        "find_organization_by_name": Organization.find(Organization.name == "").limit(
+            1
+        ),
+        "find_assistant_by_internal_name": Assistant.find(
+            Assistant.internal_name == ""
+        ).limit(1),
+    }
+
+
+def _find_stages(plan: dict | list) -> set[str]:
+    """
+    Collect every stage name of an explain plan, whatever its nesting.
+    """
+    stages = set()
+    if isinstance(plan, dict):
+        if isinstance(plan.get("stage"), str):
+            stages.add(plan["stage"])
+        for value in plan.values():
+            stages |= _find_stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            stages |= _find_stages(value)
+    return stages
+
+
+async def report_query_plans():
+    """
+    Run `explain()` on each hot query and warn about any collection scan.
+
+    This is a best effort report, a failure to explain a query is logged and
+    never prevents the application from starting.
+    """
+    for name, query in _get_hot_queries().items():
+        try:
+            explanation = await query.motor_cursor.explain()
+        except Exception as e:
+            logger.warning(f"Could not explain query '{name}': {str(e)}")
+            continue
+
+        winning_plan = explanation.get("queryPlanner", {}).get("winningPlan", {})
+        stages = _find_stages(winning_plan)
+
+        if "COLLSCAN" in stages:
+            logger.warning(
+                f"Query '{name}' is doing a COLLSCAN. Check the indexes declared on the model."
+            )
+        else:
+            logger.debug(f"Query '{name}' plan stages: {sorted(stages)}")
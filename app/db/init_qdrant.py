@@ -3,16 +3,227 @@ from qdrant_client import models
 from qdrant_client.http.exceptions import UnexpectedResponse
 
 from app.clients.qdrant_client import get_async_qdrant_client
+from app.core.config import settings
+from app.utils.sparse_utils import SPARSE_VECTOR_NAME
 
+# Payload indexes of every collection, used by the filtered searches and by the
+# deletion of the chunks of a document (`id` and `chunk_index`).
+# `account_id` is the tenant key, Qdrant co-locates the points of each account.
+PAYLOAD_INDEXES = {
+    "account_id": models.KeywordIndexParams(
+        type=models.KeywordIndexType.KEYWORD, is_tenant=True
+    ),
+    "organization_id": models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD),
+    "session_id": models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD),
+    "type": models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD),
+    "id": models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD),
+    "chunk_index": models.IntegerIndexParams(
+        type=models.IntegerIndexType.INTEGER, lookup=False, range=True
+    ),
+}
 
-async def create_collection_if_not_exists(collection_name: str):
+
+def get_quantization_config(
+    quantization: str | None,
+) -> models.QuantizationConfig | None:
+    """
+    Build the quantization config of a collection.
+
+    Parameters
+    ----------
+    quantization : str | None
+        The quantization type, "scalar", "binary", or "none"/None to disable it.
+
+    Returns
+    -------
+    QuantizationConfig | None
+        The quantization config, None if quantization is disabled.
+
+    Raises
+    ------
+    ValueError
+        If the quantization type is unknown.
+    """
+    always_ram = settings.QDRANT_QUANTIZATION_ALWAYS_RAM
+
+    match quantization:
+        case None | "none":
+            return None
+        case "scalar":
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8, quantile=0.99, always_ram=always_ram
+                )
+            )
+        case "binary":
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=always_ram)
+            )
+        case _:
+            raise ValueError(f"Unknown quantization type: {quantization}")
+
+
+def get_collection_config(
+    quantization: str | None = None,
+    on_disk: bool | None = None,
+    hnsw_m: int | None = None,
+    hnsw_ef_construct: int | None = None,
+    sparse: bool = False,
+    dimensions: int | None = None,
+) -> dict:
+    """
+    Build the creation options of a collection, defaulting to the settings.
+
+    Parameters
+    ----------
+    quantization : str | None
+        The quantization type, defaults to `QDRANT_QUANTIZATION`.
+    on_disk : bool | None
+        Whether the original vectors are stored on disk, defaults to
+        `QDRANT_VECTORS_ON_DISK`.
+    hnsw_m : int | None
+        The number of edges per node of the HNSW graph, defaults to
+        `QDRANT_HNSW_M`.
+    hnsw_ef_construct : int | None
+        The number of neighbours considered while building the HNSW graph,
+        defaults to `QDRANT_HNSW_EF_CONSTRUCT`.
+    sparse : bool
+        Whether to add the BM25 sparse vector used by hybrid search.
+    dimensions : int | None
+        The size of the dense vectors, defaults to `EMBEDDING_DIMENSIONS`.
+
+    Returns
+    -------
+    dict
+        The keyword arguments of `create_collection`.
+    """
+    if quantization is None:
+        quantization = settings.QDRANT_QUANTIZATION
+    if on_disk is None:
+        on_disk = settings.QDRANT_VECTORS_ON_DISK
+    if dimensions is None:
+        dimensions = settings.EMBEDDING_DIMENSIONS
+
+    return {
+        "vectors_config": models.VectorParams(
+            size=dimensions, distance=models.Distance.COSINE, on_disk=on_disk
+        ),
+        "hnsw_config": models.HnswConfigDiff(
+            m=hnsw_m or settings.QDRANT_HNSW_M,
+            ef_construct=hnsw_ef_construct or settings.QDRANT_HNSW_EF_CONSTRUCT,
+        ),
+        "quantization_config": get_quantization_config(quantization),
+        "sparse_vectors_config": (
+            {
+                SPARSE_VECTOR_NAME: models.SparseVectorParams(
+                    modifier=models.Modifier.IDF
+                )
+            }
+            if sparse
+            else None
+        ),
+    }
+
+
+async def get_alias_target(alias: str) -> str | None:
+    """
+    Get the name of the collection an alias points to.
+
+    Parameters
+    ----------
+    alias : str
+        The name of the alias.
+
+    Returns
+    -------
+    str | None
+        The name of the collection, or None if the alias does not exist.
+    """
+    client = get_async_qdrant_client()
+
+    response = await client.get_aliases()
+    for collection_alias in response.aliases:
+        if collection_alias.alias_name == alias:
+            return collection_alias.collection_name
+    return None
+
+
+async def swap_collection_alias(
+    alias: str, collection_name: str, replace_legacy_collection: bool = False
+) -> str | None:
+    """
+    Point an alias to a collection, atomically replacing its previous target.
+
+    Collections created before aliases were introduced are named after the
+    alias itself. Replacing one deletes it before the alias is created, which
+    leaves a short window where the alias does not resolve and no collection
+    to roll back to, so it must be requested explicitly.
+
+    Parameters
+    ----------
+    alias : str
+        The name of the alias, e.g. "Messages".
+    collection_name : str
+        The name of the collection the alias should point to.
+    replace_legacy_collection : bool
+        Whether to delete a legacy collection named after the alias.
+
+    Returns
+    -------
+    str | None
+        The name of the previous collection of the alias, None if there was none.
+
+    Raises
+    ------
+    ValueError
+        If a legacy collection is named after the alias and replacing it was
+        not requested.
+    """
+    client = get_async_qdrant_client()
+
+    previous = await get_alias_target(alias)
+    operations = []
+    if previous is not None:
+        operations.append(
+            models.DeleteAliasOperation(
+                delete_alias=models.DeleteAlias(alias_name=alias)
+            )
+        )
+    elif await client.collection_exists(alias):
+        if not replace_legacy_collection:
+            raise ValueError(
+                f"Collection '{alias}' is not an alias, replacing it deletes it"
+            )
+        logger.warning(f"Deleting collection '{alias}' to replace it with an alias")
+        await client.delete_collection(alias)
+
+    operations.append(
+        models.CreateAliasOperation(
+            create_alias=models.CreateAlias(
+                collection_name=collection_name, alias_name=alias
+            )
+        )
+    )
+    await client.update_collection_aliases(change_aliases_operations=operations)
+    logger.success(f"Alias '{alias}' now points to '{collection_name}'")
+
+    return previous
+
+
+async def create_collection_if_not_exists(collection_name: str, sparse: bool = False):
     """
     Create a Qdrant collection with specified name and vector configuration if it does not already exist.
 
+    The quantization, on-disk storage and HNSW options are read from the
+    settings when the collection is created, existing collections are left
+    as they are.
+
     Parameters
     ----------
     collection_name : str
         The name of the collection to create.
+    sparse : bool
+        Whether the collection stores BM25 sparse vectors for hybrid search.
 
     Raises
     ------
@@ -22,13 +233,15 @@ async def create_collection_if_not_exists(collection_name: str):
 
     client = get_async_qdrant_client()
 
+    # Re-indexed collections are served through an alias of the same name
+    if await get_alias_target(collection_name) is not None:
+        return
+
     if not await client.collection_exists(collection_name):
         try:
             await client.create_collection(
                 collection_name=collection_name,
-                vectors_config=models.VectorParams(
-                    size=1536, distance=models.Distance.COSINE
-                ),
+                **get_collection_config(sparse=sparse),
             )
         except UnexpectedResponse as e:
             if e.status_code == 409:
@@ -37,10 +250,76 @@ async def create_collection_if_not_exists(collection_name: str):
                 raise e
 
 
+async def create_payload_indexes_if_not_exist(collection_name: str):
+    """
+    Create the missing payload indexes of a Qdrant collection.
+
+    This also migrates the collections created before the indexes were
+    declared, the indexes are built in the background by Qdrant.
+
+    Parameters
+    ----------
+    collection_name : str
+        The name of the collection to index.
+    """
+
+    client = get_async_qdrant_client()
+
+    collection = await client.get_collection(collection_name)
+    for field_name, field_schema in PAYLOAD_INDEXES.items():
+        if field_name in collection.payload_schema:
+            continue
+
+        logger.info(f"Creating payload index '{field_name}' on '{collection_name}'")
+        await client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=field_schema,
+            wait=False,
+        )
+
+
+async def check_collection_dimensions(collection_name: str):
+    """
+    Check that the dense vectors of a Qdrant collection have the size of the
+    embeddings, `EMBEDDING_DIMENSIONS`.
+
+    Parameters
+    ----------
+    collection_name : str
+        The name of the collection, or of its alias.
+
+    Raises
+    ------
+    ValueError
+        If the collection was created with another size. It has to be
+        re-indexed with `manual_scripts/reindex_qdrant.py` first.
+    """
+
+    client = get_async_qdrant_client()
+
+    collection = await client.get_collection(collection_name)
+    vectors = collection.config.params.vectors
+    # Named vectors configs hold the dense vector under the empty name
+    if isinstance(vectors, dict):
+        vectors = vectors[""]
+
+    if vectors.size != settings.EMBEDDING_DIMENSIONS:
+        raise ValueError(
+            f"Collection '{collection_name}' holds {vectors.size} dimensional "
+            f"vectors but EMBEDDING_DIMENSIONS is {settings.EMBEDDING_DIMENSIONS}, "
+            "re-index it with the new dimensions first."
+        )
+
+
 async def init_qdrant_db():
     """
     Initialize qdrant collections
     """
 
-    await create_collection_if_not_exists("Artifacts")
+    await create_collection_if_not_exists("Artifacts", sparse=True)
     await create_collection_if_not_exists("Messages")
+
+    for collection_name in ("Artifacts", "Messages"):
+        await check_collection_dimensions(collection_name)
+        await create_payload_indexes_if_not_exist(collection_name)
@@ -0,0 +1,3 @@
+"""
+Embedding providers for JourneyAI
+"""
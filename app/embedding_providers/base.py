@@ -0,0 +1,34 @@
+import abc
+
+
+class EmbeddingProvider(abc.ABC):
+    """
+    Interface of the models transforming texts to dense vector embeddings.
+
+    Parameters
+    ----------
+    model : str
+        The name of the embedding model, part of the embedding cache keys.
+    dimensions : int
+        The number of dimensions of the embeddings.
+    """
+
+    def __init__(self, model: str, dimensions: int):
+        self.model = model
+        self.dimensions = dimensions
+
+    @abc.abstractmethod
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed a batch of texts.
+
+        Parameters
+        ----------
+        texts : list[str]
+            The texts to embed, within the batch limits of the provider.
+
+        Returns
+        -------
+        list[list[float]]
+            The embedding of each text, in the order of the texts.
+        """
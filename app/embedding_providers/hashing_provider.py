@@ -0,0 +1,56 @@
+import hashlib
+import math
+from collections import Counter
+
+import numpy as np
+
+from app.embedding_providers.base import EmbeddingProvider
+from app.utils.sparse_utils import tokenize
+
+# Feature of the texts without any term, so their embedding is not null
+EMPTY_TEXT_FEATURE = "<empty>"
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic offline embedding provider based on feature hashing.
+
+    The terms and term bigrams of a text are hashed into signed buckets of the
+    vector, weighted by their sublinear frequency, then L2 normalized. Texts
+    sharing words get close vectors, which is enough to exercise the embed,
+    upsert and search pipeline in tests and load tests without network access.
+    The embeddings carry no semantics beyond word overlap.
+    """
+
+    def __init__(self, dimensions: int, model: str = "hashing-v1"):
+        super().__init__(model=model, dimensions=dimensions)
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_text(text) for text in texts]
+
+    def embed_text(self, text: str) -> list[float]:
+        """
+        Embed a single text.
+
+        Parameters
+        ----------
+        text : str
+            The text to embed.
+
+        Returns
+        -------
+        list[float]
+            The unit embedding of the text.
+        """
+        terms = tokenize(text)
+        features = terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, count in Counter(features or [EMPTY_TEXT_FEATURE]).items():
+            digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+            bucket = int.from_bytes(digest, "little")
+            sign = 1.0 if bucket >> 63 else -1.0
+            vector[bucket % self.dimensions] += sign * (1 + math.log(count))
+
+        vector /= np.linalg.norm(vector) or 1.0
+        return vector.tolist()
@@ -0,0 +1,47 @@
+from loguru import logger
+
+from app.clients.openai_client import get_openai_async_client
+from app.core.config import settings
+from app.embedding_providers.base import EmbeddingProvider
+
+# Native size of the text-embedding-3-small embeddings
+MAX_DIMENSIONS = 1536
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """
+    Embedding provider calling the OpenAI embeddings API.
+
+    Embeddings smaller than `MAX_DIMENSIONS` are shortened by the API itself,
+    which returns them normalized, through the `dimensions` parameter.
+    """
+
+    def __init__(self, dimensions: int, model: str = "text-embedding-3-small"):
+        if not 0 < dimensions <= MAX_DIMENSIONS:
+            raise ValueError(
+                f"The {model} embeddings have between 1 and {MAX_DIMENSIONS} "
+                f"dimensions, got {dimensions}."
+            )
+        super().__init__(model=model, dimensions=dimensions)
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        if not settings.OPENAI_API_KEY:
+            raise ValueError(
+                "No OpenAI API key provided. Cannot use embedding service."
+            )
+
+        client = get_openai_async_client()
+        try:
+            response = await client.embeddings.create(
+                input=texts, model=self.model, dimensions=self.dimensions
+            )
+        except Exception as e:
+            logger.exception(
+                f"Failed to transform {len(texts)} texts to vector embeddings."
+            )
+            raise
+
+        embeddings = [None] * len(texts)
+        for item in response.data:
+            embeddings[item.index] = item.embedding
+        return embeddings
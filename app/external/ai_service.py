@@ -5,17 +5,15 @@ from agents import Agent, RunConfig, Runner
 from loguru import logger
 from openai.types.responses.response_input_item_param import ResponseInputItemParam
 
+from app.clients.embedding_provider_client import get_embedding_provider
 from app.clients.groq_client import get_groq_async_client
 from app.clients.openai_client import get_openai_async_client
 from app.core.config import settings
-from app.models.account import Account
-from app.models.assistant import Assistant
 from app.models.message import Message
-from app.models.organization import Organization
-from app.models.session import Session
-from app.models.user import User
 from app.schemas.agent_context import AgentContext
 from app.schemas.types import SenderType
+from app.utils.embedding_cache_utils import get_cached_embeddings, set_cached_embeddings
+from app.utils.embedding_utils import EmbeddingCoalescer
 
 
 async def create_summary_for_search(messages: list[Message]) -> str:
@@ -98,11 +96,109 @@ async def create_summary_for_search(messages: list[Message]) -> str:
     return summary
 
 
+def _embedding_batches(embedding_inputs: list[str]) -> list[list[str]]:
+    """
+    Split the inputs of an embedding request into batches within the size and
+    character limits of a single embeddings call.
+    """
+    batches, batch, size = [], [], 0
+    for embedding_input in embedding_inputs:
+        if batch and (
+            len(batch) == settings.EMBEDDING_BATCH_SIZE
+            or size + len(embedding_input) > settings.EMBEDDING_BATCH_MAX_CHARACTERS
+        ):
+            batches.append(batch)
+            batch, size = [], 0
+        batch.append(embedding_input)
+        size += len(embedding_input)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+async def get_embeddings_batch(embedding_inputs: list[str]) -> list[list[float]]:
+    """
+    Transform several texts to vector embeddings with as few requests as possible.
+
+    Cached embeddings are read from Redis in one round trip, the remaining
+    distinct texts are embedded in batches by the provider selected by
+    `EMBEDDING_PROVIDER`.
+
+    Parameters
+    ----------
+    embedding_inputs : list[str]
+        The texts to embed.
+
+    Returns
+    -------
+    list[list[float]]
+        The embedding of each text, in the order of the inputs.
+
+    Raises
+    ------
+    ValueError
+        If the embedding provider is not configured.
+    """
+    if not embedding_inputs:
+        return []
+
+    provider = get_embedding_provider()
+    cached = await get_cached_embeddings(
+        provider.model, provider.dimensions, embedding_inputs
+    )
+    missing = list(
+        dict.fromkeys(
+            embedding_input
+            for embedding_input, embedding in zip(embedding_inputs, cached)
+            if embedding is None
+        )
+    )
+
+    embeddings = {}
+    if missing:
+        for batch in _embedding_batches(missing):
+            embeddings.update(zip(batch, await provider.embed(batch)))
+
+        await set_cached_embeddings(provider.model, provider.dimensions, embeddings)
+
+    return [
+        embedding if embedding is not None else embeddings[embedding_input]
+        for embedding_input, embedding in zip(embedding_inputs, cached)
+    ]
+
+
+_embedding_coalescer: EmbeddingCoalescer | None = None
+
+
+def get_embedding_coalescer() -> EmbeddingCoalescer:
+    """
+    Get the embedding coalescer of the current process.
+
+    Returns
+    -------
+    EmbeddingCoalescer
+        The coalescer, configured by `EMBEDDING_BATCH_SIZE` and
+        `EMBEDDING_COALESCE_WINDOW_MS`.
+    """
+    global _embedding_coalescer
+
+    if _embedding_coalescer is None:
+        _embedding_coalescer = EmbeddingCoalescer(
+            embed_batch=get_embeddings_batch,
+            max_batch_size=settings.EMBEDDING_BATCH_SIZE,
+            window=settings.EMBEDDING_COALESCE_WINDOW_MS / 1000,
+        )
+    return _embedding_coalescer
+
+
 async def get_embeddings(embedding_input: str) -> List[float]:
     """
     Transform text to vector embeddings.
     Prepend "Uploaded by user" to text if source text is from user.
 
+    Concurrent calls of this process are coalesced into batch requests, and
+    embeddings are cached in Redis by model, dimensions and normalized text.
+
     Parameters
     -----
     embedding_input : str
@@ -114,34 +210,16 @@ async def get_embeddings(embedding_input: str) -> List[float]:
     Returns
     -----
     embeddings : list(float)
-        Returns the vector embeddings result which is a list of floating point numbers of size 1536.
+        Returns the vector embeddings result which is a list of floating point numbers of size `EMBEDDING_DIMENSIONS`.
     """
 
-    if not settings.OPENAI_API_KEY:
-        raise ValueError("No OpenAI API key provided. Cannot use embedding service.")
-
-    client = get_openai_async_client()
-    try:
-        response = await client.embeddings.create(
-            input=embedding_input, model="text-embedding-3-small"
-        )
-        return response.data[0].embedding
-    except Exception as e:
-        logger.exception(
-            f"Failed to transform text to vector embeddings. {embedding_input=}"
-        )
-        raise
+    return await get_embedding_coalescer().embed(embedding_input)
 
 
 async def generate_response(
     agent: Agent,
     input: list[ResponseInputItemParam],
-    user_id: str,
-    organization_id: str,
-    account_id: str,
-    session_id: str,
-    assistant: Assistant,
-    history: list[Message],
+    context: AgentContext,
 ):
     """
     Generate a response using the specified agent and input.
@@ -152,16 +230,9 @@ async def generate_response(
         The agent instance used to generate the response.
     input : list[ResponseInputItemParam]
         A list of input parameters for the response generation.
-    user_id : str
-        The user ID associated with the response.
-    organization_id : str
-        The organization ID associated with the response.
-    account_id : str
-        The account ID associated with the response.
-    session_id : str
-        The session ID associated with the response.
-    history : list[Message]
-        The history of messages associated with the response.
+    context : AgentContext
+        The context of the agent run, holding the session, the objects it
+        points to and its message history.
 
     Returns
     -------
@@ -172,34 +243,22 @@ async def generate_response(
     if not settings.OPENAI_API_KEY:
         raise ValueError("No OpenAI API key provided. Cannot use any LLM service.")
 
-    user = await User.get(user_id)
-    organization = await Organization.get(organization_id)
-    account = await Account.get(account_id)
-    session = await Session.get(session_id)
-
-    agent_context = AgentContext(
-        user=user,
-        organization=organization,
-        account=account,
-        session=session,
-        history=history,
-        assistant=assistant,
-    )
+    session = context.session
 
     logger.info(f"Generating response using agent: {agent.name}")
     result = Runner.run_streamed(
         agent,
         input=input,
-        context=agent_context,
+        context=context,
         run_config=RunConfig(
-            group_id=session_id,
-            trace_id=f"trace_{history[-1].id}",
+            group_id=session.id,
+            trace_id=f"trace_{context.history[-1].id}",
             trace_metadata={
-                "session_id": session_id,
-                "assistant_id": assistant.id,
-                "user_id": user_id,
-                "organization_id": organization_id,
-                "account_id": account_id,
+                "session_id": session.id,
+                "assistant_id": context.assistant.id,
+                "user_id": session.user_id,
+                "organization_id": session.organization_id,
+                "account_id": session.account_id,
             },
             workflow_name=agent.name,
         ),
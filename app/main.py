@@ -1,14 +1,17 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 
 import app.api.v1.websockets.handlers
+from app.api.deps import get_current_admin_user
 from app.api.v1.router import api_router
+from app.clients.mongo_client import get_pool_metrics
 from app.clients.redis_client import close_redis_connections
 from app.core.config import settings
 from app.core.starters import initialize_app
+from app.utils.embedding_cache_utils import get_embedding_cache_metrics
 from app.utils.websocket.redis_listener import stop_redis_listener
 
 
@@ -75,6 +78,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Before-Cursor", "X-After-Cursor", "X-Has-More"],
 )
 
 
@@ -90,6 +94,46 @@ async def health_check():
     return {"status": "ok", "message": "JourneyAI API is running"}
 
 
+@app.get(
+    "/metrics/mongo",
+    tags=["Health Check"],
+    dependencies=[Depends(get_current_admin_user)],
+)
+async def mongo_pool_metrics():
+    """
+    MongoDB connection pool metrics endpoint
+
+    Returns:
+        dict: Pool size configuration, open and checked out connections, and
+        connection check out wait times of this process
+
+    Raises:
+        HTTPException: If the user is not an authenticated admin
+    """
+
+    return get_pool_metrics()
+
+
+@app.get(
+    "/metrics/embedding-cache",
+    tags=["Health Check"],
+    dependencies=[Depends(get_current_admin_user)],
+)
+async def embedding_cache_metrics():
+    """
+    Embedding cache metrics endpoint
+
+    Returns:
+        dict: Hits, misses and hit rate of the Redis embedding cache, across
+        the API and the workers
+
+    Raises:
+        HTTPException: If the user is not an authenticated admin
+    """
+
+    return await get_embedding_cache_metrics()
+
+
 # Include routers
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -3,6 +3,7 @@ import uuid
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, IndexModel
 
 
 class Account(Document):
@@ -17,3 +18,11 @@ class Account(Document):
     # Relations
     organization_id: str
     user_id: str
+
+    class Settings:
+        indexes = [
+            IndexModel(
+                [("organization_id", ASCENDING), ("name", ASCENDING)],
+                name="organization_name",
+            ),
+        ]
@@ -3,6 +3,7 @@ import uuid
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from app.schemas.types import OriginType
 
@@ -15,9 +16,12 @@ class Artifact(Document):
     title: str
     body: str
     is_parent: bool = False
+    # Hash of the title and body last embedded in Qdrant
+    embedding_hash: str | None = None
     created_at: dt.datetime = Field(
         default_factory=lambda: dt.datetime.now(dt.timezone.utc)
     )
+    updated_at: dt.datetime | None = None
 
     # Relations
     user_id: str | None = None
@@ -31,3 +35,17 @@ class Artifact(Document):
     account_id: str | None = (
         None  # This can be None if the Artifact is a assistant document
     )
+
+    class Settings:
+        indexes = [
+            IndexModel(
+                [
+                    ("account_id", ASCENDING),
+                    ("organization_id", ASCENDING),
+                    ("created_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ],
+                name="account_organization_created_at_id",
+            ),
+            IndexModel([("session_id", ASCENDING)], name="session"),
+        ]
@@ -3,6 +3,7 @@ import uuid
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, IndexModel
 from typing_extensions import NotRequired, TypedDict
 
 from app.schemas.types import ToolType
@@ -37,3 +38,12 @@ class Assistant(Document):
     created_at: dt.datetime = Field(
         default_factory=lambda: dt.datetime.now(dt.timezone.utc)
     )
+
+    class Settings:
+        indexes = [
+            IndexModel(
+                [("internal_name", ASCENDING), ("version", ASCENDING)],
+                name="internal_name_version",
+            ),
+            IndexModel([("category", ASCENDING)], name="category"),
+        ]
@@ -3,6 +3,7 @@ import uuid
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, IndexModel
 
 
 class Opportunity(Document):
@@ -21,6 +22,14 @@ class Opportunity(Document):
     account_id: str
     user_id: str
 
+    class Settings:
+        indexes = [
+            IndexModel(
+                [("organization_id", ASCENDING), ("account_id", ASCENDING)],
+                name="organization_account",
+            ),
+        ]
+
 
 class Contact(Document):
     id: str = Field(default_factory=lambda: uuid.uuid4().hex)
@@ -34,3 +43,12 @@ class Contact(Document):
     organization_id: str
     account_id: str
     user_id: str
+
+    class Settings:
+        indexes = [
+            IndexModel(
+                [("organization_id", ASCENDING), ("account_id", ASCENDING)],
+                name="organization_account",
+            ),
+            IndexModel([("email", ASCENDING)], name="email"),
+        ]
@@ -3,6 +3,7 @@ import uuid
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from app.schemas.message import AttachmentMetadata, InputMessageSchema
 from app.schemas.types import SenderType
@@ -26,3 +27,24 @@ class Message(Document):
     session_id: str
     assistant_id: str
     account_id: str
+
+    class Settings:
+        indexes = [
+            # Session history (agent runs, message listing, titling checks)
+            IndexModel(
+                [
+                    ("session_id", ASCENDING),
+                    ("created_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ],
+                name="session_created_at_id",
+            ),
+            IndexModel(
+                [("session_id", ASCENDING), ("sender", ASCENDING)],
+                name="session_sender",
+            ),
+            IndexModel(
+                [("account_id", ASCENDING), ("created_at", DESCENDING)],
+                name="account_created_at",
+            ),
+        ]
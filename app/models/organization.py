@@ -3,6 +3,7 @@ import uuid
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, IndexModel
 
 
 class Organization(Document):
@@ -17,3 +18,8 @@ class Organization(Document):
 
     # Relations
     owner_id: str | None = None
+
+    class Settings:
+        indexes = [
+            IndexModel([("name", ASCENDING)], name="name"),
+        ]
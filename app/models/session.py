@@ -3,6 +3,7 @@ import uuid
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 class Session(Document):
@@ -16,8 +17,38 @@ class Session(Document):
         default_factory=lambda: dt.datetime.now(dt.timezone.utc)
     )
 
+    # Activity, maintained atomically when messages are inserted
+    user_message_count: int = 0
+    assistant_message_count: int = 0
+    last_message_at: dt.datetime = Field(
+        default_factory=lambda: dt.datetime.now(dt.timezone.utc)
+    )  # Creation date of the session until its first message
+
     # Relations
     user_id: str
     organization_id: str
     assistant_id: str
     account_id: str
+
+    class Settings:
+        indexes = [
+            IndexModel(
+                [
+                    ("account_id", ASCENDING),
+                    ("organization_id", ASCENDING),
+                    ("created_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ],
+                name="account_organization_created_at_id",
+            ),
+            # Recent sessions listing
+            IndexModel(
+                [
+                    ("account_id", ASCENDING),
+                    ("organization_id", ASCENDING),
+                    ("last_message_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ],
+                name="account_organization_last_message_at_id",
+            ),
+        ]
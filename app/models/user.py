@@ -4,6 +4,7 @@ from typing import Optional
 
 from beanie import Document
 from pydantic import BaseModel, Field
+from pymongo import ASCENDING, IndexModel
 
 from app.schemas.types import RoleType
 
@@ -79,3 +80,9 @@ class User(Document):
 
     # Relations
     organization_id: str | None = None
+
+    class Settings:
+        indexes = [
+            IndexModel([("email", ASCENDING)], name="email"),
+            IndexModel([("access_token", ASCENDING)], name="access_token", sparse=True),
+        ]
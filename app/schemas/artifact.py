@@ -1,6 +1,6 @@
 import datetime as dt
 
-from pydantic import BaseModel
+from pydantic import AliasChoices, BaseModel, Field
 
 from app.schemas.types import OriginType
 
@@ -52,3 +52,64 @@ class ArtifactRead(ArtifactBase):
     parent_id: str | None
     account_id: str
     assistant_id: str | None
+
+
+class ArtifactSummaryRead(BaseModel):
+    """
+    Projection of an artifact for listings, without its body.
+    """
+
+    id: str = Field(validation_alias=AliasChoices("id", "_id"))
+    type: str
+    origin_type: OriginType
+    title: str
+
+    is_parent: bool
+    created_at: dt.datetime
+
+    user_id: str
+    organization_id: str
+    session_id: str | None
+    parent_id: str | None
+    account_id: str
+    assistant_id: str | None
+
+    class Settings:
+        projection = {
+            "type": 1,
+            "origin_type": 1,
+            "title": 1,
+            "is_parent": 1,
+            "created_at": 1,
+            "user_id": 1,
+            "organization_id": 1,
+            "session_id": 1,
+            "parent_id": 1,
+            "account_id": 1,
+            "assistant_id": 1,
+        }
+
+
+class ArtifactVectorPayload(BaseModel):
+    """
+    Payload stored with an artifact's vector in Qdrant.
+
+    Only the filterable ids, the title and a short preview of the body are
+    stored, the full artifact is fetched from MongoDB for the search hits.
+
+    Long artifacts are stored as one point per chunk, the points of an artifact
+    share its `id` and are told apart by their `chunk_index`.
+    """
+
+    id: str
+    type: str
+    created_at: dt.datetime
+    title: str
+    preview: str
+    user_id: str | None
+    organization_id: str | None
+    session_id: str | None
+    parent_id: str | None
+    account_id: str | None
+    assistant_id: str | None
+    chunk_index: int = 0
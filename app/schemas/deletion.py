@@ -0,0 +1,22 @@
+import datetime as dt
+
+from pydantic import BaseModel, Field
+
+from app.schemas.types import DeletionResourceType, DeletionStatusType
+
+
+class DeletionRead(BaseModel):
+    """
+    Progress of the background cascade deletion of a session or an account.
+    """
+
+    resource: DeletionResourceType
+    id: str
+    organization_id: str
+    status: DeletionStatusType = DeletionStatusType.PENDING
+    step: str | None = None
+    deleted: dict[str, int] = Field(default_factory=dict)
+    error: str | None = None
+    updated_at: dt.datetime = Field(
+        default_factory=lambda: dt.datetime.now(dt.timezone.utc)
+    )
@@ -1,6 +1,6 @@
 import datetime as dt
 
-from pydantic import BaseModel
+from pydantic import AliasChoices, BaseModel, Field
 from typing_extensions import NotRequired, TypedDict
 
 from app.schemas.types import SenderType
@@ -52,3 +52,57 @@ class MessageRead(BaseModel):
     session_id: str
     assistant_id: str
     account_id: str
+
+
+class MessageSummaryRead(MessageRead):
+    """
+    Projection of a message for listings.
+
+    Only the lightweight keys of the assistant output are read from MongoDB,
+    tool payloads such as file search results are left out.
+    """
+
+    id: str = Field(validation_alias=AliasChoices("id", "_id"))
+
+    class Settings:
+        projection = {
+            "input": 1,
+            "sender": 1,
+            "attachments": 1,
+            "created_at": 1,
+            "user_id": 1,
+            "organization_id": 1,
+            "session_id": 1,
+            "assistant_id": 1,
+            "account_id": 1,
+            "output.type": 1,
+            "output.role": 1,
+            "output.status": 1,
+            "output.name": 1,
+            "output.call_id": 1,
+            "output.content": 1,
+        }
+
+
+class MessageVectorPayload(BaseModel):
+    """
+    Payload stored with a message's vector in Qdrant.
+
+    Only the filterable ids and a short preview are stored, the full message is
+    fetched from MongoDB for the search hits that need it.
+
+    Long messages are stored as one point per chunk, the points of a message
+    share its `id` and are told apart by their `chunk_index`.
+    """
+
+    id: str
+    sender: SenderType
+    type: str
+    created_at: dt.datetime
+    preview: str
+    user_id: str
+    organization_id: str
+    session_id: str
+    assistant_id: str
+    account_id: str
+    chunk_index: int = 0
@@ -34,6 +34,9 @@ class SessionRead(SessionBase):
     organization_id: str
     assistant_id: str
     account_id: str
+    user_message_count: int = 0
+    assistant_message_count: int = 0
+    last_message_at: dt.datetime | None = None
 
 
 class SessionUpdate(BaseModel):
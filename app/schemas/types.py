@@ -30,3 +30,25 @@ class AssistantCategoryType(str, Enum):
     PROSPECTING = "prospecting"
     RESEARCH = "research"
     CLOSING_SALES = "closing sales"
+
+
+class ListFieldsType(str, Enum):
+    FULL = "full"
+    SUMMARY = "summary"
+
+
+class SessionSortType(str, Enum):
+    CREATED_AT = "created_at"
+    LAST_MESSAGE_AT = "last_message_at"
+
+
+class DeletionResourceType(str, Enum):
+    SESSION = "session"
+    ACCOUNT = "account"
+
+
+class DeletionStatusType(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
@@ -5,8 +5,10 @@ from qdrant_client.models import FieldCondition, Filter, MatchValue
 
 from app.core.config import settings
 from app.external.ai_service import get_embeddings
+from app.models.artifact import Artifact
 from app.schemas.agent_context import AgentContext
-from app.utils.qdrant_utils import search_vectors
+from app.utils.qdrant_utils import fetch_point_documents, hybrid_search_vectors
+from app.utils.rerank_utils import collapse_chunks
 
 
 @function_tool
@@ -47,10 +49,11 @@ async def search_artifacts(
     """
 
     search_embedding = await get_embeddings(query)
-    results = await search_vectors(
+    results = await hybrid_search_vectors(
         collection_name="Artifacts",
         query_embedding=search_embedding,
-        top_k=10,
+        query_text=query,
+        top_k=10 * settings.CHUNK_SEARCH_OVERSAMPLING,
         score_threshold=settings.SEARCH_ARTIFACTS_SCORE_THRESHOLD,
         filter=Filter(
             must=[
@@ -65,20 +68,31 @@ async def search_artifacts(
                 ),
             ],
         ),
+        with_payload=["id"],
     )
 
     # Sort results by score
     results.sort(key=lambda x: x.score, reverse=True)
 
+    # Keep the best chunk of each artifact
+    results = collapse_chunks(results, limit=10)
+
+    # Fetch the full artifacts of the results
+    documents = await fetch_point_documents(Artifact, results)
+
     # Format results
     artifacts = []
     for result in results:
+        document = documents.get(result.payload["id"])
+        if document is None:
+            continue
+
         artifacts.append(
             {
-                "id": result.id,
-                "title": result.payload["title"],
-                "body": result.payload["body"],
-                "type": result.payload["type"],
+                "id": document.id,
+                "title": document.title,
+                "body": document.body,
+                "type": document.type,
             }
         )
 
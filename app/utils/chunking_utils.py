@@ -0,0 +1,112 @@
+import math
+
+# Average characters per token of the OpenAI tokenizers on English text
+CHARACTERS_PER_TOKEN = 4
+
+# Structural boundaries a text is split on, from the coarsest to the finest
+SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a text.
+
+    Parameters
+    ----------
+    text : str
+        The text to measure.
+
+    Returns
+    -------
+    int
+        The estimated number of tokens.
+    """
+    return math.ceil(len(text) / CHARACTERS_PER_TOKEN)
+
+
+def _split(text: str, max_characters: int, separators: tuple[str, ...]) -> list[str]:
+    """
+    Recursively split a text on the coarsest separator that brings its pieces
+    under `max_characters`. Separators stay attached to their piece, so the
+    pieces join back into the text.
+    """
+    if len(text) <= max_characters:
+        return [text]
+    if not separators:
+        return [
+            text[start : start + max_characters]
+            for start in range(0, len(text), max_characters)
+        ]
+
+    separator, *finer = separators
+    parts = text.split(separator)
+    pieces = [part + separator for part in parts[:-1]] + [parts[-1]]
+
+    return [
+        split
+        for piece in pieces
+        if piece
+        for split in _split(piece, max_characters, tuple(finer))
+    ]
+
+
+def _overlap(chunk: str, overlap_characters: int) -> str:
+    """
+    Get the end of a chunk repeated at the start of the next one, starting on
+    the coarsest boundary that keeps at least half of the overlap.
+    """
+    if overlap_characters <= 0:
+        return ""
+    if len(chunk) <= overlap_characters:
+        return chunk
+
+    tail = chunk[-overlap_characters:]
+    for separator in SEPARATORS:
+        index = tail.find(separator)
+        if index != -1 and len(tail) - index - len(separator) >= len(tail) // 2:
+            return tail[index + len(separator) :]
+    return tail
+
+
+def chunk_text(text: str, max_tokens: int, overlap_tokens: int) -> list[str]:
+    """
+    Split a text into overlapping chunks of at most `max_tokens` tokens.
+
+    The text is split on paragraphs, then lines, sentences and words, and the
+    pieces are merged back greedily, so chunks end on the coarsest boundary
+    possible. Each chunk starts with the last `overlap_tokens` tokens of the
+    previous one, so a passage cut by a boundary is still embedded whole once.
+
+    Parameters
+    ----------
+    text : str
+        The text to split.
+    max_tokens : int
+        The maximum number of tokens of a chunk.
+    overlap_tokens : int
+        The number of tokens shared by consecutive chunks.
+
+    Returns
+    -------
+    list[str]
+        The chunks, in text order. A text within the limit is a single chunk.
+    """
+    if count_tokens(text) <= max_tokens:
+        return [text]
+
+    max_characters = max_tokens * CHARACTERS_PER_TOKEN
+    overlap_characters = min(overlap_tokens, max_tokens // 2) * CHARACTERS_PER_TOKEN
+
+    chunks, chunk = [], ""
+    for piece in _split(text, max_characters, SEPARATORS):
+        if chunk.strip() and len(chunk) + len(piece) > max_characters:
+            chunks.append(chunk.strip())
+
+            chunk = _overlap(chunk, overlap_characters)
+            if len(chunk) + len(piece) > max_characters:
+                chunk = ""
+        chunk += piece
+
+    if chunk.strip():
+        chunks.append(chunk.strip())
+    return chunks
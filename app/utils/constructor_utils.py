@@ -1,11 +1,49 @@
+import asyncio
+import hashlib
 import json
 
+from app.core.config import settings
+from app.db.identity_map import get_document
+from app.models.artifact import Artifact
 from app.models.message import Message
 from app.models.session import Session
 from app.models.user import User
+from app.schemas.artifact import ArtifactVectorPayload
+from app.schemas.message import MessageVectorPayload
 from app.schemas.types import SenderType
+from app.utils.chunking_utils import chunk_text
 from app.utils.misc_utils import format_datetime_to_string
 
+PAYLOAD_PREVIEW_LENGTH = 150
+
+
+def _preview(text: str) -> str:
+    if len(text) > PAYLOAD_PREVIEW_LENGTH:
+        return text[:PAYLOAD_PREVIEW_LENGTH] + "..."
+    return text
+
+
+def chunk_embedding_text(text: str) -> list[str]:
+    """
+    Split the content of a document into the chunks embedded as separate points.
+
+    Parameters
+    ----------
+    text : str
+        The content to split.
+
+    Returns
+    -------
+    list[str]
+        The chunks of `CHUNK_MAX_TOKENS` tokens, overlapping by
+        `CHUNK_OVERLAP_TOKENS` tokens.
+    """
+    return chunk_text(
+        text,
+        max_tokens=settings.CHUNK_MAX_TOKENS,
+        overlap_tokens=settings.CHUNK_OVERLAP_TOKENS,
+    )
+
 
 def construct_embedding_input_for_artifact(title: str, body: str, source: str):
     embedding_input = f"""
@@ -22,13 +60,58 @@ def construct_embedding_input_for_artifact(title: str, body: str, source: str):
     return embedding_input
 
 
-async def construct_embedding_input_for_message(message: Message):
+def construct_content_hash_for_artifact(title: str, body: str) -> str:
+    """
+    Construct the hash of the embedded content of an artifact.
 
-    session = await Session.get(message.session_id)
-    user = await User.get(message.user_id)
+    The chunking settings are part of the hash, so the artifacts are chunked
+    again on their next update when they change.
+
+    Parameters
+    ----------
+    title : str
+        The title of the artifact.
+    body : str
+        The body of the artifact.
+
+    Returns
+    -------
+    str
+        The SHA-256 hex digest of the title, body and chunking settings.
+    """
+    content = json.dumps(
+        [title, body, settings.CHUNK_MAX_TOKENS, settings.CHUNK_OVERLAP_TOKENS],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+async def construct_embedding_inputs_for_message(message: Message) -> list[str]:
+    """
+    Construct the embedding inputs of the chunks of a message.
+
+    The session and user details are repeated in every chunk of the content.
+
+    Parameters
+    ----------
+    message : Message
+        The message being embedded.
+
+    Returns
+    -------
+    list[str]
+        The embedding input of each chunk, in content order.
+    """
+
+    session, user = await asyncio.gather(
+        get_document(Session, message.session_id),
+        get_document(User, message.user_id),
+    )
 
     if message.sender == SenderType.USER:
-        embedding_input = f"""
+        chunks = chunk_embedding_text(message.input["content"])
+        return [
+            f"""
 # User Message
 Session Details: 
     - Title: {session.title}
@@ -36,18 +119,20 @@ User's Details:
     - Email: {user.email}
 Message Details:
     - ID: {message.id}
-    - Content: {message.input["content"]}
+    - Content: {chunk}
     - Created At: {format_datetime_to_string(message.created_at)}
 """
-
-        return embedding_input
+            for chunk in chunks
+        ]
     else:
 
         if message.output.get("type") == "file_search_call":
             # Remove results from the output as it is too large to embed
             message.output.pop("results", None)
 
-        embedding_input = f"""
+        chunks = chunk_embedding_text(json.dumps(message.output, indent=2))
+        return [
+            f"""
 # Assistant Message
 Session Details: 
     - Title: {session.title}
@@ -55,8 +140,80 @@ User's Details:
     - Email: {user.email}
 Raw Message Dump:
 ```json
-{json.dumps(message.output, indent=2)}
+{chunk}
 ```
 """
+            for chunk in chunks
+        ]
 
-    return embedding_input
+
+def construct_payload_for_message(message: Message) -> dict:
+    """
+    Construct the slim Qdrant payload of a message.
+
+    Parameters
+    ----------
+    message : Message
+        The message being embedded.
+
+    Returns
+    -------
+    dict
+        The JSON serializable payload.
+    """
+    if message.sender == SenderType.USER:
+        type = "input"
+        preview = message.input["content"]
+    else:
+        type = message.output.get("type", "message")
+        content = message.output.get("content")
+        if isinstance(content, list):
+            preview = " ".join(
+                part.get("text", "") for part in content if isinstance(part, dict)
+            )
+        else:
+            preview = content if isinstance(content, str) else type
+
+    payload = MessageVectorPayload(
+        id=message.id,
+        sender=message.sender,
+        type=type,
+        created_at=message.created_at,
+        preview=_preview(preview),
+        user_id=message.user_id,
+        organization_id=message.organization_id,
+        session_id=message.session_id,
+        assistant_id=message.assistant_id,
+        account_id=message.account_id,
+    )
+    return payload.model_dump(mode="json")
+
+
+def construct_payload_for_artifact(artifact: Artifact) -> dict:
+    """
+    Construct the slim Qdrant payload of an artifact.
+
+    Parameters
+    ----------
+    artifact : Artifact
+        The artifact being embedded.
+
+    Returns
+    -------
+    dict
+        The JSON serializable payload.
+    """
+    payload = ArtifactVectorPayload(
+        id=artifact.id,
+        type=artifact.type,
+        created_at=artifact.created_at,
+        title=artifact.title,
+        preview=_preview(artifact.body),
+        user_id=artifact.user_id,
+        organization_id=artifact.organization_id,
+        session_id=artifact.session_id,
+        parent_id=artifact.parent_id,
+        account_id=artifact.account_id,
+        assistant_id=artifact.assistant_id,
+    )
+    return payload.model_dump(mode="json")
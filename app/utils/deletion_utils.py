@@ -0,0 +1,102 @@
+import datetime as dt
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+from app.clients.redis_client import get_redis_async_client
+from app.core.config import settings
+from app.schemas.deletion import DeletionRead
+from app.schemas.types import DeletionResourceType, DeletionStatusType
+
+DeletionStep = tuple[str, Callable[[], Awaitable[int]]]
+
+
+def _progress_key(resource: DeletionResourceType, id: str) -> str:
+    return f"deletion:{resource.value}:{id}"
+
+
+async def save_deletion_progress(progress: DeletionRead):
+    """
+    Save the progress of a cascade deletion to Redis.
+
+    Parameters
+    ----------
+    progress : DeletionRead
+        The progress to save. Expires after `DELETION_PROGRESS_TTL_SECONDS`.
+    """
+    redis = await get_redis_async_client()
+
+    progress.updated_at = dt.datetime.now(dt.timezone.utc)
+    await redis.set(
+        _progress_key(progress.resource, progress.id),
+        progress.model_dump_json(),
+        ex=settings.DELETION_PROGRESS_TTL_SECONDS,
+    )
+
+
+async def get_deletion_progress(
+    resource: DeletionResourceType, id: str
+) -> DeletionRead | None:
+    """
+    Get the progress of the cascade deletion of a session or an account.
+
+    Parameters
+    ----------
+    resource : DeletionResourceType
+        The type of the deleted resource.
+    id : str
+        The ID of the deleted resource.
+
+    Returns
+    -------
+    DeletionRead | None
+        The deletion progress, or None if no deletion is tracked for it.
+    """
+    redis = await get_redis_async_client()
+
+    raw = await redis.get(_progress_key(resource, id))
+    if raw is None:
+        return None
+    return DeletionRead.model_validate_json(raw)
+
+
+async def run_deletion_steps(progress: DeletionRead, steps: list[DeletionStep]):
+    """
+    Run the steps of a cascade deletion, saving the progress after each step.
+
+    Every step is idempotent, so a failed deletion can be run again from the
+    start.
+
+    Parameters
+    ----------
+    progress : DeletionRead
+        The progress of the deletion, updated in place.
+    steps : list[tuple[str, Callable[[], Awaitable[int]]]]
+        The name of each step and the coroutine function running it, which
+        returns the number of deleted items.
+
+    Raises
+    ------
+    Exception
+        If one of the steps fails. The progress is saved as failed first.
+    """
+    progress.status = DeletionStatusType.RUNNING
+    progress.error = None
+
+    try:
+        for step, run_step in steps:
+            progress.step = step
+            await save_deletion_progress(progress)
+
+            progress.deleted[step] = await run_step()
+            logger.info(f"Deleted {progress.deleted[step]} {step}")
+
+        progress.status = DeletionStatusType.COMPLETED
+        progress.step = None
+    except Exception as e:
+        logger.exception(f"Cascade deletion failed at step '{progress.step}'")
+        progress.status = DeletionStatusType.FAILED
+        progress.error = str(e)
+        raise
+    finally:
+        await save_deletion_progress(progress)
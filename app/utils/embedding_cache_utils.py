@@ -0,0 +1,179 @@
+import hashlib
+import unicodedata
+
+import numpy as np
+from loguru import logger
+
+from app.clients.redis_client import get_redis_async_binary_client
+from app.core.config import settings
+
+EMBEDDING_CACHE_PREFIX = "embedding"
+EMBEDDING_CACHE_STATS_KEY = "embedding_cache:stats"
+
+
+def normalize_embedding_text(text: str) -> str:
+    """
+    Normalize a text before hashing it, so trivially different inputs share
+    the same cache entry.
+
+    Parameters
+    ----------
+    text : str
+        The text to embed.
+
+    Returns
+    -------
+    str
+        The NFC normalized text, with its whitespace runs collapsed.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def embedding_cache_key(model: str, dimensions: int, text: str) -> str:
+    """
+    Build the content addressed cache key of an embedding.
+
+    Parameters
+    ----------
+    model : str
+        The embedding model.
+    dimensions : int
+        The number of dimensions of the embedding.
+    text : str
+        The text to embed.
+
+    Returns
+    -------
+    str
+        The Redis key of the embedding.
+    """
+    content = f"{model}\x00{dimensions}\x00{normalize_embedding_text(text)}"
+    digest = hashlib.sha256(content.encode()).hexdigest()
+    return f"{EMBEDDING_CACHE_PREFIX}:{model}:{dimensions}:{digest}"
+
+
+def pack_embedding(embedding: list[float]) -> bytes:
+    """
+    Pack an embedding as little-endian float32 bytes.
+    """
+    return np.asarray(embedding, dtype="<f4").tobytes()
+
+
+def unpack_embedding(data: bytes) -> list[float]:
+    """
+    Unpack an embedding packed by `pack_embedding`.
+    """
+    return np.frombuffer(data, dtype="<f4").tolist()
+
+
+async def get_cached_embeddings(
+    model: str, dimensions: int, texts: list[str]
+) -> list[list[float] | None]:
+    """
+    Get embeddings from the cache in one round trip, refreshing their TTL on hits.
+
+    Cache errors are logged and reported as misses, so an unavailable Redis
+    never fails an embedding.
+
+    Parameters
+    ----------
+    model : str
+        The embedding model.
+    dimensions : int
+        The number of dimensions of the embeddings.
+    texts : list[str]
+        The texts to embed.
+
+    Returns
+    -------
+    list[list[float] | None]
+        The cached embedding of each text, None on a miss.
+    """
+    if not settings.EMBEDDING_CACHE_ENABLED or not texts:
+        return [None] * len(texts)
+
+    try:
+        redis = await get_redis_async_binary_client()
+
+        # The lookups and the counters, shared by every process, are pipelined
+        async with redis.pipeline(transaction=False) as pipe:
+            for text in texts:
+                pipe.getex(
+                    embedding_cache_key(model, dimensions, text),
+                    ex=settings.EMBEDDING_CACHE_TTL_SECONDS,
+                )
+            pipe.hincrby(EMBEDDING_CACHE_STATS_KEY, "lookups", len(texts))
+            *values, _ = await pipe.execute()
+
+        embeddings = [
+            (
+                unpack_embedding(data)
+                if data is not None and len(data) == dimensions * 4
+                else None
+            )
+            for data in values
+        ]
+
+        # Misses are followed by an embedding request, far slower than this
+        misses = embeddings.count(None)
+        if misses:
+            await redis.hincrby(EMBEDDING_CACHE_STATS_KEY, "misses", misses)
+    except Exception as e:
+        logger.warning(f"Embedding cache lookup failed: {str(e)}")
+        return [None] * len(texts)
+
+    return embeddings
+
+
+async def set_cached_embeddings(
+    model: str, dimensions: int, embeddings: dict[str, list[float]]
+):
+    """
+    Store embeddings in the cache in one round trip.
+
+    Parameters
+    ----------
+    model : str
+        The embedding model.
+    dimensions : int
+        The number of dimensions of the embeddings.
+    embeddings : dict[str, list[float]]
+        The embeddings by embedded text.
+    """
+    if not settings.EMBEDDING_CACHE_ENABLED or not embeddings:
+        return
+
+    try:
+        redis = await get_redis_async_binary_client()
+        async with redis.pipeline(transaction=False) as pipe:
+            for text, embedding in embeddings.items():
+                pipe.set(
+                    embedding_cache_key(model, dimensions, text),
+                    pack_embedding(embedding),
+                    ex=settings.EMBEDDING_CACHE_TTL_SECONDS,
+                )
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Embedding cache write failed: {str(e)}")
+
+
+async def get_embedding_cache_metrics() -> dict:
+    """
+    Get the hit and miss counters of the embedding cache.
+
+    Returns
+    -------
+    dict
+        The hits, misses and hit rate of the cache across every process.
+    """
+    redis = await get_redis_async_binary_client()
+    stats = await redis.hgetall(EMBEDDING_CACHE_STATS_KEY)
+
+    misses = int(stats.get(b"misses", 0))
+    hits = int(stats.get(b"lookups", 0)) - misses
+    return {
+        "enabled": settings.EMBEDDING_CACHE_ENABLED,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+    }
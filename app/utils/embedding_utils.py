@@ -0,0 +1,127 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+EmbedBatch = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+class EmbeddingCoalescer:
+    """
+    Per process coalescer merging concurrent single embedding requests into
+    batch embedding requests.
+
+    Texts are queued for `window` seconds after the first text of a batch, or
+    until `max_batch_size` texts are queued, then embedded with one batch
+    request. Concurrent requests for the same text share one in-flight future.
+    """
+
+    def __init__(self, embed_batch: EmbedBatch, max_batch_size: int, window: float):
+        self.embed_batch = embed_batch
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._pending: list[str] = []
+        self._timer: asyncio.Task | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> list[float]:
+        """
+        Embed a text with the other texts requested within the same window.
+
+        Parameters
+        ----------
+        text : str
+            The text to embed.
+
+        Returns
+        -------
+        list[float]
+            The embedding of the text.
+
+        Raises
+        ------
+        Exception
+            If the text could not be embedded.
+        """
+        future = self._inflight.get(text)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[text] = future
+            self._pending.append(text)
+
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = asyncio.create_task(self._flush_later())
+
+        # A cancelled caller must not cancel the request shared with the others
+        return await asyncio.shield(future)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+
+        self._timer = None
+        self._flush()
+
+    def _flush(self):
+        """
+        Start the embedding of the pending texts.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        texts, self._pending = self._pending, []
+        if texts:
+            task = asyncio.create_task(self._embed(texts))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed a batch of texts, checking that every text got its embedding.
+        """
+        embeddings = await self.embed_batch(texts)
+        if len(embeddings) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings, got {len(embeddings)}")
+        return embeddings
+
+    async def _embed(self, texts: list[str]):
+        results = []
+        try:
+            try:
+                results = await self._embed_batch(texts)
+            except Exception as e:
+                if len(texts) == 1:
+                    results = [e]
+                else:
+                    # Retry one by one, so an invalid text only fails its own
+                    # callers
+                    logger.warning(
+                        f"Embedding batch of {len(texts)} texts failed, retrying "
+                        f"them one by one: {str(e)}"
+                    )
+                    results = await asyncio.gather(
+                        *(self._embed_batch([text]) for text in texts),
+                        return_exceptions=True,
+                    )
+                    results = [
+                        result if isinstance(result, BaseException) else result[0]
+                        for result in results
+                    ]
+        finally:
+            # Resolve every future even if the flush is cancelled, so no caller
+            # waits forever and the texts can be requested again
+            for index, text in enumerate(texts):
+                future = self._inflight.pop(text)
+                if future.done():
+                    continue
+                if index >= len(results):
+                    future.set_exception(
+                        RuntimeError("Embedding request was interrupted")
+                    )
+                elif isinstance(results[index], BaseException):
+                    future.set_exception(results[index])
+                else:
+                    future.set_result(results[index])
@@ -0,0 +1,221 @@
+import base64
+import dataclasses
+import datetime as dt
+import json
+
+from beanie.odm.queries.find import FindMany
+from beanie.odm.utils.parsing import parse_obj
+from beanie.odm.utils.projection import get_projection
+from fastapi import Response
+from motor.motor_asyncio import AsyncIOMotorCursor
+from pymongo import ASCENDING, DESCENDING
+
+from app.clients.mongo_client import get_listing_read_preference
+
+
+@dataclasses.dataclass
+class Page:
+    """
+    A page of documents fetched with keyset pagination.
+
+    Parameters
+    ----------
+    items : list
+        The documents of the page, in the order requested by the endpoint.
+    before_cursor : str | None
+        Cursor of the oldest document of the page, used to fetch older documents.
+    after_cursor : str | None
+        Cursor of the newest document of the page, used to fetch newer documents.
+    has_more : bool
+        Whether more documents exist past this page in the scanned direction.
+    """
+
+    items: list
+    before_cursor: str | None = None
+    after_cursor: str | None = None
+    has_more: bool = False
+
+
+def encode_cursor(created_at: dt.datetime, id: str) -> str:
+    """
+    Encode the `(created_at, id)` position of a document into an opaque cursor.
+
+    Parameters
+    ----------
+    created_at : datetime
+        The creation date of the document.
+    id : str
+        The ID of the document.
+
+    Returns
+    -------
+    str
+        A url-safe opaque cursor.
+    """
+    raw = json.dumps([created_at.isoformat(), id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[dt.datetime, str]:
+    """
+    Decode an opaque cursor created by `encode_cursor`.
+
+    Parameters
+    ----------
+    cursor : str
+        The opaque cursor.
+
+    Returns
+    -------
+    tuple[datetime, str]
+        The `(created_at, id)` position encoded in the cursor.
+
+    Raises
+    ------
+    ValueError
+        If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = dt.datetime.fromisoformat(created_at)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=dt.timezone.utc)
+
+    return created_at, str(id)
+
+
+def get_listing_cursor(query: FindMany) -> AsyncIOMotorCursor:
+    """
+    Build the raw Motor cursor of a listing query, routed with the listing
+    read preference so listings can be served by secondaries.
+
+    Parameters
+    ----------
+    query : FindMany
+        The Beanie query to run.
+
+    Returns
+    -------
+    AsyncIOMotorCursor
+        The cursor over the raw documents.
+    """
+    collection = query.document_model.get_motor_collection().with_options(
+        read_preference=get_listing_read_preference()
+    )
+    return collection.find(
+        filter=query.get_filter_query(),
+        sort=query.sort_expressions,
+        projection=get_projection(query.projection_model),
+        skip=query.skip_number,
+        limit=query.limit_number,
+    )
+
+
+def _keyset_condition(cursor: str, operator: str, sort_field: str) -> dict:
+    """
+    Build the filter selecting documents strictly before/after a cursor.
+    """
+    date, id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {sort_field: {operator: date}},
+            {sort_field: date, "_id": {operator: id}},
+        ]
+    }
+
+
+async def paginate(
+    query: FindMany,
+    limit: int,
+    before: str | None = None,
+    after: str | None = None,
+    newest_first: bool = True,
+    sort_field: str = "created_at",
+) -> Page:
+    """
+    Fetch a page of documents ordered by `(sort_field, id)` using keyset pagination.
+
+    Without a cursor the newest documents are returned. `before` returns the
+    documents older than the cursor and `after` the documents newer than it.
+
+    Parameters
+    ----------
+    query : FindMany
+        The Beanie query holding the endpoint's filters.
+    limit : int
+        The maximum number of documents in the page.
+    before : str | None
+        Only return documents older than this cursor.
+    after : str | None
+        Only return documents newer than this cursor.
+    newest_first : bool
+        The order of the returned items. Defaults to newest first.
+    sort_field : str
+        The date field the documents are ordered by. Defaults to `created_at`.
+
+    Returns
+    -------
+    Page
+        The page of documents and its boundary cursors.
+
+    Raises
+    ------
+    ValueError
+        If both `before` and `after` are provided or a cursor is malformed.
+    """
+    if before and after:
+        raise ValueError("Only one of 'before' and 'after' can be provided.")
+
+    if after:
+        query = query.find(_keyset_condition(after, "$gt", sort_field))
+        direction = ASCENDING
+    else:
+        if before:
+            query = query.find(_keyset_condition(before, "$lt", sort_field))
+        direction = DESCENDING
+
+    # Fetch one extra document to know if there is more past this page
+    query = query.sort([(sort_field, direction), ("_id", direction)]).limit(limit + 1)
+    documents = [
+        parse_obj(query.projection_model, document)
+        for document in await get_listing_cursor(query).to_list(None)
+    ]
+    has_more = len(documents) > limit
+    documents = documents[:limit]
+
+    # Documents are now ordered from oldest to newest
+    if direction == DESCENDING:
+        documents.reverse()
+
+    page = Page(items=documents, has_more=has_more)
+    if documents:
+        first, last = documents[0], documents[-1]
+        page.before_cursor = encode_cursor(getattr(first, sort_field), first.id)
+        page.after_cursor = encode_cursor(getattr(last, sort_field), last.id)
+
+    if newest_first:
+        page.items.reverse()
+
+    return page
+
+
+def set_page_headers(response: Response, page: Page):
+    """
+    Expose the boundary cursors of a page through the response headers.
+
+    Parameters
+    ----------
+    response : Response
+        The response of the listing endpoint.
+    page : Page
+        The page being returned.
+    """
+    if page.before_cursor:
+        response.headers["X-Before-Cursor"] = page.before_cursor
+    if page.after_cursor:
+        response.headers["X-After-Cursor"] = page.after_cursor
+    response.headers["X-Has-More"] = "true" if page.has_more else "false"
@@ -1,38 +1,221 @@
+import asyncio
+import uuid
+
+from beanie import Document
+from beanie.operators import In
 from loguru import logger
-from qdrant_client.models import Filter, PointStruct, ScoredPoint
+from qdrant_client.models import (
+    FieldCondition,
+    Filter,
+    MatchValue,
+    PointGroup,
+    PointStruct,
+    Range,
+    ScoredPoint,
+    SparseVector,
+)
+
+from app.clients.vector_store_client import get_vector_store
+from app.core.config import settings
+from app.utils.sparse_utils import SPARSE_VECTOR_NAME, encode_sparse_query
+
+
+def chunk_point_id(document_id: str, chunk_index: int) -> str:
+    """
+    Get the ID of the point of a chunk of a document.
+
+    The first chunk keeps the ID of the document, so documents short enough to
+    be a single chunk have the same point as before chunking.
+
+    Parameters
+    ----------
+    document_id : str
+        The ID of the document.
+    chunk_index : int
+        The index of the chunk in the document.
+
+    Returns
+    -------
+    str
+        The UUID of the point, stable across re-embeddings.
+    """
+    if chunk_index == 0:
+        return document_id
+    return uuid.uuid5(uuid.NAMESPACE_URL, f"{document_id}#{chunk_index}").hex
+
+
+def _document_filter(document_id: str, from_chunk_index: int = 0) -> Filter:
+    """
+    Build the filter selecting the chunk points of a document.
+    """
+    must = [FieldCondition(key="id", match=MatchValue(value=document_id))]
+    if from_chunk_index > 0:
+        must.append(
+            FieldCondition(key="chunk_index", range=Range(gte=from_chunk_index))
+        )
+    return Filter(must=must)
+
+
+def build_document_points(
+    document_id: str,
+    payload: dict,
+    vectors: list[list[float]],
+    sparse_vectors: list[SparseVector] | None = None,
+) -> list[PointStruct]:
+    """
+    Build the points of the chunks of a document.
+
+    Parameters
+    ----------
+    document_id : str
+        The ID of the document, stored in the `id` key of the payloads.
+    payload : dict
+        The payload of the document, shared by its chunks.
+    vectors : list[list[float]]
+        The dense vector of each chunk.
+    sparse_vectors : list[SparseVector] | None
+        The BM25 sparse vector of each chunk, for the collections supporting
+        hybrid search.
+
+    Returns
+    -------
+    list[PointStruct]
+        One point per chunk, with the chunk index in its payload.
+    """
+    points = []
+    for chunk_index, vector in enumerate(vectors):
+        if sparse_vectors is not None:
+            vector = {"": vector, SPARSE_VECTOR_NAME: sparse_vectors[chunk_index]}
 
-from app.clients.qdrant_client import get_async_qdrant_client
+        points.append(
+            PointStruct(
+                id=chunk_point_id(document_id, chunk_index),
+                payload={**payload, "chunk_index": chunk_index},
+                vector=vector,
+            )
+        )
+    return points
 
 
-async def insert_vector(
-    collection_name: str, id: str, payload: dict[str, str], vector: list[float]
+async def insert_document_vectors(
+    collection_name: str,
+    document_id: str,
+    payload: dict,
+    vectors: list[list[float]],
+    sparse_vectors: list[SparseVector] | None = None,
+    replace: bool = True,
 ):
     """
-    Insert a vector into a Qdrant collection.
+    Insert the vectors of the chunks of a document into a collection of the
+    vector store.
+
+    With the Qdrant backend, the vectors are upserted with the other vectors
+    inserted by this process within the same flush window.
 
     Parameters
     ----------
     collection_name : str
         The name of the collection.
-    id : str
-        The ID of the vector.
-    payload : dict[str, str]
-        The payload associated with the vector.
-    vector : list[float]
-        The vector to insert.
+    document_id : str
+        The ID of the document.
+    payload : dict
+        The payload of the document, shared by its chunks.
+    vectors : list[list[float]]
+        The dense vector of each chunk.
+    sparse_vectors : list[SparseVector] | None
+        The BM25 sparse vector of each chunk, for the collections supporting
+        hybrid search.
+    replace : bool
+        Whether to delete the chunks left over from a previous, longer version
+        of the document. Documents embedded once can skip this request.
 
     Raises
     ------
     Exception
-        If there is an error inserting the vector.
+        If there is an error inserting the vectors.
     """
 
-    client = get_async_qdrant_client()
+    store = get_vector_store()
+    points = build_document_points(document_id, payload, vectors, sparse_vectors)
+    # The chunks are buffered together, so they share the same batch upserts
+    await asyncio.gather(*(store.upsert(collection_name, point) for point in points))
+
+    if replace:
+        await store.delete_by_filter(
+            collection_name,
+            _document_filter(document_id, from_chunk_index=len(points)),
+        )
+
+
+async def set_document_payload(
+    collection_name: str, document_id: str, payload: dict, chunk_count: int
+):
+    """
+    Replace the payload of the chunks of a document without touching their
+    vectors.
+
+    Parameters
+    ----------
+    collection_name : str
+        The name of the collection.
+    document_id : str
+        The ID of the document.
+    payload : dict
+        The new payload of the document, shared by its chunks.
+    chunk_count : int
+        The number of chunks of the document.
+
+    Raises
+    ------
+    Exception
+        If there is an error updating the payloads.
+    """
+
+    store = get_vector_store()
     try:
-        points_struct = PointStruct(id=id, payload=payload, vector=vector)
-        await client.upsert(collection_name=collection_name, points=[points_struct])
+        await asyncio.gather(
+            *(
+                store.set_payload(
+                    collection_name,
+                    chunk_point_id(document_id, chunk_index),
+                    {**payload, "chunk_index": chunk_index},
+                )
+                for chunk_index in range(chunk_count)
+            )
+        )
     except Exception as e:
-        logger.exception(f"Error inserting vector: {str(e)}")
+        logger.exception(f"Error updating vector payload: {str(e)}")
+        raise
+
+
+async def delete_document_vectors(collection_name: str, document_id: str) -> int:
+    """
+    Delete the vectors of every chunk of a document.
+
+    Parameters
+    ----------
+    collection_name : str
+        The name of the collection.
+    document_id : str
+        The ID of the document.
+
+    Returns
+    -------
+    int
+        The number of vectors deleted.
+
+    Raises
+    ------
+    Exception
+        If there is an error deleting the vectors.
+    """
+
+    try:
+        return await get_vector_store().delete_by_filter(
+            collection_name, _document_filter(document_id)
+        )
+    except Exception as e:
+        logger.exception(f"Error deleting vectors: {str(e)}")
         raise
 
 
@@ -42,9 +225,11 @@ async def search_vectors(
     top_k: int,
     filter: Filter | None = None,
     score_threshold: float | None = None,
+    with_payload: bool | list[str] = True,
+    with_vectors: bool = False,
 ) -> list[ScoredPoint]:
     """
-    Search for vectors in a Qdrant collection.
+    Search for vectors in a collection.
 
     Parameters
     ----------
@@ -58,6 +243,11 @@ async def search_vectors(
         The filter to apply to the search.
     score_threshold : float | None
         The score threshold to apply to the search.
+    with_payload : bool | list[str]
+        Whether to return the payload of the results, or the payload keys to
+        return.
+    with_vectors : bool
+        Whether to return the vectors of the results, e.g. for reranking.
 
     Returns
     -------
@@ -65,16 +255,222 @@ async def search_vectors(
         A list of search results.
     """
 
-    client = get_async_qdrant_client()
     try:
-        response = await client.search(
+        return await get_vector_store().search(
             collection_name=collection_name,
-            query_vector=query_embedding,
-            limit=top_k,
-            query_filter=filter,
+            query_embedding=query_embedding,
+            top_k=top_k,
+            filter=filter,
             score_threshold=score_threshold,
+            with_payload=with_payload,
+            with_vectors=with_vectors,
         )
-        return response
     except Exception as e:
         logger.exception(f"Error searching vectors: {str(e)}")
         raise
+
+
+async def search_vector_groups(
+    collection_name: str,
+    query_embedding: list[float],
+    group_by: str,
+    group_size: int,
+    limit: int,
+    filter: Filter | None = None,
+    score_threshold: float | None = None,
+    with_payload: bool | list[str] = True,
+    with_vectors: bool = False,
+) -> list[PointGroup]:
+    """
+    Search for vectors in a collection, grouped by the value of a payload field.
+
+    Parameters
+    ----------
+    collection_name : str
+        The name of the collection to search in.
+    query_embedding : list[float]
+        The query vector to search for.
+    group_by : str
+        The payload field the results are grouped by, e.g. "session_id".
+    group_size : int
+        The maximum number of results per group.
+    limit : int
+        The maximum number of groups.
+    filter : Filter | None
+        The filter to apply to the search.
+    score_threshold : float | None
+        The score threshold to apply to the search.
+    with_payload : bool | list[str]
+        Whether to return the payload of the results, or the payload keys to
+        return.
+    with_vectors : bool
+        Whether to return the vectors of the results, e.g. for reranking.
+
+    Returns
+    -------
+    list[PointGroup]
+        The groups of results, ordered by their best result.
+    """
+
+    try:
+        return await get_vector_store().search_groups(
+            collection_name=collection_name,
+            query_embedding=query_embedding,
+            group_by=group_by,
+            group_size=group_size,
+            limit=limit,
+            filter=filter,
+            score_threshold=score_threshold,
+            with_payload=with_payload,
+            with_vectors=with_vectors,
+        )
+    except Exception as e:
+        logger.exception(f"Error searching vector groups: {str(e)}")
+        raise
+
+
+async def has_sparse_vectors(collection_name: str) -> bool:
+    """
+    Check if a collection stores the BM25 sparse vectors used by hybrid search.
+
+    Collections created before hybrid search only hold dense vectors until they
+    are re-indexed. The Qdrant backend caches the answer for
+    `SPARSE_COLLECTIONS_CACHE_TTL` seconds.
+
+    Parameters
+    ----------
+    collection_name : str
+        The name of the collection.
+
+    Returns
+    -------
+    bool
+        True if the collection has the sparse vector.
+    """
+    return await get_vector_store().has_sparse_vectors(collection_name)
+
+
+async def hybrid_search_vectors(
+    collection_name: str,
+    query_embedding: list[float],
+    query_text: str,
+    top_k: int,
+    filter: Filter | None = None,
+    score_threshold: float | None = None,
+    with_payload: bool | list[str] = True,
+) -> list[ScoredPoint]:
+    """
+    Search a collection with both its dense and BM25 sparse vectors.
+
+    The dense and sparse candidates are fetched in one request and merged with
+    reciprocal rank fusion, so exact terms like names, tickers or emails are
+    found even when their embedding is not close to the query's. Sparse
+    candidates are capped to `HYBRID_SPARSE_MAX_CANDIDATES` and must reach a
+    BM25 score of `HYBRID_SPARSE_SCORE_THRESHOLD`. Collections without sparse
+    vectors are searched with the dense vector only.
+
+    Parameters
+    ----------
+    collection_name : str
+        The name of the collection to search in.
+    query_embedding : list[float]
+        The query vector to search for.
+    query_text : str
+        The query text, encoded into the sparse query vector.
+    top_k : int
+        The number of top results to return.
+    filter : Filter | None
+        The filter to apply to the search.
+    score_threshold : float | None
+        The score threshold of the dense candidates. Sparse candidates are held
+        to their BM25 score threshold instead.
+    with_payload : bool | list[str]
+        Whether to return the payload of the results, or the payload keys to
+        return.
+
+    Returns
+    -------
+    list
+        A list of search results, scored by their fused rank.
+    """
+    if not await has_sparse_vectors(collection_name):
+        return await search_vectors(
+            collection_name=collection_name,
+            query_embedding=query_embedding,
+            top_k=top_k,
+            filter=filter,
+            score_threshold=score_threshold,
+            with_payload=with_payload,
+        )
+
+    try:
+        return await get_vector_store().hybrid_search(
+            collection_name=collection_name,
+            query_embedding=query_embedding,
+            query_sparse_vector=encode_sparse_query(query_text),
+            top_k=top_k,
+            filter=filter,
+            score_threshold=score_threshold,
+            with_payload=with_payload,
+            sparse_limit=min(top_k * 2, settings.HYBRID_SPARSE_MAX_CANDIDATES),
+            sparse_score_threshold=settings.HYBRID_SPARSE_SCORE_THRESHOLD,
+        )
+    except Exception as e:
+        logger.exception(f"Error searching vectors: {str(e)}")
+        raise
+
+
+async def delete_vectors(collection_name: str, filter: Filter) -> int:
+    """
+    Delete every vector of a collection matching a payload filter.
+
+    Parameters
+    ----------
+    collection_name : str
+        The name of the collection.
+    filter : Filter
+        The payload filter selecting the vectors to delete.
+
+    Returns
+    -------
+    int
+        The number of vectors deleted.
+
+    Raises
+    ------
+    Exception
+        If there is an error deleting the vectors.
+    """
+
+    try:
+        return await get_vector_store().delete_by_filter(collection_name, filter)
+    except Exception as e:
+        logger.exception(f"Error deleting vectors: {str(e)}")
+        raise
+
+
+async def fetch_point_documents(
+    model: type[Document], points: list[ScoredPoint]
+) -> dict[str, Document]:
+    """
+    Fetch the MongoDB documents of Qdrant points with a single `$in` query.
+
+    Parameters
+    ----------
+    model : type[Document]
+        The document model the points were embedded from.
+    points : list[ScoredPoint]
+        The points, each holding its document ID in the `id` payload key.
+        Several chunks of a document are fetched once.
+
+    Returns
+    -------
+    dict[str, Document]
+        The documents by ID. Documents deleted since being embedded are missing.
+    """
+    if not points:
+        return {}
+
+    ids = list(dict.fromkeys(point.payload["id"] for point in points))
+    documents = await model.find(In(model.id, ids)).to_list()
+    return {document.id: document for document in documents}
@@ -0,0 +1,121 @@
+import numpy as np
+from qdrant_client.models import PointGroup, ScoredPoint
+
+
+def flatten_groups(groups: list[PointGroup]) -> list[ScoredPoint]:
+    """
+    Flatten grouped search results into a single list ordered by score.
+
+    Parameters
+    ----------
+    groups : list[PointGroup]
+        The groups returned by a grouped search.
+
+    Returns
+    -------
+    list[ScoredPoint]
+        The hits of every group, from the most to the least similar.
+    """
+    hits = [hit for group in groups for hit in group.hits]
+    return sorted(hits, key=lambda hit: hit.score, reverse=True)
+
+
+def collapse_chunks(
+    points: list[ScoredPoint], limit: int | None = None
+) -> list[ScoredPoint]:
+    """
+    Collapse the chunk hits of a search back to documents.
+
+    Only the best hit of each document, identified by the `id` payload key, is
+    kept in its place.
+
+    Parameters
+    ----------
+    points : list[ScoredPoint]
+        The search results, from the most to the least relevant.
+    limit : int | None
+        The maximum number of documents to return.
+
+    Returns
+    -------
+    list[ScoredPoint]
+        The best hit of each document, from the most to the least relevant.
+    """
+    documents = {}
+    for point in points:
+        documents.setdefault(point.payload["id"], point)
+        if len(documents) == limit:
+            break
+    return list(documents.values())
+
+
+def _dense_vector(point: ScoredPoint) -> list[float]:
+    # Collections with sparse vectors return their vectors by name
+    if isinstance(point.vector, dict):
+        return point.vector[""]
+    return point.vector
+
+
+def mmr_rerank(
+    query_embedding: list[float],
+    points: list[ScoredPoint],
+    top_k: int,
+    lambda_: float = 0.7,
+) -> list[ScoredPoint]:
+    """
+    Rerank search results with Maximal Marginal Relevance.
+
+    Results are picked one at a time, maximizing
+    `lambda_ * sim(query, point) - (1 - lambda_) * max(sim(point, picked))`,
+    so near duplicates of already picked results are pushed down.
+
+    Parameters
+    ----------
+    query_embedding : list[float]
+        The query vector of the search.
+    points : list[ScoredPoint]
+        The search results, returned with their vectors.
+    top_k : int
+        The number of results to keep.
+    lambda_ : float
+        The trade-off between relevance (1.0) and diversity (0.0).
+
+    Returns
+    -------
+    list[ScoredPoint]
+        The selected results, in selection order.
+
+    Raises
+    ------
+    ValueError
+        If a result was returned without its vector.
+    """
+    if len(points) <= 1:
+        return points[:top_k]
+    if any(point.vector is None for point in points):
+        raise ValueError("MMR reranking requires the vectors of the results.")
+
+    vectors = np.asarray([_dense_vector(point) for point in points], dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True).clip(min=1e-12)
+    query = np.asarray(query_embedding, dtype=np.float32)
+    query /= max(np.linalg.norm(query), 1e-12)
+
+    relevance = vectors @ query
+    similarities = vectors @ vectors.T
+
+    selected = [int(np.argmax(relevance))]
+    # Highest similarity of each candidate to the selected results
+    redundancy = similarities[selected[0]].copy()
+    available = np.ones(len(points), dtype=bool)
+    available[selected[0]] = False
+
+    while len(selected) < min(top_k, len(points)):
+        scores = lambda_ * relevance - (1 - lambda_) * redundancy
+        scores[~available] = -np.inf
+        index = int(np.argmax(scores))
+
+        selected.append(index)
+        available[index] = False
+        np.maximum(redundancy, similarities[index], out=redundancy)
+
+    return [points[index] for index in selected]
@@ -0,0 +1,36 @@
+import datetime as dt
+
+from app.models.session import Session
+from app.schemas.types import SenderType
+
+
+async def record_session_messages(
+    session_id: str, sender: SenderType, count: int, last_message_at: dt.datetime
+):
+    """
+    Update the activity counters of a session after inserting messages in it.
+
+    The counters are updated atomically with `$inc` and `$max`, so concurrent
+    inserts never overwrite each other.
+
+    Parameters
+    ----------
+    session_id : str
+        The ID of the session.
+    sender : SenderType
+        The sender of the inserted messages.
+    count : int
+        The number of inserted messages.
+    last_message_at : datetime
+        The creation date of the most recent inserted message.
+    """
+    counter = (
+        "user_message_count" if sender == SenderType.USER else "assistant_message_count"
+    )
+
+    await Session.find_one(Session.id == session_id).update(
+        {
+            "$inc": {counter: count},
+            "$max": {"last_message_at": last_message_at},
+        }
+    )
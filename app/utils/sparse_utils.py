@@ -0,0 +1,106 @@
+import re
+import zlib
+from collections import Counter
+
+from qdrant_client.models import SparseVector
+
+# Name of the sparse vector stored next to the dense embedding
+SPARSE_VECTOR_NAME = "bm25"
+
+# BM25 term frequency saturation and length normalization. The IDF part of the
+# score is applied by Qdrant through the IDF modifier of the sparse vector.
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_AVG_DOCUMENT_LENGTH = 256
+
+# Words (including emails, domains and tickers) and their alphanumeric parts
+_TOKEN_PATTERN = re.compile(r"[a-z0-9](?:[a-z0-9@._+&-]*[a-z0-9])?")
+_PART_PATTERN = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset("""
+    a an and are as at be but by for from has have in is it its of on or that the
+    this to was were will with what which who how when where why i you we they
+    """.split())
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split a text into the lowercase terms indexed by the sparse vectors.
+
+    Terms containing punctuation, like emails or domains, are kept whole and
+    also split into their alphanumeric parts.
+
+    Parameters
+    ----------
+    text : str
+        The text to tokenize.
+
+    Returns
+    -------
+    list[str]
+        The terms of the text, without stopwords.
+    """
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        parts = _PART_PATTERN.findall(token)
+        if len(parts) > 1:
+            tokens.append(token)
+        tokens.extend(part for part in parts if part not in _STOPWORDS)
+    return tokens
+
+
+def _term_index(term: str) -> int:
+    """
+    Map a term to a stable sparse vector index, the same in every process.
+    """
+    return zlib.crc32(term.encode())
+
+
+def _to_sparse_vector(weights: dict[str, float]) -> SparseVector:
+    indices: dict[int, float] = {}
+    for term, weight in weights.items():
+        index = _term_index(term)
+        indices[index] = indices.get(index, 0.0) + weight
+
+    return SparseVector(indices=list(indices), values=list(indices.values()))
+
+
+def encode_sparse_document(text: str) -> SparseVector:
+    """
+    Encode a document into a BM25 weighted sparse vector.
+
+    Parameters
+    ----------
+    text : str
+        The text of the document.
+
+    Returns
+    -------
+    SparseVector
+        The saturated and length normalized term frequencies of the document.
+    """
+    terms = tokenize(text)
+    length_norm = 1 - BM25_B + BM25_B * len(terms) / BM25_AVG_DOCUMENT_LENGTH
+
+    weights = {
+        term: count * (BM25_K1 + 1) / (count + BM25_K1 * length_norm)
+        for term, count in Counter(terms).items()
+    }
+    return _to_sparse_vector(weights)
+
+
+def encode_sparse_query(text: str) -> SparseVector:
+    """
+    Encode a search query into a sparse vector.
+
+    Parameters
+    ----------
+    text : str
+        The search query.
+
+    Returns
+    -------
+    SparseVector
+        A unit weight for every distinct term of the query.
+    """
+    return _to_sparse_vector({term: 1.0 for term in set(tokenize(text))})
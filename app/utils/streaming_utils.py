@@ -0,0 +1,107 @@
+from typing import AsyncIterator
+
+from beanie.odm.queries.find import FindMany
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from pymongo import DESCENDING
+
+from app.utils.pagination_utils import get_listing_cursor
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_ndjson(request: Request) -> bool:
+    """
+    Check if the client asked for a NDJSON stream through the Accept header.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming request.
+
+    Returns
+    -------
+    bool
+        True if the Accept header contains `application/x-ndjson`.
+    """
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def iter_ndjson(
+    query: FindMany,
+    schema: type[BaseModel],
+    batch_size: int = 500,
+    sort_field: str = "created_at",
+) -> AsyncIterator[bytes]:
+    """
+    Iterate over the documents of a query as NDJSON chunks.
+
+    Documents are read as raw dicts straight from the Motor cursor, validated
+    against the read schema and flushed every `batch_size` documents, so only
+    one batch is held in memory at a time.
+
+    Parameters
+    ----------
+    query : FindMany
+        The Beanie query holding the endpoint's filters.
+    schema : type[BaseModel]
+        The read schema each document is serialized with.
+    batch_size : int
+        The number of documents fetched from MongoDB and flushed per chunk.
+    sort_field : str
+        The date field the documents are ordered by, latest first. Defaults to
+        `created_at`.
+
+    Yields
+    ------
+    bytes
+        A chunk of newline delimited JSON documents.
+    """
+    cursor = get_listing_cursor(
+        query.sort([(sort_field, DESCENDING), ("_id", DESCENDING)])
+    ).batch_size(batch_size)
+
+    lines = []
+    async for document in cursor:
+        document["id"] = document.pop("_id")
+        lines.append(schema.model_validate(document).model_dump_json())
+
+        if len(lines) >= batch_size:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def stream_ndjson(
+    query: FindMany,
+    schema: type[BaseModel],
+    batch_size: int = 500,
+    sort_field: str = "created_at",
+) -> StreamingResponse:
+    """
+    Stream every document of a query as a NDJSON response, from latest to oldest.
+
+    Parameters
+    ----------
+    query : FindMany
+        The Beanie query holding the endpoint's filters.
+    schema : type[BaseModel]
+        The read schema each document is serialized with.
+    batch_size : int
+        The number of documents fetched from MongoDB and flushed per chunk.
+    sort_field : str
+        The date field the documents are ordered by, latest first. Defaults to
+        `created_at`, like `paginate`.
+
+    Returns
+    -------
+    StreamingResponse
+        The NDJSON streaming response.
+    """
+    return StreamingResponse(
+        iter_ndjson(query, schema, batch_size=batch_size, sort_field=sort_field),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
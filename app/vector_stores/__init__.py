@@ -0,0 +1,3 @@
+"""
+Vector store backends for JourneyAI
+"""
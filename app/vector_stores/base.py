@@ -0,0 +1,233 @@
+import abc
+
+from qdrant_client.models import (
+    Filter,
+    PointGroup,
+    PointStruct,
+    ScoredPoint,
+    SparseVector,
+)
+
+
+class VectorStore(abc.ABC):
+    """
+    Interface of the stores holding the embeddings of messages and artifacts.
+
+    Points, filters and search results use the Qdrant models whatever the
+    backend, so callers do not depend on the backend in use.
+    """
+
+    @abc.abstractmethod
+    async def initialize(self):
+        """
+        Create the collections of the app if they do not exist yet.
+        """
+
+    @abc.abstractmethod
+    async def upsert(self, collection_name: str, point: PointStruct):
+        """
+        Insert or replace a point.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the collection.
+        point : PointStruct
+            The point to upsert. Its vector is either the dense vector, or a
+            dict holding the dense vector under "" and the sparse vectors under
+            their name.
+        """
+
+    @abc.abstractmethod
+    async def search(
+        self,
+        collection_name: str,
+        query_embedding: list[float],
+        top_k: int,
+        filter: Filter | None = None,
+        score_threshold: float | None = None,
+        with_payload: bool | list[str] = True,
+        with_vectors: bool = False,
+    ) -> list[ScoredPoint]:
+        """
+        Search the points closest to a dense query vector.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the collection to search in.
+        query_embedding : list[float]
+            The query vector to search for.
+        top_k : int
+            The number of top results to return.
+        filter : Filter | None
+            The payload filter to apply to the search.
+        score_threshold : float | None
+            The minimum cosine similarity of the results.
+        with_payload : bool | list[str]
+            Whether to return the payload of the results, or the payload keys
+            to return.
+        with_vectors : bool
+            Whether to return the dense vectors of the results.
+
+        Returns
+        -------
+        list[ScoredPoint]
+            The results, from the most to the least similar.
+        """
+
+    @abc.abstractmethod
+    async def search_groups(
+        self,
+        collection_name: str,
+        query_embedding: list[float],
+        group_by: str,
+        group_size: int,
+        limit: int,
+        filter: Filter | None = None,
+        score_threshold: float | None = None,
+        with_payload: bool | list[str] = True,
+        with_vectors: bool = False,
+    ) -> list[PointGroup]:
+        """
+        Search the points closest to a dense query vector, grouped by the value
+        of a payload field.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the collection to search in.
+        query_embedding : list[float]
+            The query vector to search for.
+        group_by : str
+            The payload field the points are grouped by.
+        group_size : int
+            The maximum number of points per group.
+        limit : int
+            The maximum number of groups.
+        filter : Filter | None
+            The payload filter to apply to the search.
+        score_threshold : float | None
+            The minimum cosine similarity of the results.
+        with_payload : bool | list[str]
+            Whether to return the payload of the results, or the payload keys
+            to return.
+        with_vectors : bool
+            Whether to return the dense vectors of the results.
+
+        Returns
+        -------
+        list[PointGroup]
+            The groups, ordered by their best hit.
+        """
+
+    @abc.abstractmethod
+    async def hybrid_search(
+        self,
+        collection_name: str,
+        query_embedding: list[float],
+        query_sparse_vector: SparseVector,
+        top_k: int,
+        filter: Filter | None = None,
+        score_threshold: float | None = None,
+        with_payload: bool | list[str] = True,
+        sparse_limit: int | None = None,
+        sparse_score_threshold: float | None = None,
+    ) -> list[ScoredPoint]:
+        """
+        Search with both the dense and sparse vectors, fused by reciprocal rank.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the collection to search in.
+        query_embedding : list[float]
+            The dense query vector.
+        query_sparse_vector : SparseVector
+            The BM25 sparse query vector.
+        top_k : int
+            The number of top results to return.
+        filter : Filter | None
+            The payload filter to apply to the search.
+        score_threshold : float | None
+            The minimum cosine similarity of the dense candidates.
+        with_payload : bool | list[str]
+            Whether to return the payload of the results, or the payload keys
+            to return.
+        sparse_limit : int | None
+            The number of sparse candidates, twice `top_k` if None.
+        sparse_score_threshold : float | None
+            The minimum BM25 score of the sparse candidates.
+
+        Returns
+        -------
+        list[ScoredPoint]
+            The results, scored by their fused rank.
+        """
+
+    @abc.abstractmethod
+    async def has_sparse_vectors(self, collection_name: str) -> bool:
+        """
+        Check if a collection stores the BM25 sparse vectors.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the collection.
+
+        Returns
+        -------
+        bool
+            True if the collection has the sparse vector.
+        """
+
+    @abc.abstractmethod
+    async def set_payload(self, collection_name: str, id: str, payload: dict):
+        """
+        Replace the payload of a point without touching its vectors.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the collection.
+        id : str
+            The ID of the point.
+        payload : dict
+            The new payload of the point.
+        """
+
+    @abc.abstractmethod
+    async def delete(self, collection_name: str, ids: list[str]):
+        """
+        Delete points by their IDs.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the collection.
+        ids : list[str]
+            The IDs of the points to delete.
+        """
+
+    @abc.abstractmethod
+    async def delete_by_filter(self, collection_name: str, filter: Filter) -> int:
+        """
+        Delete every point matching a payload filter.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the collection.
+        filter : Filter
+            The payload filter selecting the points to delete.
+
+        Returns
+        -------
+        int
+            The number of points deleted.
+        """
+
+    async def close(self):
+        """
+        Flush the pending writes of the store.
+        """
@@ -0,0 +1,542 @@
+import datetime as dt
+import math
+
+import numpy as np
+from qdrant_client.models import (
+    DatetimeRange,
+    FieldCondition,
+    Filter,
+    HasIdCondition,
+    IsEmptyCondition,
+    IsNullCondition,
+    MatchAny,
+    MatchExcept,
+    MatchText,
+    MatchValue,
+    PointGroup,
+    PointStruct,
+    ScoredPoint,
+    SparseVector,
+)
+
+from app.utils.sparse_utils import SPARSE_VECTOR_NAME
+from app.vector_stores.base import VectorStore
+
+# Rank constant of the reciprocal rank fusion of the hybrid search
+RRF_K = 60
+
+# Deleted rows are compacted once they are more than half of a collection
+COMPACTION_MIN_ROWS = 1024
+
+
+class NumpyCollection:
+    """
+    In-memory collection holding unit dense vectors in a float32 matrix.
+
+    Rows are appended to a matrix grown by doubling. Deleted rows are masked
+    out and compacted once they make up most of the matrix. Sparse vectors are
+    kept in an inverted index of term -> {row: weight}. Keyword filters are
+    evaluated on per-field columns of payload values, rebuilt after writes.
+    """
+
+    def __init__(self, sparse: bool = False):
+        self.sparse = sparse
+        self.ids: list[str] = []
+        self.payloads: list[dict | None] = []
+        self.rows: dict[str, int] = {}
+        self.vectors: np.ndarray | None = None
+        self.alive = np.zeros(0, dtype=bool)
+        self.postings: dict[int, dict[int, float]] = {}
+        self.sparse_rows: dict[int, SparseVector] = {}
+        self._columns: dict[str, np.ndarray | None] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def upsert(self, id: str, vector: list[float], payload: dict | None, sparse_vector):
+        dense = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(dense)
+        if norm:
+            dense = dense / norm
+
+        if self.vectors is None:
+            self.vectors = np.zeros((16, dense.shape[0]), dtype=np.float32)
+            self.alive = np.zeros(16, dtype=bool)
+        elif dense.shape[0] != self.vectors.shape[1]:
+            raise ValueError(
+                f"Vector dimension {dense.shape[0]} does not match the "
+                f"collection dimension {self.vectors.shape[1]}"
+            )
+
+        if id in self.rows:
+            row = self.rows[id]
+            self._remove_sparse(row)
+        else:
+            row = len(self.ids)
+            if row == self.vectors.shape[0]:
+                self._grow()
+            self.ids.append(id)
+            self.payloads.append(None)
+            self.rows[id] = row
+
+        self.vectors[row] = dense
+        self.alive[row] = True
+        self.payloads[row] = payload or {}
+        self._columns.clear()
+
+        if self.sparse and sparse_vector is not None:
+            self.sparse_rows[row] = sparse_vector
+            for index, value in zip(sparse_vector.indices, sparse_vector.values):
+                self.postings.setdefault(index, {})[row] = value
+
+    def set_payload(self, id: str, payload: dict):
+        row = self.rows.get(id)
+        if row is not None:
+            self.payloads[row] = payload
+            self._columns.clear()
+
+    def delete(self, ids: list[str]) -> int:
+        deleted = 0
+        for id in ids:
+            row = self.rows.pop(id, None)
+            if row is None:
+                continue
+            self.alive[row] = False
+            self.payloads[row] = None
+            self._remove_sparse(row)
+            deleted += 1
+        self._columns.clear()
+
+        dead = len(self.ids) - len(self.rows)
+        if dead > COMPACTION_MIN_ROWS and dead > len(self.rows):
+            self._compact()
+        return deleted
+
+    def filter_mask(self, filter: Filter | None) -> np.ndarray:
+        """
+        Build the mask of the live rows matching a payload filter.
+        """
+        mask = self.alive[: len(self.ids)].copy()
+        if filter is not None:
+            mask &= self._filter_mask(filter)
+        return mask
+
+    def _filter_mask(self, filter: Filter) -> np.ndarray:
+        n = len(self.ids)
+        mask = np.ones(n, dtype=bool)
+        for condition in _as_list(filter.must):
+            mask &= self._condition_mask(condition)
+
+        should = _as_list(filter.should)
+        if should:
+            any_mask = np.zeros(n, dtype=bool)
+            for condition in should:
+                any_mask |= self._condition_mask(condition)
+            mask &= any_mask
+
+        for condition in _as_list(filter.must_not):
+            mask &= ~self._condition_mask(condition)
+        return mask
+
+    def _condition_mask(self, condition) -> np.ndarray:
+        if isinstance(condition, Filter):
+            return self._filter_mask(condition)
+
+        # Keyword matches are compared on the whole column at once
+        if isinstance(condition, FieldCondition) and isinstance(
+            condition.match, (MatchValue, MatchAny)
+        ):
+            column = self._column(condition.key)
+            if column is not None:
+                if isinstance(condition.match, MatchValue):
+                    return column == condition.match.value
+                mask = np.zeros(len(column), dtype=bool)
+                for value in condition.match.any:
+                    mask |= column == value
+                return mask
+
+        return np.fromiter(
+            (
+                payload is not None and _matches_condition(id, payload, condition)
+                for id, payload in zip(self.ids, self.payloads)
+            ),
+            dtype=bool,
+            count=len(self.ids),
+        )
+
+    def _column(self, key: str) -> np.ndarray | None:
+        """
+        Get the values of a payload field for every row, None if some of them
+        are lists or objects, which are matched row by row.
+        """
+        if key not in self._columns:
+            values = [
+                None if payload is None else _get_value(payload, key)
+                for payload in self.payloads
+            ]
+            column = None
+            if not any(isinstance(value, (list, dict)) for value in values):
+                column = np.empty(len(values), dtype=object)
+                column[:] = values
+            self._columns[key] = column
+        return self._columns[key]
+
+    def dense_scores(self, query_embedding: list[float]) -> np.ndarray:
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        return self.vectors[: len(self.ids)] @ query
+
+    def sparse_scores(self, query_sparse_vector: SparseVector) -> dict[int, float]:
+        """
+        Score the rows sharing terms with the query, weighted by the IDF of the
+        terms like Qdrant's IDF modifier.
+        """
+        total = len(self.sparse_rows)
+        scores: dict[int, float] = {}
+        for index, value in zip(
+            query_sparse_vector.indices, query_sparse_vector.values
+        ):
+            postings = self.postings.get(index)
+            if not postings:
+                continue
+            idf = math.log((total - len(postings) + 0.5) / (len(postings) + 0.5) + 1)
+            for row, weight in postings.items():
+                scores[row] = scores.get(row, 0.0) + value * weight * idf
+        return scores
+
+    def _grow(self):
+        capacity = self.vectors.shape[0] * 2
+        vectors = np.zeros((capacity, self.vectors.shape[1]), dtype=np.float32)
+        vectors[: self.vectors.shape[0]] = self.vectors
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self.alive.shape[0]] = self.alive
+        self.vectors, self.alive = vectors, alive
+
+    def _remove_sparse(self, row: int):
+        sparse_vector = self.sparse_rows.pop(row, None)
+        if sparse_vector is None:
+            return
+        for index in sparse_vector.indices:
+            postings = self.postings.get(index)
+            if postings is not None:
+                postings.pop(row, None)
+                if not postings:
+                    del self.postings[index]
+
+    def _compact(self):
+        rows = np.flatnonzero(self.alive[: len(self.ids)])
+        sparse_rows = {
+            new_row: self.sparse_rows[row]
+            for new_row, row in enumerate(rows)
+            if row in self.sparse_rows
+        }
+
+        self.vectors = self.vectors[rows].copy()
+        self.alive = np.ones(len(rows), dtype=bool)
+        self.ids = [self.ids[row] for row in rows]
+        self.payloads = [self.payloads[row] for row in rows]
+        self.rows = {id: row for row, id in enumerate(self.ids)}
+        self._columns.clear()
+
+        self.sparse_rows, self.postings = {}, {}
+        for row, sparse_vector in sparse_rows.items():
+            self.sparse_rows[row] = sparse_vector
+            for index, value in zip(sparse_vector.indices, sparse_vector.values):
+                self.postings.setdefault(index, {})[row] = value
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    In-process vector store using brute force cosine search over NumPy arrays.
+
+    Meant for tests, local benchmarks and single process development setups:
+    the points only live in the memory of the process that inserted them, so
+    the API does not see the points inserted by separate worker processes.
+    Filters using conditions it cannot evaluate, like geo conditions, raise a
+    ValueError.
+    """
+
+    def __init__(self):
+        self.collections: dict[str, NumpyCollection] = {}
+
+    async def initialize(self):
+        self.collections.setdefault("Artifacts", NumpyCollection(sparse=True))
+        self.collections.setdefault("Messages", NumpyCollection())
+
+    def _collection(self, collection_name: str) -> NumpyCollection:
+        return self.collections.setdefault(collection_name, NumpyCollection())
+
+    async def upsert(self, collection_name: str, point: PointStruct):
+        vector, sparse_vector = point.vector, None
+        if isinstance(vector, dict):
+            sparse_vector = vector.get(SPARSE_VECTOR_NAME)
+            vector = vector[""]
+
+        self._collection(collection_name).upsert(
+            str(point.id), vector, point.payload, sparse_vector
+        )
+
+    async def search(
+        self,
+        collection_name: str,
+        query_embedding: list[float],
+        top_k: int,
+        filter: Filter | None = None,
+        score_threshold: float | None = None,
+        with_payload: bool | list[str] = True,
+        with_vectors: bool = False,
+    ) -> list[ScoredPoint]:
+        collection = self._collection(collection_name)
+        if not len(collection):
+            return []
+
+        rows, scores = self._dense_top_k(
+            collection, query_embedding, top_k, filter, score_threshold
+        )
+        return [
+            _scored_point(collection, row, score, with_payload, with_vectors)
+            for row, score in zip(rows, scores)
+        ]
+
+    async def search_groups(
+        self,
+        collection_name: str,
+        query_embedding: list[float],
+        group_by: str,
+        group_size: int,
+        limit: int,
+        filter: Filter | None = None,
+        score_threshold: float | None = None,
+        with_payload: bool | list[str] = True,
+        with_vectors: bool = False,
+    ) -> list[PointGroup]:
+        collection = self._collection(collection_name)
+        if not len(collection):
+            return []
+
+        rows, scores = self._dense_top_k(
+            collection, query_embedding, len(collection), filter, score_threshold
+        )
+
+        # Groups are opened by their best hit, in order of decreasing score
+        groups: dict[str, list[ScoredPoint]] = {}
+        for row, score in zip(rows, scores):
+            key = _get_value(collection.payloads[row], group_by)
+            if key is None or isinstance(key, (list, dict)):
+                continue
+            if key not in groups:
+                if len(groups) == limit:
+                    continue
+                groups[key] = []
+            if len(groups[key]) < group_size:
+                groups[key].append(
+                    _scored_point(collection, row, score, with_payload, with_vectors)
+                )
+
+        return [PointGroup(id=key, hits=hits) for key, hits in groups.items()]
+
+    async def hybrid_search(
+        self,
+        collection_name: str,
+        query_embedding: list[float],
+        query_sparse_vector: SparseVector,
+        top_k: int,
+        filter: Filter | None = None,
+        score_threshold: float | None = None,
+        with_payload: bool | list[str] = True,
+        sparse_limit: int | None = None,
+        sparse_score_threshold: float | None = None,
+    ) -> list[ScoredPoint]:
+        collection = self._collection(collection_name)
+        if not len(collection):
+            return []
+
+        mask = collection.filter_mask(filter)
+        dense_rows, _ = self._dense_top_k(
+            collection, query_embedding, top_k * 2, None, score_threshold, mask
+        )
+        sparse_scores = collection.sparse_scores(query_sparse_vector)
+        sparse_rows = sorted(
+            (
+                row
+                for row, score in sparse_scores.items()
+                if mask[row]
+                and (sparse_score_threshold is None or score >= sparse_score_threshold)
+            ),
+            key=sparse_scores.get,
+            reverse=True,
+        )[: sparse_limit or top_k * 2]
+
+        fused: dict[int, float] = {}
+        for rows in (dense_rows, sparse_rows):
+            for rank, row in enumerate(rows):
+                fused[row] = fused.get(row, 0.0) + 1 / (RRF_K + rank + 1)
+
+        rows = sorted(fused, key=fused.get, reverse=True)[:top_k]
+        return [
+            _scored_point(collection, row, fused[row], with_payload) for row in rows
+        ]
+
+    async def has_sparse_vectors(self, collection_name: str) -> bool:
+        return self._collection(collection_name).sparse
+
+    async def set_payload(self, collection_name: str, id: str, payload: dict):
+        self._collection(collection_name).set_payload(str(id), payload)
+
+    async def delete(self, collection_name: str, ids: list[str]):
+        self._collection(collection_name).delete([str(id) for id in ids])
+
+    async def delete_by_filter(self, collection_name: str, filter: Filter) -> int:
+        collection = self._collection(collection_name)
+        if not len(collection):
+            return 0
+
+        mask = collection.filter_mask(filter)
+        return collection.delete([collection.ids[row] for row in np.flatnonzero(mask)])
+
+    @staticmethod
+    def _dense_top_k(
+        collection: NumpyCollection,
+        query_embedding: list[float],
+        top_k: int,
+        filter: Filter | None,
+        score_threshold: float | None,
+        mask: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Select the `top_k` rows of highest cosine similarity among the rows
+        matching the filter, with `argpartition` instead of a full sort.
+        """
+        if mask is None:
+            mask = collection.filter_mask(filter)
+
+        scores = collection.dense_scores(query_embedding)
+        if score_threshold is not None:
+            mask = mask & (scores >= score_threshold)
+
+        candidates = np.flatnonzero(mask)
+        if len(candidates) > top_k:
+            top = np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+            candidates = candidates[top]
+
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return candidates, scores[candidates]
+
+
+def _scored_point(
+    collection: NumpyCollection,
+    row: int,
+    score: float,
+    with_payload: bool | list[str],
+    with_vectors: bool = False,
+) -> ScoredPoint:
+    payload = collection.payloads[row]
+    if with_payload is False:
+        payload = None
+    elif isinstance(with_payload, list):
+        payload = {key: payload[key] for key in with_payload if key in payload}
+    else:
+        payload = dict(payload)
+
+    return ScoredPoint(
+        id=collection.ids[row],
+        version=0,
+        score=float(score),
+        payload=payload,
+        vector=collection.vectors[row].tolist() if with_vectors else None,
+    )
+
+
+def _get_value(payload: dict, key: str, default=None):
+    value = payload
+    for part in key.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return default
+        value = value[part]
+    return value
+
+
+def _to_datetime(value) -> dt.datetime | None:
+    if isinstance(value, str):
+        value = dt.datetime.fromisoformat(value)
+    if isinstance(value, dt.datetime) and value.tzinfo is None:
+        value = value.replace(tzinfo=dt.timezone.utc)
+    return value
+
+
+def _matches_field(payload: dict, condition: FieldCondition) -> bool:
+    value = _get_value(payload, condition.key)
+    values = value if isinstance(value, list) else [value]
+
+    match = condition.match
+    if isinstance(match, MatchValue):
+        return match.value in values
+    if isinstance(match, MatchAny):
+        return any(item in match.any for item in values)
+    if isinstance(match, MatchExcept):
+        return value is not None and all(item not in match.except_ for item in values)
+    if isinstance(match, MatchText):
+        return any(isinstance(item, str) and match.text in item for item in values)
+
+    value_range = condition.range
+    if value_range is not None:
+        if value is None:
+            return False
+        convert = _to_datetime if isinstance(value_range, DatetimeRange) else float
+        value = convert(value)
+        bounds = {
+            key: convert(bound)
+            for key, bound in value_range.model_dump(exclude_none=True).items()
+        }
+        return (
+            ("gt" not in bounds or value > bounds["gt"])
+            and ("gte" not in bounds or value >= bounds["gte"])
+            and ("lt" not in bounds or value < bounds["lt"])
+            and ("lte" not in bounds or value <= bounds["lte"])
+        )
+
+    raise ValueError(f"Unsupported field condition: {condition}")
+
+
+def _matches_condition(id: str, payload: dict, condition) -> bool:
+    if isinstance(condition, Filter):
+        return _matches_filter(id, payload, condition)
+    if isinstance(condition, FieldCondition):
+        return _matches_field(payload, condition)
+    if isinstance(condition, HasIdCondition):
+        return id in {str(point_id) for point_id in condition.has_id}
+    if isinstance(condition, IsEmptyCondition):
+        return _get_value(payload, condition.is_empty.key) in (None, [])
+    if isinstance(condition, IsNullCondition):
+        # Like Qdrant, a missing field is empty but not null
+        return _get_value(payload, condition.is_null.key, default=...) is None
+
+    raise ValueError(f"Unsupported filter condition: {condition}")
+
+
+def _as_list(conditions) -> list:
+    if conditions is None:
+        return []
+    return conditions if isinstance(conditions, list) else [conditions]
+
+
+def _matches_filter(id: str, payload: dict, filter: Filter) -> bool:
+    """
+    Evaluate a Qdrant payload filter against the payload of a point.
+    """
+    must = _as_list(filter.must)
+    should = _as_list(filter.should)
+    must_not = _as_list(filter.must_not)
+
+    return (
+        all(_matches_condition(id, payload, condition) for condition in must)
+        and (
+            not should
+            or any(_matches_condition(id, payload, condition) for condition in should)
+        )
+        and not any(
+            _matches_condition(id, payload, condition) for condition in must_not
+        )
+    )
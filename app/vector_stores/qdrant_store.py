@@ -0,0 +1,311 @@
+import asyncio
+import time
+
+from loguru import logger
+from qdrant_client.models import (
+    Filter,
+    FilterSelector,
+    Fusion,
+    FusionQuery,
+    PointGroup,
+    PointIdsList,
+    PointStruct,
+    Prefetch,
+    QuantizationSearchParams,
+    ScoredPoint,
+    SearchParams,
+    SparseVector,
+    UpdateResult,
+    UpdateStatus,
+)
+
+from app.clients.qdrant_client import get_async_qdrant_client
+from app.core.config import settings
+from app.db.init_qdrant import init_qdrant_db
+from app.utils.sparse_utils import SPARSE_VECTOR_NAME
+from app.vector_stores.base import VectorStore
+
+# Collections are cached for a while only, so long lived workers pick up the
+# collection an alias points to after a re-index.
+SPARSE_COLLECTIONS_CACHE_TTL = 300
+
+
+class UpsertBuffer:
+    """
+    Per process buffer batching single point upserts into bulk upserts.
+
+    Points are buffered per collection and flushed with `wait=False` once
+    `batch_size` points are pending or `flush_interval` seconds after the first
+    point of the batch. Each caller waits for the acknowledgement of the batch
+    holding its point, so a failed batch still fails every job in it.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._batches: dict[str, list[tuple[PointStruct, asyncio.Future]]] = {}
+        self._timers: dict[str, asyncio.Task] = {}
+        self._flushes: set[asyncio.Task] = set()
+
+    async def upsert(self, collection_name: str, point: PointStruct) -> UpdateResult:
+        """
+        Buffer a point and wait until the batch holding it is acknowledged.
+
+        Parameters
+        ----------
+        collection_name : str
+            The name of the collection.
+        point : PointStruct
+            The point to upsert.
+
+        Returns
+        -------
+        UpdateResult
+            The result of the batch upsert.
+
+        Raises
+        ------
+        Exception
+            If the batch upsert failed or was not acknowledged.
+        """
+        future = asyncio.get_running_loop().create_future()
+
+        batch = self._batches.setdefault(collection_name, [])
+        batch.append((point, future))
+
+        if len(batch) >= self.batch_size:
+            self._flush(collection_name)
+        elif collection_name not in self._timers:
+            self._timers[collection_name] = asyncio.create_task(
+                self._flush_later(collection_name)
+            )
+
+        return await future
+
+    async def close(self):
+        """
+        Flush every pending point and wait for their acknowledgements.
+        """
+        for collection_name in list(self._batches):
+            self._flush(collection_name)
+
+        await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    async def _flush_later(self, collection_name: str):
+        await asyncio.sleep(self.flush_interval)
+
+        del self._timers[collection_name]
+        self._flush(collection_name)
+
+    def _flush(self, collection_name: str):
+        """
+        Start the upsert of the pending batch of a collection.
+        """
+        timer = self._timers.pop(collection_name, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._batches.pop(collection_name, None)
+        if batch:
+            task = asyncio.create_task(self._upsert_batch(collection_name, batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _upsert_batch(
+        self, collection_name: str, batch: list[tuple[PointStruct, asyncio.Future]]
+    ):
+        client = get_async_qdrant_client()
+        try:
+            result = await client.upsert(
+                collection_name=collection_name,
+                points=[point for point, _ in batch],
+                wait=False,
+            )
+            if result.status not in (UpdateStatus.ACKNOWLEDGED, UpdateStatus.COMPLETED):
+                raise RuntimeError(f"Upsert was not acknowledged: {result.status}")
+
+            logger.debug(f"Upserted {len(batch)} points into '{collection_name}'")
+        except Exception as e:
+            logger.exception(f"Error upserting {len(batch)} points: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for _, future in batch:
+            if not future.done():
+                future.set_result(result)
+
+
+def get_search_params() -> SearchParams | None:
+    """
+    Get the search parameters matching the quantization of the collections.
+
+    Returns
+    -------
+    SearchParams | None
+        The rescoring parameters when quantization is enabled, None otherwise.
+    """
+    if not settings.QDRANT_QUANTIZATION:
+        return None
+
+    return SearchParams(
+        quantization=QuantizationSearchParams(
+            rescore=settings.QDRANT_QUANTIZATION_RESCORE,
+            oversampling=settings.QDRANT_QUANTIZATION_OVERSAMPLING,
+        )
+    )
+
+
+class QdrantVectorStore(VectorStore):
+    """
+    Vector store backed by the Qdrant server.
+
+    Upserts of this process are batched through an `UpsertBuffer`.
+    """
+
+    def __init__(self):
+        self.upsert_buffer = UpsertBuffer(
+            batch_size=settings.QDRANT_UPSERT_BATCH_SIZE,
+            flush_interval=settings.QDRANT_UPSERT_FLUSH_INTERVAL_MS / 1000,
+        )
+        self._sparse_collections: dict[str, tuple[bool, float]] = {}
+
+    async def initialize(self):
+        await init_qdrant_db()
+
+    async def upsert(self, collection_name: str, point: PointStruct):
+        await self.upsert_buffer.upsert(collection_name, point)
+
+    async def search(
+        self,
+        collection_name: str,
+        query_embedding: list[float],
+        top_k: int,
+        filter: Filter | None = None,
+        score_threshold: float | None = None,
+        with_payload: bool | list[str] = True,
+        with_vectors: bool = False,
+    ) -> list[ScoredPoint]:
+        client = get_async_qdrant_client()
+        return await client.search(
+            collection_name=collection_name,
+            query_vector=query_embedding,
+            limit=top_k,
+            query_filter=filter,
+            score_threshold=score_threshold,
+            search_params=get_search_params(),
+            with_payload=with_payload,
+            with_vectors=with_vectors,
+        )
+
+    async def search_groups(
+        self,
+        collection_name: str,
+        query_embedding: list[float],
+        group_by: str,
+        group_size: int,
+        limit: int,
+        filter: Filter | None = None,
+        score_threshold: float | None = None,
+        with_payload: bool | list[str] = True,
+        with_vectors: bool = False,
+    ) -> list[PointGroup]:
+        client = get_async_qdrant_client()
+        response = await client.query_points_groups(
+            collection_name=collection_name,
+            query=query_embedding,
+            group_by=group_by,
+            group_size=group_size,
+            limit=limit,
+            query_filter=filter,
+            score_threshold=score_threshold,
+            search_params=get_search_params(),
+            with_payload=with_payload,
+            with_vectors=with_vectors,
+        )
+        return response.groups
+
+    async def hybrid_search(
+        self,
+        collection_name: str,
+        query_embedding: list[float],
+        query_sparse_vector: SparseVector,
+        top_k: int,
+        filter: Filter | None = None,
+        score_threshold: float | None = None,
+        with_payload: bool | list[str] = True,
+        sparse_limit: int | None = None,
+        sparse_score_threshold: float | None = None,
+    ) -> list[ScoredPoint]:
+        client = get_async_qdrant_client()
+        response = await client.query_points(
+            collection_name=collection_name,
+            prefetch=[
+                Prefetch(
+                    query=query_embedding,
+                    filter=filter,
+                    params=get_search_params(),
+                    score_threshold=score_threshold,
+                    limit=top_k * 2,
+                ),
+                Prefetch(
+                    query=query_sparse_vector,
+                    using=SPARSE_VECTOR_NAME,
+                    filter=filter,
+                    score_threshold=sparse_score_threshold,
+                    limit=sparse_limit or top_k * 2,
+                ),
+            ],
+            query=FusionQuery(fusion=Fusion.RRF),
+            limit=top_k,
+            with_payload=with_payload,
+        )
+        return response.points
+
+    async def has_sparse_vectors(self, collection_name: str) -> bool:
+        # The answer is cached for `SPARSE_COLLECTIONS_CACHE_TTL` seconds
+        cached = self._sparse_collections.get(collection_name)
+        if (
+            cached is not None
+            and time.monotonic() - cached[1] < SPARSE_COLLECTIONS_CACHE_TTL
+        ):
+            return cached[0]
+
+        client = get_async_qdrant_client()
+        collection = await client.get_collection(collection_name)
+        sparse_vectors = collection.config.params.sparse_vectors or {}
+        has_sparse = SPARSE_VECTOR_NAME in sparse_vectors
+        self._sparse_collections[collection_name] = (has_sparse, time.monotonic())
+
+        return has_sparse
+
+    async def set_payload(self, collection_name: str, id: str, payload: dict):
+        client = get_async_qdrant_client()
+        await client.overwrite_payload(
+            collection_name=collection_name, payload=payload, points=[id]
+        )
+
+    async def delete(self, collection_name: str, ids: list[str]):
+        client = get_async_qdrant_client()
+        await client.delete(
+            collection_name=collection_name,
+            points_selector=PointIdsList(points=ids),
+        )
+
+    async def delete_by_filter(self, collection_name: str, filter: Filter) -> int:
+        client = get_async_qdrant_client()
+        count = await client.count(
+            collection_name=collection_name, count_filter=filter, exact=True
+        )
+        if count.count:
+            await client.delete(
+                collection_name=collection_name,
+                points_selector=FilterSelector(filter=filter),
+            )
+        return count.count
+
+    async def close(self):
+        # Flush the vectors still waiting in the upsert buffer
+        await self.upsert_buffer.close()
+        logger.success("Qdrant upsert buffer flushed")
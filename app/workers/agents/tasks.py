@@ -1,16 +1,20 @@
+import datetime as dt
+
 from agents import RunResultStreaming
 from loguru import logger
 from openai.types.responses.response_text_delta_event import ResponseTextDeltaEvent
 
+from app.clients.arq_client import enqueue_jobs
 from app.core.assistants import assistants_manager
+from app.db.identity_map import with_identity_map
 from app.external.ai_service import generate_response
 from app.models.message import Message
 from app.schemas.types import SenderType
+from app.utils.session_utils import record_session_messages
 from app.utils.websocket.communications import send_to_websocket
 from app.workers.agents.utils import (
     convert_messages_to_openai_format,
-    fetch_message_history,
-    get_objects_from_session,
+    load_agent_context,
 )
 
 
@@ -102,6 +106,7 @@ async def emit_stream_events(
     )
 
 
+@with_identity_map
 async def process_session(ctx, connection_id: str, session_id: str):
     """
     Process a session by fetching messages and generating a response.
@@ -122,11 +127,11 @@ async def process_session(ctx, connection_id: str, session_id: str):
         connection_id, "processing_session", {"session_id": session_id}
     )
 
-    # Get objects and perform checks
-    session, assistant = await get_objects_from_session(session_id)
-
-    # Fetch the last 100 messages from this session
-    messages = await fetch_message_history(session_id)
+    # Get objects, perform checks and fetch the last 100 messages of this session
+    context = await load_agent_context(session_id)
+    session = context.session
+    assistant = context.assistant
+    messages = context.history
 
     with logger.contextualize(
         session_id=session_id,
@@ -156,25 +161,19 @@ async def process_session(ctx, connection_id: str, session_id: str):
         try:
             # Convert the messages into a format OpenAI understands
             input = convert_messages_to_openai_format(messages)
-            result = await generate_response(
-                agent,
-                input,
-                session.user_id,
-                session.organization_id,
-                session.account_id,
-                session_id,
-                assistant=assistant,
-                history=messages,
-            )
+            result = await generate_response(agent, input, context)
 
             # Stream events to the websocket for real time support
             await emit_stream_events(connection_id, result, session_id)
 
-            # Save the response to the database
-            new_items = [item.to_input_item() for item in result.new_items]
-            for new_item in new_items:
-                new_message = Message(
-                    output=new_item,
+            # Save the response to the database in a single round trip. Items
+            # are spaced by a millisecond, the precision of MongoDB dates, so
+            # the history keeps their order.
+            created_at = dt.datetime.now(dt.timezone.utc)
+            new_messages = [
+                Message(
+                    output=item.to_input_item(),
+                    created_at=created_at + dt.timedelta(milliseconds=i),
                     sender=SenderType.ASSISTANT,
                     user_id=session.user_id,
                     organization_id=session.organization_id,
@@ -183,12 +182,24 @@ async def process_session(ctx, connection_id: str, session_id: str):
                     assistant_id=assistant.id,
                     embed_after_insert=True,
                 )
-                await new_message.save()
+                for i, item in enumerate(result.new_items)
+            ]
+            if new_messages:
+                await Message.insert_many(new_messages)
+                await record_session_messages(
+                    session_id,
+                    SenderType.ASSISTANT,
+                    len(new_messages),
+                    new_messages[-1].created_at,
+                )
+                logger.info(f"Saved {len(new_messages)} new messages")
 
-                await arq.enqueue_job(
+                # Enqueue the embedding of every new message in one Redis call
+                await enqueue_jobs(
+                    arq,
                     "post_message_creation",
-                    new_message.id,
-                    _queue_name="messages",
+                    [(new_message.id,) for new_message in new_messages],
+                    queue_name="messages",
                 )
         finally:
             # Stop the MCP servers
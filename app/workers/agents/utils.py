@@ -1,39 +1,73 @@
+import asyncio
+
 from openai.types.responses.response_input_item_param import ResponseInputItemParam
 
+from app.db.identity_map import get_document
+from app.models.account import Account
 from app.models.assistant import Assistant
 from app.models.message import Message
+from app.models.organization import Organization
 from app.models.session import Session
+from app.models.user import User
+from app.schemas.agent_context import AgentContext
 from app.schemas.types import SenderType
 
 
-async def get_objects_from_session(session_id: str) -> tuple[Session, Assistant]:
+async def load_agent_context(session_id: str, history_limit: int = 100) -> AgentContext:
     """
-    Retrieve the Session and Assistant objects associated with a given session ID.
+    Load every object an agent run needs for a given session ID.
+
+    The session and its message history are fetched concurrently, then the
+    assistant, user, organization and account the session points to are
+    fetched concurrently, so the whole context costs two MongoDB round trips.
 
     Parameters
     ----------
     session_id : str
         The unique identifier for the session.
+    history_limit : int, optional
+        The maximum number of history messages to fetch. Defaults to 100.
 
     Returns
     -------
-    tuple[Session, Assistant]
-        A tuple containing the Session and Assistant objects.
+    AgentContext
+        The context of the agent run.
 
     Raises
     ------
     ValueError
-        If the session or assistant cannot be found.
+        If the session or any of the objects it points to cannot be found.
     """
-    session = await Session.get(session_id)
+    session, history = await asyncio.gather(
+        get_document(Session, session_id),
+        fetch_message_history(session_id, limit=history_limit),
+    )
     if not session:
         raise ValueError(f"Session not found: {session_id}")
 
-    assistant = await Assistant.get(session.assistant_id)
+    assistant, user, organization, account = await asyncio.gather(
+        get_document(Assistant, session.assistant_id),
+        get_document(User, session.user_id),
+        get_document(Organization, session.organization_id),
+        get_document(Account, session.account_id),
+    )
     if not assistant:
         raise ValueError(f"Assistant not found: {session.assistant_id}")
-
-    return session, assistant
+    if not user:
+        raise ValueError(f"User not found: {session.user_id}")
+    if not organization:
+        raise ValueError(f"Organization not found: {session.organization_id}")
+    if not account:
+        raise ValueError(f"Account not found: {session.account_id}")
+
+    return AgentContext(
+        user=user,
+        organization=organization,
+        account=account,
+        session=session,
+        assistant=assistant,
+        history=history,
+    )
 
 
 async def fetch_message_history(session_id: str, limit: int = 100) -> list[Message]:
@@ -2,6 +2,7 @@ from arq.connections import RedisSettings
 from loguru import logger
 
 from app.clients.arq_client import close_arq_pool, get_arq
+from app.clients.mongo_client import get_pool_metrics
 from app.clients.redis_client import close_redis_connections
 from app.core.config import settings
 from app.core.starters import initialize_worker
@@ -28,6 +29,8 @@ async def shutdown(ctx):
     This function closes all Redis connections to prevent
     connection leaks when the worker is terminated.
     """
+    logger.info(f"MongoDB pool metrics: {get_pool_metrics()}")
+
     try:
         # Close ARQ Redis pool
         await close_arq_pool()
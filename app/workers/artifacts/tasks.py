@@ -1,29 +1,111 @@
+import asyncio
+
 from loguru import logger
 
 from app.external.ai_service import get_embeddings
 from app.models.artifact import Artifact
-from app.utils.constructor_utils import construct_embedding_input_for_artifact
-from app.utils.qdrant_utils import insert_vector
+from app.utils.constructor_utils import (
+    chunk_embedding_text,
+    construct_content_hash_for_artifact,
+    construct_embedding_input_for_artifact,
+    construct_payload_for_artifact,
+)
+from app.utils.qdrant_utils import (
+    delete_document_vectors,
+    has_sparse_vectors,
+    insert_document_vectors,
+    set_document_payload,
+)
+from app.utils.sparse_utils import encode_sparse_document
 
 
-async def post_artifact_creation(ctx, id: str):
-    artifact = await Artifact.get(id)
+async def embed_artifact(artifact: Artifact, replace: bool = True):
+    """
+    Embed the chunks of an artifact into Qdrant and record the hash of its
+    embedded content.
 
-    logger.debug(f"Fetched artifact: {artifact.title}")
+    Parameters
+    ----------
+    artifact : Artifact
+        The artifact to embed.
+    replace : bool
+        Whether to delete the chunks left over from a longer previous body,
+        only needed when re-embedding an artifact.
+    """
 
-    # Generate embeddings from artifact
-    embedding_input = construct_embedding_input_for_artifact(
-        title=artifact.title, body=artifact.body, source="user"
-    )
+    content_hash = construct_content_hash_for_artifact(artifact.title, artifact.body)
+
+    # Generate embeddings from the chunks of the artifact
+    chunks = chunk_embedding_text(artifact.body)
+    embedding_inputs = [
+        construct_embedding_input_for_artifact(
+            title=artifact.title, body=chunk, source="user"
+        )
+        for chunk in chunks
+    ]
+
+    # Chunks are coalesced into batch requests with the ones of other jobs
+    artifact_embeddings = await asyncio.gather(*map(get_embeddings, embedding_inputs))
 
-    artifact_embeddings = await get_embeddings(embedding_input)
+    # Index the artifact's terms for hybrid search
+    sparse_vectors = None
+    if await has_sparse_vectors("Artifacts"):
+        sparse_vectors = [
+            encode_sparse_document(f"{artifact.title}\n{chunk}") for chunk in chunks
+        ]
 
     # Save embeddings to Qdrant
-    await insert_vector(
+    await insert_document_vectors(
         collection_name="Artifacts",
-        id=artifact.id,
-        payload=artifact.model_dump(),
-        vector=artifact_embeddings,
+        document_id=artifact.id,
+        payload=construct_payload_for_artifact(artifact),
+        vectors=artifact_embeddings,
+        sparse_vectors=sparse_vectors,
+        replace=replace,
     )
 
+    await artifact.set({Artifact.embedding_hash: content_hash})
+
+
+async def post_artifact_creation(ctx, id: str):
+    artifact = await Artifact.get(id)
+    if not artifact:
+        logger.warning(f"Artifact was deleted before being embedded: {id}")
+        return
+
+    logger.debug(f"Fetched artifact: {artifact.title}")
+
+    # A new artifact has no previous chunks to delete
+    await embed_artifact(artifact, replace=False)
+
     logger.success(f"Successfully embedded artifact: {artifact.title}")
+
+
+async def post_artifact_update(ctx, id: str):
+    artifact = await Artifact.get(id)
+    if not artifact:
+        logger.warning(f"Artifact was deleted before being re-embedded: {id}")
+        return
+
+    content_hash = construct_content_hash_for_artifact(artifact.title, artifact.body)
+
+    # Only the payload is refreshed when the embedded content did not change
+    if content_hash == artifact.embedding_hash:
+        await set_document_payload(
+            collection_name="Artifacts",
+            document_id=artifact.id,
+            payload=construct_payload_for_artifact(artifact),
+            chunk_count=len(chunk_embedding_text(artifact.body)),
+        )
+        logger.success(f"Content unchanged, updated payload of: {artifact.title}")
+        return
+
+    await embed_artifact(artifact)
+
+    logger.success(f"Successfully re-embedded artifact: {artifact.title}")
+
+
+async def post_artifact_deletion(ctx, id: str):
+    deleted = await delete_document_vectors(collection_name="Artifacts", document_id=id)
+
+    logger.success(f"Successfully deleted {deleted} vectors of artifact: {id}")
@@ -2,14 +2,20 @@ from arq.connections import RedisSettings
 from loguru import logger
 
 from app.clients.arq_client import close_arq_pool, get_arq
+from app.clients.mongo_client import get_pool_metrics
 from app.clients.redis_client import close_redis_connections
+from app.clients.vector_store_client import close_vector_store
 from app.core.config import settings
 from app.core.starters import initialize_worker
-from app.workers.artifacts.tasks import post_artifact_creation
+from app.workers.artifacts.tasks import (
+    post_artifact_creation,
+    post_artifact_deletion,
+    post_artifact_update,
+)
 
 # Worker Configuration
 NAME = "artifacts"
-FUNCTIONS = [post_artifact_creation]
+FUNCTIONS = [post_artifact_creation, post_artifact_update, post_artifact_deletion]
 
 
 # Setup function
@@ -28,7 +34,12 @@ async def shutdown(ctx):
     This function closes all Redis connections to prevent
     connection leaks when the worker is terminated.
     """
+    logger.info(f"MongoDB pool metrics: {get_pool_metrics()}")
+
     try:
+        # Flush the vectors still waiting to be upserted
+        await close_vector_store()
+
         # Close ARQ Redis pool
         await close_arq_pool()
 
@@ -51,3 +62,4 @@ class WorkerSettings:
         database=settings.REDIS_DB,
     )
     queue_name = NAME
+    max_jobs = settings.EMBEDDING_WORKER_MAX_JOBS
@@ -1,14 +1,24 @@
+import asyncio
+
 from loguru import logger
 
+from app.db.identity_map import get_document, with_identity_map
 from app.external.ai_service import get_embeddings
 from app.models.message import Message
-from app.utils.constructor_utils import construct_embedding_input_for_message
-from app.utils.qdrant_utils import insert_vector
+from app.utils.constructor_utils import (
+    construct_embedding_inputs_for_message,
+    construct_payload_for_message,
+)
+from app.utils.qdrant_utils import insert_document_vectors
 
 
+@with_identity_map
 async def post_message_creation(ctx, id: str):
 
-    message = await Message.get(id)
+    message = await get_document(Message, id)
+    if not message:
+        logger.warning(f"Message was deleted before being embedded: {id}")
+        return
     logger.debug(f"Fetched message: {id}")
 
     with logger.contextualize(
@@ -22,14 +32,19 @@ async def post_message_creation(ctx, id: str):
 
         logger.debug("Embedding message...")
 
-        embedding_input = await construct_embedding_input_for_message(message)
-        message_embeddings = await get_embeddings(embedding_input)
+        # Long messages are embedded as one point per chunk, the chunks are
+        # coalesced into batch requests with the ones of other jobs
+        embedding_inputs = await construct_embedding_inputs_for_message(message)
+        message_embeddings = await asyncio.gather(
+            *map(get_embeddings, embedding_inputs)
+        )
 
-        await insert_vector(
+        await insert_document_vectors(
             collection_name="Messages",
-            id=message.id,
-            payload=message.model_dump(),
-            vector=message_embeddings,
+            document_id=message.id,
+            payload=construct_payload_for_message(message),
+            vectors=message_embeddings,
+            replace=False,
         )
 
         logger.success(f"Successfully embedded message: {message.id}")
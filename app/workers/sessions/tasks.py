@@ -1,20 +1,31 @@
+import asyncio
+
+from beanie import Document
 from loguru import logger
+from openai import NotFoundError
+from qdrant_client.models import FieldCondition, Filter, MatchValue
 
 from app.clients.groq_client import get_groq_async_client
 from app.clients.openai_client import get_openai_async_client
 from app.core.config import settings
+from app.models.account import Account
+from app.models.artifact import Artifact
+from app.models.crm import Contact, Opportunity
 from app.models.message import Message
 from app.models.session import Session
-from app.schemas.types import SenderType
+from app.schemas.deletion import DeletionRead
+from app.schemas.types import DeletionResourceType, SenderType
+from app.utils.deletion_utils import get_deletion_progress, run_deletion_steps
+from app.utils.qdrant_utils import delete_vectors
 
 
 async def check_and_title_session(ctx, session_id: str):
     """
     Check if a session should be automatically titled and do so if needed.
 
-    This task is triggered after each user message. It counts the number of
-    user messages in the session, and if exactly 2 user messages exist,
-    it generates a concise title based on those messages and updates the session.
+    This task is triggered after each user message. It reads the session's user
+    message counter, and if exactly 2 user messages exist, it generates a
+    concise title based on those messages and updates the session.
 
     Parameters
     ----------
@@ -38,25 +49,24 @@ async def check_and_title_session(ctx, session_id: str):
             logger.debug("Session already has a custom title, skipping auto-titling")
             return
 
-        # Count user messages in the session
-        user_messages = await Message.find(
-            Message.session_id == session_id, Message.sender == SenderType.USER
-        ).to_list()
-
-        user_message_count = len(user_messages)
-        logger.debug(f"Found {user_message_count} user messages in session")
-
         # Only auto-title when there are exactly 2 user messages
-        if user_message_count != 2:
+        if session.user_message_count != 2:
             logger.debug(
-                f"Session has {user_message_count} user messages, not titling yet"
+                f"Session has {session.user_message_count} user messages, not titling yet"
             )
             return
 
         logger.info("Session has exactly 2 user messages, generating title...")
 
         # Get the first 2 user messages for context
-        first_two_messages = sorted(user_messages, key=lambda m: m.created_at)[:2]
+        first_two_messages = (
+            await Message.find(
+                Message.session_id == session_id, Message.sender == SenderType.USER
+            )
+            .sort(+Message.created_at)
+            .limit(2)
+            .to_list()
+        )
 
         # Generate title using AI service
         try:
@@ -168,3 +178,222 @@ async def _generate_session_title(messages: list[Message]) -> str:
                 title += "..."
             return title
         return "New Session"
+
+
+def _payload_filter(**conditions: str) -> Filter:
+    """
+    Build a Qdrant filter matching every given payload key and value.
+    """
+    return Filter(
+        must=[
+            FieldCondition(key=key, match=MatchValue(value=value))
+            for key, value in conditions.items()
+        ]
+    )
+
+
+async def _delete_documents(model: type[Document], *filters) -> int:
+    """
+    Delete every document of a model matching the filters with one `delete_many`.
+    """
+    result = await model.find(*filters).delete_many()
+    return result.deleted_count if result else 0
+
+
+async def _delete_vector_stores(vector_store_ids: list[str]) -> int:
+    """
+    Delete OpenAI vector stores, ignoring the ones already deleted.
+    """
+    openai = get_openai_async_client()
+    semaphore = asyncio.Semaphore(8)
+
+    async def delete_vector_store(vector_store_id: str) -> int:
+        async with semaphore:
+            try:
+                await openai.vector_stores.delete(vector_store_id)
+                return 1
+            except NotFoundError:
+                logger.warning(f"Vector store already deleted: {vector_store_id}")
+                return 0
+
+    return sum(await asyncio.gather(*map(delete_vector_store, vector_store_ids)))
+
+
+async def delete_session_cascade(
+    ctx, session_id: str, organization_id: str, vector_store_id: str | None
+):
+    """
+    Delete everything left behind by a deleted session.
+
+    Removes the session's Qdrant points first so they stop showing in searches,
+    then its messages, artifacts and OpenAI vector store, and finally the
+    session itself in case the request enqueuing the job failed to delete it.
+
+    Parameters
+    ----------
+    session_id : str
+        The ID of the deleted session.
+    organization_id : str
+        The organization of the deleted session.
+    vector_store_id : str | None
+        The ID of the session's OpenAI vector store.
+    """
+    progress = await get_deletion_progress(
+        DeletionResourceType.SESSION, session_id
+    ) or DeletionRead(
+        resource=DeletionResourceType.SESSION,
+        id=session_id,
+        organization_id=organization_id,
+    )
+
+    with logger.contextualize(session_id=session_id, organization_id=organization_id):
+        logger.info("Cascade deleting session...")
+
+        vector_filter = _payload_filter(session_id=session_id)
+        await run_deletion_steps(
+            progress,
+            [
+                (
+                    "message_vectors",
+                    lambda: delete_vectors("Messages", vector_filter),
+                ),
+                (
+                    "artifact_vectors",
+                    lambda: delete_vectors("Artifacts", vector_filter),
+                ),
+                (
+                    "messages",
+                    lambda: _delete_documents(
+                        Message, Message.session_id == session_id
+                    ),
+                ),
+                (
+                    "artifacts",
+                    lambda: _delete_documents(
+                        Artifact, Artifact.session_id == session_id
+                    ),
+                ),
+                (
+                    "vector_stores",
+                    lambda: _delete_vector_stores(
+                        [vector_store_id] if vector_store_id else []
+                    ),
+                ),
+                (
+                    "session",
+                    lambda: _delete_documents(
+                        Session,
+                        Session.id == session_id,
+                        Session.organization_id == organization_id,
+                    ),
+                ),
+            ],
+        )
+
+        logger.success(f"Session cascade deletion completed: {progress.deleted}")
+
+
+async def delete_account_cascade(ctx, account_id: str, organization_id: str):
+    """
+    Delete everything left behind by a deleted account.
+
+    Removes the account's Qdrant points first so they stop showing in searches,
+    then the OpenAI vector stores of its sessions, then its sessions, messages,
+    artifacts, opportunities and contacts, and finally the account itself in
+    case the request enqueuing the job failed to delete it.
+
+    Parameters
+    ----------
+    account_id : str
+        The ID of the deleted account.
+    organization_id : str
+        The organization of the deleted account.
+    """
+    progress = await get_deletion_progress(
+        DeletionResourceType.ACCOUNT, account_id
+    ) or DeletionRead(
+        resource=DeletionResourceType.ACCOUNT,
+        id=account_id,
+        organization_id=organization_id,
+    )
+
+    async def delete_session_vector_stores() -> int:
+        sessions = await Session.find(
+            Session.account_id == account_id,
+            Session.organization_id == organization_id,
+            Session.vector_store_id != None,  # noqa: E711
+        ).to_list()
+        return await _delete_vector_stores(
+            [session.vector_store_id for session in sessions]
+        )
+
+    with logger.contextualize(account_id=account_id, organization_id=organization_id):
+        logger.info("Cascade deleting account...")
+
+        vector_filter = _payload_filter(
+            account_id=account_id, organization_id=organization_id
+        )
+        await run_deletion_steps(
+            progress,
+            [
+                (
+                    "message_vectors",
+                    lambda: delete_vectors("Messages", vector_filter),
+                ),
+                (
+                    "artifact_vectors",
+                    lambda: delete_vectors("Artifacts", vector_filter),
+                ),
+                ("vector_stores", delete_session_vector_stores),
+                (
+                    "messages",
+                    lambda: _delete_documents(
+                        Message,
+                        Message.account_id == account_id,
+                        Message.organization_id == organization_id,
+                    ),
+                ),
+                (
+                    "artifacts",
+                    lambda: _delete_documents(
+                        Artifact,
+                        Artifact.account_id == account_id,
+                        Artifact.organization_id == organization_id,
+                    ),
+                ),
+                (
+                    "sessions",
+                    lambda: _delete_documents(
+                        Session,
+                        Session.account_id == account_id,
+                        Session.organization_id == organization_id,
+                    ),
+                ),
+                (
+                    "opportunities",
+                    lambda: _delete_documents(
+                        Opportunity,
+                        Opportunity.organization_id == organization_id,
+                        Opportunity.account_id == account_id,
+                    ),
+                ),
+                (
+                    "contacts",
+                    lambda: _delete_documents(
+                        Contact,
+                        Contact.organization_id == organization_id,
+                        Contact.account_id == account_id,
+                    ),
+                ),
+                (
+                    "account",
+                    lambda: _delete_documents(
+                        Account,
+                        Account.id == account_id,
+                        Account.organization_id == organization_id,
+                    ),
+                ),
+            ],
+        )
+
+        logger.success(f"Account cascade deletion completed: {progress.deleted}")
@@ -2,14 +2,19 @@ from arq.connections import RedisSettings
 from loguru import logger
 
 from app.clients.arq_client import close_arq_pool, get_arq
+from app.clients.mongo_client import get_pool_metrics
 from app.clients.redis_client import close_redis_connections
 from app.core.config import settings
 from app.core.starters import initialize_worker
-from app.workers.sessions.tasks import check_and_title_session
+from app.workers.sessions.tasks import (
+    check_and_title_session,
+    delete_account_cascade,
+    delete_session_cascade,
+)
 
 # Worker Configuration
 NAME = "sessions"
-FUNCTIONS = [check_and_title_session]
+FUNCTIONS = [check_and_title_session, delete_session_cascade, delete_account_cascade]
 
 
 # Setup function
@@ -28,6 +33,8 @@ async def shutdown(ctx):
     This function closes all Redis connections to prevent
     connection leaks when the worker is terminated.
     """
+    logger.info(f"MongoDB pool metrics: {get_pool_metrics()}")
+
     try:
         # Close ARQ Redis pool
         await close_arq_pool()
@@ -0,0 +1,66 @@
+import asyncio
+
+from pymongo import UpdateOne
+from tqdm.asyncio import tqdm_asyncio
+
+from app.db.init_mongo import init_db
+from app.models.message import Message
+from app.models.session import Session
+
+
+async def backfill_session_counters() -> None:
+    """
+    Backfill the activity counters of the sessions created before they existed.
+
+    Message counts and the last message date are aggregated per session in a
+    single pass over the messages, then written with bulk updates. Sessions
+    without messages get their creation date as last message date.
+    """
+    await init_db()
+
+    pipeline = [
+        {
+            "$group": {
+                "_id": "$session_id",
+                "user_message_count": {
+                    "$sum": {"$cond": [{"$eq": ["$sender", "user"]}, 1, 0]}
+                },
+                "assistant_message_count": {
+                    "$sum": {"$cond": [{"$eq": ["$sender", "assistant"]}, 1, 0]}
+                },
+                "last_message_at": {"$max": "$created_at"},
+            }
+        }
+    ]
+    stats = await Message.get_motor_collection().aggregate(pipeline).to_list(None)
+
+    updates = [
+        UpdateOne(
+            {"_id": stat.pop("_id")},
+            {"$set": stat},
+        )
+        for stat in stats
+    ]
+    sessions = Session.get_motor_collection()
+    for chunk in tqdm_asyncio(
+        [updates[i : i + 1_000] for i in range(0, len(updates), 1_000)],
+        desc="Updating sessions",
+    ):
+        await sessions.bulk_write(chunk, ordered=False)
+
+    await sessions.update_many(
+        {"last_message_at": {"$exists": False}},
+        [
+            {
+                "$set": {
+                    "user_message_count": 0,
+                    "assistant_message_count": 0,
+                    "last_message_at": "$created_at",
+                }
+            }
+        ],
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_session_counters())
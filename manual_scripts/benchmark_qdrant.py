@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+import argparse
+import asyncio
+import random
+import time
+from statistics import mean
+
+from qdrant_client import models
+from rich import print as rprint  # pretty console output
+from rich.table import Table
+
+from app.clients.qdrant_client import get_async_qdrant_client
+from app.db.init_qdrant import get_collection_config
+
+# Variants benchmarked against the exact search of the source collection
+VARIANTS = {
+    "float32": {"quantization": "none", "on_disk": False},
+    "scalar": {"quantization": "scalar", "on_disk": False},
+    "scalar_on_disk": {"quantization": "scalar", "on_disk": True},
+    "binary": {"quantization": "binary", "on_disk": False},
+    "binary_on_disk": {"quantization": "binary", "on_disk": True},
+}
+
+# Bytes held in RAM per vector dimension, for the quantized and original vectors
+QUANTIZED_BYTES_PER_DIMENSION = {"none": 0, "scalar": 1, "binary": 1 / 8}
+
+
+def _parse_args() -> argparse.Namespace:  # noqa: D401
+    """Parse CLI arguments."""
+    parser = argparse.ArgumentParser(description="Qdrant quantization benchmark")
+    parser.add_argument("--collection", default="Messages", help="Source collection")
+    parser.add_argument("--sample", type=int, default=5_000, help="Points to copy")
+    parser.add_argument("--queries", type=int, default=200, help="Held-out queries")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--hnsw-m", type=int, default=None)
+    parser.add_argument("--hnsw-ef-construct", type=int, default=None)
+    return parser.parse_args()
+
+
+async def _sample_points(collection: str, n: int) -> list[models.Record]:
+    """Return up to ``n`` points of the source collection, with their vectors."""
+    client = get_async_qdrant_client()
+
+    points: list[models.Record] = []
+    offset = None
+    while len(points) < n:
+        batch, offset = await client.scroll(
+            collection_name=collection,
+            limit=min(1_000, n - len(points)),
+            offset=offset,
+            with_vectors=True,
+            with_payload=False,
+        )
+        points.extend(batch)
+        if offset is None:
+            break
+    return points
+
+
+def _dense_vector(point: models.Record) -> list[float]:
+    """Return the dense vector of a point, stored by name next to sparse ones."""
+    if isinstance(point.vector, dict):
+        return point.vector[""]
+    return point.vector
+
+
+async def _wait_for_indexing(collection: str) -> None:
+    """Wait until the optimizers of a collection are done."""
+    client = get_async_qdrant_client()
+    while (
+        await client.get_collection(collection)
+    ).status != models.CollectionStatus.GREEN:
+        await asyncio.sleep(0.5)
+
+
+async def _search(
+    collection: str, queries: list[list[float]], top_k: int, params: models.SearchParams
+) -> tuple[list[set], list[float]]:
+    """Run every query and return the hit ids and latencies."""
+    client = get_async_qdrant_client()
+
+    hits, latencies = [], []
+    for query in queries:
+        t0 = time.perf_counter()
+        response = await client.query_points(
+            collection_name=collection,
+            query=query,
+            limit=top_k,
+            search_params=params,
+            with_payload=False,
+        )
+        latencies.append(time.perf_counter() - t0)
+        hits.append({point.id for point in response.points})
+    return hits, latencies
+
+
+def _estimated_ram_mb(count: int, dimensions: int, quantization: str, on_disk: bool):
+    """Estimate the RAM held by the vectors of a collection, ignoring the graph."""
+    bytes_per_vector = dimensions * QUANTIZED_BYTES_PER_DIMENSION[quantization]
+    if not on_disk:
+        bytes_per_vector += dimensions * 4
+    return count * bytes_per_vector / 1024**2
+
+
+async def run_benchmark() -> None:
+    """
+    Main entry-point.
+
+    1. Copy a sample of the source collection into one collection per variant.
+    2. Compute the exact top-k of held-out queries on the source collection.
+    3. Report the estimated RAM, latency and recall@k of every variant.
+    """
+    args = _parse_args()
+    client = get_async_qdrant_client()
+
+    points = await _sample_points(args.collection, args.sample + args.queries)
+    if len(points) <= args.queries:
+        rprint("[red]Not enough points in the source collection.[/red]")
+        return
+
+    random.shuffle(points)
+    queries = [_dense_vector(point) for point in points[: args.queries]]
+    corpus = [
+        models.PointStruct(id=point.id, vector=_dense_vector(point))
+        for point in points[args.queries :]
+    ]
+    dimensions = len(corpus[0].vector)
+
+    table = Table(title=f"{len(corpus)} points, {len(queries)} queries")
+    for column in ["variant", "est. RAM (MB)", "avg (ms)", "p95 (ms)", "recall@k"]:
+        table.add_column(column)
+
+    ground_truth = None
+    for name, variant in {"exact": VARIANTS["float32"], **VARIANTS}.items():
+        collection = f"benchmark_{name}"
+        await client.delete_collection(collection)
+        await client.create_collection(
+            collection_name=collection,
+            **get_collection_config(
+                quantization=variant["quantization"],
+                on_disk=variant["on_disk"],
+                hnsw_m=args.hnsw_m,
+                hnsw_ef_construct=args.hnsw_ef_construct,
+                dimensions=dimensions,
+            ),
+        )
+        try:
+            for i in range(0, len(corpus), 256):
+                await client.upsert(collection, corpus[i : i + 256], wait=True)
+            await _wait_for_indexing(collection)
+
+            params = models.SearchParams(
+                exact=name == "exact",
+                quantization=models.QuantizationSearchParams(
+                    rescore=True, oversampling=2.0
+                ),
+            )
+            hits, latencies = await _search(collection, queries, args.top_k, params)
+        finally:
+            await client.delete_collection(collection)
+
+        if ground_truth is None:
+            ground_truth = hits
+
+        recall = mean(
+            len(hit & truth) / max(len(truth), 1)
+            for hit, truth in zip(hits, ground_truth)
+        )
+        latencies.sort()
+        table.add_row(
+            name,
+            f"{_estimated_ram_mb(len(corpus), dimensions, variant['quantization'], variant['on_disk']):.1f}",
+            f"{mean(latencies) * 1000:.2f}",
+            f"{latencies[int(0.95 * len(latencies))] * 1000:.2f}",
+            f"{recall:.3f}",
+        )
+
+    rprint(table)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
@@ -0,0 +1,386 @@
+#!/usr/bin/env python
+"""
+Re-index a Qdrant collection from MongoDB without downtime.
+
+Documents are streamed from MongoDB in `_id` order, embedded with bounded
+concurrency and uploaded into a new versioned collection, e.g.
+`Messages_20250101T120000`. Once every document is indexed, the alias the app
+searches through (`Messages`) is atomically moved to the new collection. The
+documents created or updated during the re-index are then embedded again into
+it, and the points of the documents deleted in the meantime are dropped.
+
+Progress is checkpointed in Redis after each batch, running the command again
+resumes an interrupted re-index. Usage:
+
+    python -m manual_scripts.reindex_qdrant Messages --concurrency 16 --parallel 4
+
+Collections created before aliases were introduced are named after the alias.
+Replacing one deletes it right before the alias is created, with no collection
+left to roll back to, so it must be requested with `--replace-legacy-collection`.
+
+The new collection is created with the `EMBEDDING_DIMENSIONS` of this command,
+so the embeddings are resized by re-indexing with the new value, e.g.
+`EMBEDDING_DIMENSIONS=512`, then deploying it to the API and workers.
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import json
+import time
+from collections import Counter
+
+from beanie import Document
+from loguru import logger
+from qdrant_client import models
+from rich import print as rprint  # pretty console output
+
+from app.clients.qdrant_client import get_async_qdrant_client
+from app.clients.redis_client import get_redis_async_client
+from app.db.identity_map import identity_map_scope
+from app.db.init_mongo import init_db
+from app.db.init_qdrant import (
+    create_collection_if_not_exists,
+    create_payload_indexes_if_not_exist,
+    get_alias_target,
+    swap_collection_alias,
+)
+from app.external.ai_service import get_embeddings
+from app.models.artifact import Artifact
+from app.models.message import Message
+from app.utils.constructor_utils import (
+    chunk_embedding_text,
+    construct_embedding_input_for_artifact,
+    construct_embedding_inputs_for_message,
+    construct_payload_for_artifact,
+    construct_payload_for_message,
+)
+from app.utils.qdrant_utils import build_document_points
+from app.utils.sparse_utils import encode_sparse_document
+
+# Document model of each collection and whether it stores BM25 sparse vectors
+COLLECTIONS: dict[str, tuple[type[Document], bool]] = {
+    "Artifacts": (Artifact, True),
+    "Messages": (Message, False),
+}
+
+# Documents created or updated this long before the re-index started are
+# embedded again after the swap, to cover clock skew between the API and this
+# command.
+CATCH_UP_MARGIN = dt.timedelta(minutes=5)
+
+
+def _parse_args() -> argparse.Namespace:  # noqa: D401
+    """Parse CLI arguments."""
+    parser = argparse.ArgumentParser(description="Zero downtime Qdrant re-index")
+    parser.add_argument("collection", choices=list(COLLECTIONS))
+    parser.add_argument("--batch-size", type=int, default=256, help="Docs per batch")
+    parser.add_argument(
+        "--concurrency", type=int, default=16, help="Concurrent embedding requests"
+    )
+    parser.add_argument(
+        "--parallel", type=int, default=1, help="Parallel upload_points workers"
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="Ignore the saved checkpoint"
+    )
+    parser.add_argument(
+        "--drop-previous",
+        action="store_true",
+        help="Delete the collection the alias pointed to after the swap",
+    )
+    parser.add_argument(
+        "--replace-legacy-collection",
+        action="store_true",
+        help="Delete the pre-alias collection named after the alias at the swap",
+    )
+    return parser.parse_args()
+
+
+def _checkpoint_key(alias: str) -> str:
+    return f"reindex:{alias}"
+
+
+async def _load_checkpoint(alias: str) -> dict | None:
+    """Return the saved checkpoint of an alias, if any."""
+    redis = await get_redis_async_client()
+    raw = await redis.get(_checkpoint_key(alias))
+    return json.loads(raw) if raw else None
+
+
+async def _save_checkpoint(alias: str, checkpoint: dict) -> None:
+    redis = await get_redis_async_client()
+    await redis.set(_checkpoint_key(alias), json.dumps(checkpoint))
+
+
+async def _delete_checkpoint(alias: str) -> None:
+    redis = await get_redis_async_client()
+    await redis.delete(_checkpoint_key(alias))
+
+
+async def _build_document_points(
+    document: Document, sparse: bool
+) -> list[models.PointStruct]:
+    """Embed a document into the chunk points the workers would have upserted."""
+    sparse_vectors = None
+    if isinstance(document, Message):
+        embedding_inputs = await construct_embedding_inputs_for_message(document)
+        payload = construct_payload_for_message(document)
+    else:
+        chunks = chunk_embedding_text(document.body)
+        embedding_inputs = [
+            construct_embedding_input_for_artifact(
+                title=document.title, body=chunk, source="user"
+            )
+            for chunk in chunks
+        ]
+        payload = construct_payload_for_artifact(document)
+        if sparse:
+            sparse_vectors = [
+                encode_sparse_document(f"{document.title}\n{chunk}") for chunk in chunks
+            ]
+
+    vectors = await asyncio.gather(*map(get_embeddings, embedding_inputs))
+    return build_document_points(document.id, payload, vectors, sparse_vectors)
+
+
+async def _build_points(
+    documents: list[Document], sparse: bool, semaphore: asyncio.Semaphore
+) -> list[models.PointStruct]:
+    """Embed a batch of documents, skipping the ones that fail."""
+
+    async def build(document: Document) -> list[models.PointStruct]:
+        async with semaphore:
+            try:
+                return await _build_document_points(document, sparse)
+            except Exception as e:
+                logger.error(f"Skipping document {document.id}: {e}")
+                return []
+
+    # Sessions and users of the batch are fetched once through the identity map
+    with identity_map_scope():
+        points = await asyncio.gather(*(build(document) for document in documents))
+    return [point for document_points in points for point in document_points]
+
+
+async def _upload(
+    collection_name: str, points: list[models.PointStruct], parallel: int
+) -> None:
+    """Upload points with `upload_points`, which blocks, from a worker thread."""
+    client = get_async_qdrant_client()
+    await asyncio.to_thread(
+        client.upload_points,
+        collection_name=collection_name,
+        points=points,
+        batch_size=64,
+        parallel=parallel,
+        max_retries=3,
+        wait=True,
+    )
+
+
+async def _delete_stale_chunks(
+    collection_name: str, points: list[models.PointStruct]
+) -> None:
+    """
+    Delete the chunks left over from the previous, longer version of the
+    documents the points were built from.
+    """
+    chunk_counts = Counter(point.payload["id"] for point in points)
+    client = get_async_qdrant_client()
+    await client.delete(
+        collection_name=collection_name,
+        points_selector=models.FilterSelector(
+            filter=models.Filter(
+                should=[
+                    models.Filter(
+                        must=[
+                            models.FieldCondition(
+                                key="id", match=models.MatchValue(value=document_id)
+                            ),
+                            models.FieldCondition(
+                                key="chunk_index", range=models.Range(gte=chunk_count)
+                            ),
+                        ]
+                    )
+                    for document_id, chunk_count in chunk_counts.items()
+                ]
+            )
+        ),
+    )
+
+
+async def _index_documents(
+    collection_name: str,
+    model: type[Document],
+    sparse: bool,
+    args: argparse.Namespace,
+    checkpoint: dict | None = None,
+    changed_after: dt.datetime | None = None,
+) -> int:
+    """
+    Stream the documents of a model by `_id` and upload them batch by batch.
+
+    The last indexed `_id` is saved in the checkpoint after each batch. When
+    catching up on the documents changed after `changed_after`, the chunks left
+    over from their previous version are deleted.
+    """
+    semaphore = asyncio.Semaphore(args.concurrency)
+    last_id = checkpoint["last_id"] if checkpoint else None
+    indexed = 0
+
+    while True:
+        query = {}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        if changed_after is not None:
+            # Only artifacts are updated, messages have no `updated_at`
+            query["$or"] = [
+                {"created_at": {"$gte": changed_after}},
+                {"updated_at": {"$gte": changed_after}},
+            ]
+
+        documents = await model.find(query).sort("_id").limit(args.batch_size).to_list()
+        if not documents:
+            return indexed
+
+        started = time.perf_counter()
+        points = await _build_points(documents, sparse, semaphore)
+        if points:
+            await _upload(collection_name, points, args.parallel)
+            if changed_after is not None:
+                await _delete_stale_chunks(collection_name, points)
+
+        last_id = documents[-1].id
+        indexed += len(points)
+        if checkpoint is not None:
+            checkpoint["last_id"] = last_id
+            checkpoint["indexed"] += len(points)
+            await _save_checkpoint(checkpoint["alias"], checkpoint)
+
+        rprint(
+            f"[cyan]{collection_name}[/cyan] +{len(points)} points "
+            f"({len(points) / (time.perf_counter() - started):.0f}/s), "
+            f"last id {last_id}"
+        )
+
+
+async def _prune_deleted_documents(
+    collection_name: str, model: type[Document], batch_size: int
+) -> int:
+    """
+    Delete the points of the documents no longer in MongoDB.
+
+    Deletions made during the re-index only reached the previous collection.
+    """
+    client = get_async_qdrant_client()
+    offset = None
+    pruned = 0
+
+    while True:
+        points, offset = await client.scroll(
+            collection_name=collection_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=["id"],
+            with_vectors=False,
+        )
+
+        document_ids = {point.payload["id"] for point in points}
+        existing = await model.get_motor_collection().distinct(
+            "_id", {"_id": {"$in": list(document_ids)}}
+        )
+        deleted = document_ids - set(existing)
+        if deleted:
+            await client.delete(
+                collection_name=collection_name,
+                points_selector=models.FilterSelector(
+                    filter=models.Filter(
+                        must=[
+                            models.FieldCondition(
+                                key="id", match=models.MatchAny(any=list(deleted))
+                            )
+                        ]
+                    )
+                ),
+            )
+            pruned += len(deleted)
+
+        if offset is None:
+            return pruned
+
+
+async def reindex(args: argparse.Namespace) -> None:
+    """
+    Re-index a collection into a new versioned collection and swap its alias.
+    """
+    await init_db()
+    client = get_async_qdrant_client()
+
+    alias = args.collection
+    model, sparse = COLLECTIONS[alias]
+
+    # Fail before the bulk load rather than at the swap
+    if (
+        not args.replace_legacy_collection
+        and await get_alias_target(alias) is None
+        and await client.collection_exists(alias)
+    ):
+        rprint(
+            f"[red]'{alias}' is a collection, not an alias. Swapping deletes it "
+            f"with no rollback, pass --replace-legacy-collection to do so.[/red]"
+        )
+        return
+
+    checkpoint = None if args.restart else await _load_checkpoint(alias)
+    if checkpoint is None:
+        now = dt.datetime.now(dt.timezone.utc)
+        checkpoint = {
+            "alias": alias,
+            "collection_name": f"{alias}_{now:%Y%m%dT%H%M%S}",
+            "started_at": now.isoformat(),
+            "last_id": None,
+            "indexed": 0,
+        }
+        await _save_checkpoint(alias, checkpoint)
+    else:
+        rprint(
+            f"[yellow]Resuming {checkpoint['collection_name']} after "
+            f"{checkpoint['indexed']} points[/yellow]"
+        )
+
+    collection_name = checkpoint["collection_name"]
+    await create_collection_if_not_exists(collection_name, sparse=sparse)
+    await create_payload_indexes_if_not_exist(collection_name)
+
+    # Bulk load every document into the new collection
+    await _index_documents(collection_name, model, sparse, args, checkpoint)
+
+    # The app switches to the new collection atomically
+    previous = await swap_collection_alias(
+        alias, collection_name, args.replace_legacy_collection
+    )
+
+    # Workers wrote the documents created or updated since the start to the old
+    # collection, and only deleted the points of deleted documents from it
+    started_at = dt.datetime.fromisoformat(checkpoint["started_at"])
+    caught_up = await _index_documents(
+        collection_name, model, sparse, args, changed_after=started_at - CATCH_UP_MARGIN
+    )
+    pruned = await _prune_deleted_documents(collection_name, model, args.batch_size)
+
+    await _delete_checkpoint(alias)
+
+    if previous not in (None, collection_name) and args.drop_previous:
+        await client.delete_collection(previous)
+        rprint(f"[yellow]Deleted previous collection {previous}[/yellow]")
+
+    rprint(
+        f"[green]'{alias}' now points to {collection_name} "
+        f"({checkpoint['indexed']} points, {caught_up} caught up, "
+        f"{pruned} deleted documents pruned)[/green]"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(reindex(_parse_args()))
@@ -0,0 +1,79 @@
+import pytest
+
+from app.utils.chunking_utils import CHARACTERS_PER_TOKEN, chunk_text, count_tokens
+
+
+def _paragraph(i: int, words: int = 100) -> str:
+    return f"Paragraph {i}. " + " ".join(f"w{i}x{j}" for j in range(words)) + "."
+
+
+def test_count_tokens_rounds_up():
+    assert count_tokens("") == 0
+    assert count_tokens("a") == 1
+    assert count_tokens("a" * CHARACTERS_PER_TOKEN * 3) == 3
+
+
+@pytest.mark.parametrize("text", ["", "short text", "x" * 512 * CHARACTERS_PER_TOKEN])
+def test_texts_within_the_limit_are_a_single_chunk(text):
+    assert chunk_text(text, max_tokens=512, overlap_tokens=64) == [text]
+
+
+def test_chunks_respect_the_token_limit():
+    text = "\n\n".join(_paragraph(i) for i in range(20))
+
+    chunks = chunk_text(text, max_tokens=200, overlap_tokens=20)
+
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk) <= 200 for chunk in chunks)
+
+
+def test_chunks_end_on_paragraph_boundaries():
+    paragraphs = [_paragraph(i, words=40) for i in range(10)]
+
+    chunks = chunk_text("\n\n".join(paragraphs), max_tokens=200, overlap_tokens=0)
+
+    # Without overlap, the chunks are whole paragraphs joined back together
+    assert [paragraph for chunk in chunks for paragraph in chunk.split("\n\n")] == (
+        paragraphs
+    )
+
+
+def test_consecutive_chunks_overlap():
+    text = " ".join(f"word{i}" for i in range(2000))
+
+    chunks = chunk_text(text, max_tokens=100, overlap_tokens=20)
+
+    for previous, chunk in zip(chunks, chunks[1:]):
+        head = chunk.split()[:5]
+        assert " ".join(head) in previous
+        # The overlap starts on a word boundary
+        assert previous.split()[-1] in chunk.split()
+
+
+def test_chunks_cover_the_whole_text():
+    words = [f"word{i}" for i in range(2000)]
+
+    chunks = chunk_text(" ".join(words), max_tokens=100, overlap_tokens=20)
+
+    covered = {word for chunk in chunks for word in chunk.split()}
+    assert covered == set(words)
+    assert chunks[0].startswith("word0 ") and chunks[-1].endswith("word1999")
+
+
+def test_texts_without_boundaries_are_split_by_characters():
+    text = "x" * 1000
+
+    chunks = chunk_text(text, max_tokens=100, overlap_tokens=10)
+
+    assert all(len(chunk) <= 100 * CHARACTERS_PER_TOKEN for chunk in chunks)
+    assert "".join(chunks).count("x") >= len(text)
+
+
+def test_overlap_is_capped_to_half_of_the_chunk():
+    text = " ".join(f"word{i}" for i in range(1000))
+
+    chunks = chunk_text(text, max_tokens=50, overlap_tokens=500)
+
+    # An overlap as large as the chunk would never make progress
+    assert len(chunks) < 1000 / 5
+    assert all(count_tokens(chunk) <= 50 for chunk in chunks)
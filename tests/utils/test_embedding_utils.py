@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+
+from app.utils.embedding_utils import EmbeddingCoalescer
+
+
+class FakeEmbedder:
+    """
+    Batch embedding function recording its calls, failing on the batches
+    holding a text of `invalid`.
+    """
+
+    def __init__(self, invalid: set[str] = frozenset()):
+        self.calls: list[list[str]] = []
+        self.invalid = invalid
+
+    async def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(texts)
+        await asyncio.sleep(0)
+        if self.invalid.intersection(texts):
+            raise ValueError(f"Invalid input in {texts}")
+        return [[float(len(text))] for text in texts]
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_concurrent_requests_are_merged_and_deduplicated():
+    embedder = FakeEmbedder()
+
+    async def main():
+        coalescer = EmbeddingCoalescer(embedder, max_batch_size=100, window=0.01)
+        texts = ["a", "bb", "a", "ccc", "bb", "a"]
+        return await asyncio.gather(*map(coalescer.embed, texts))
+
+    results = _run(main())
+
+    assert results == [[1.0], [2.0], [1.0], [3.0], [2.0], [1.0]]
+    assert embedder.calls == [["a", "bb", "ccc"]]
+
+
+def test_full_batches_are_flushed_without_waiting_for_the_window():
+    embedder = FakeEmbedder()
+
+    async def main():
+        coalescer = EmbeddingCoalescer(embedder, max_batch_size=2, window=60)
+        return await asyncio.wait_for(
+            asyncio.gather(*map(coalescer.embed, ["a", "b", "c", "d"])), timeout=1
+        )
+
+    assert _run(main()) == [[1.0]] * 4
+    assert embedder.calls == [["a", "b"], ["c", "d"]]
+
+
+def test_texts_are_embedded_again_once_their_request_is_done():
+    embedder = FakeEmbedder()
+
+    async def main():
+        coalescer = EmbeddingCoalescer(embedder, max_batch_size=10, window=0)
+        await coalescer.embed("a")
+        await coalescer.embed("a")
+
+    _run(main())
+
+    assert embedder.calls == [["a"], ["a"]]
+
+
+def test_failed_batches_are_retried_text_by_text():
+    embedder = FakeEmbedder(invalid={"bad"})
+
+    async def main():
+        coalescer = EmbeddingCoalescer(embedder, max_batch_size=10, window=0.01)
+        return await asyncio.gather(
+            *map(coalescer.embed, ["a", "bad", "bb", "bad"]), return_exceptions=True
+        )
+
+    a, bad, bb, bad_again = _run(main())
+
+    assert a == [1.0] and bb == [2.0]
+    assert isinstance(bad, ValueError) and bad_again is bad
+    assert embedder.calls[0] == ["a", "bad", "bb"]
+    assert sorted(embedder.calls[1:]) == [["a"], ["bad"], ["bb"]]
+
+
+def test_single_text_failures_are_not_retried():
+    embedder = FakeEmbedder(invalid={"bad"})
+
+    async def main():
+        coalescer = EmbeddingCoalescer(embedder, max_batch_size=10, window=0)
+        await coalescer.embed("bad")
+
+    with pytest.raises(ValueError):
+        _run(main())
+    assert embedder.calls == [["bad"]]
+
+
+def test_cancelled_callers_do_not_cancel_shared_requests():
+    embedder = FakeEmbedder()
+
+    async def main():
+        coalescer = EmbeddingCoalescer(embedder, max_batch_size=10, window=0.01)
+        cancelled = asyncio.create_task(coalescer.embed("a"))
+        waiting = asyncio.create_task(coalescer.embed("a"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        return await waiting
+
+    assert _run(main()) == [1.0]
+    assert embedder.calls == [["a"]]
+
+
+def test_short_batch_results_fail_the_missing_texts():
+    async def embed_batch(texts: list[str]) -> list[list[float]]:
+        # Drops the embedding of the last text of every batch
+        return [[float(len(text))] for text in texts[:-1]]
+
+    async def main():
+        coalescer = EmbeddingCoalescer(embed_batch, max_batch_size=10, window=0.01)
+        results = await asyncio.wait_for(
+            asyncio.gather(*map(coalescer.embed, ["a", "bb"]), return_exceptions=True),
+            timeout=1,
+        )
+        return coalescer, results
+
+    coalescer, results = _run(main())
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert coalescer._inflight == {}
+
+
+def test_cancelled_batches_fail_their_callers():
+    started = None
+
+    async def embed_batch(texts: list[str]) -> list[list[float]]:
+        started.set()
+        await asyncio.Event().wait()
+
+    async def main():
+        nonlocal started
+        started = asyncio.Event()
+        coalescer = EmbeddingCoalescer(embed_batch, max_batch_size=10, window=0)
+        callers = asyncio.gather(
+            *map(coalescer.embed, ["a", "bb"]), return_exceptions=True
+        )
+        await started.wait()
+        for flush in coalescer._flushes:
+            flush.cancel()
+        results = await asyncio.wait_for(callers, timeout=1)
+        return coalescer, results
+
+    coalescer, results = _run(main())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert coalescer._inflight == {}
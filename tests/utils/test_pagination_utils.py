@@ -0,0 +1,64 @@
+import datetime as dt
+
+import pytest
+
+from app.utils.pagination_utils import _keyset_condition, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = dt.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=dt.timezone.utc)
+
+    cursor = encode_cursor(created_at, "abc123")
+
+    assert decode_cursor(cursor) == (created_at, "abc123")
+
+
+def test_cursor_is_url_safe_and_unpadded():
+    created_at = dt.datetime(2025, 1, 1, tzinfo=dt.timezone.utc)
+
+    # Ids of different lengths cover every base64 padding length
+    for id in ["a", "ab", "abc", "ab/c+?=&"]:
+        cursor = encode_cursor(created_at, id)
+
+        assert "=" not in cursor
+        assert "+" not in cursor and "/" not in cursor
+        assert decode_cursor(cursor) == (created_at, id)
+
+
+def test_cursor_keeps_the_offset_of_aware_dates():
+    created_at = dt.datetime(2025, 1, 1, 12, tzinfo=dt.timezone(dt.timedelta(hours=2)))
+
+    decoded, _ = decode_cursor(encode_cursor(created_at, "id"))
+
+    assert decoded == created_at
+    assert decoded.utcoffset() == dt.timedelta(hours=2)
+
+
+def test_naive_cursor_dates_are_read_as_utc():
+    cursor = encode_cursor(dt.datetime(2025, 1, 1), "id")
+
+    created_at, _ = decode_cursor(cursor)
+
+    assert created_at == dt.datetime(2025, 1, 1, tzinfo=dt.timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "cursor", ["", "not-a-cursor", "W10", "WyJub3QgYSBkYXRlIiwgImlkIl0"]
+)
+def test_malformed_cursors_raise_value_error(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+def test_keyset_condition_breaks_date_ties_by_id():
+    created_at = dt.datetime(2025, 1, 1, tzinfo=dt.timezone.utc)
+    cursor = encode_cursor(created_at, "m")
+
+    condition = _keyset_condition(cursor, "$lt", "updated_at")
+
+    assert condition == {
+        "$or": [
+            {"updated_at": {"$lt": created_at}},
+            {"updated_at": created_at, "_id": {"$lt": "m"}},
+        ]
+    }
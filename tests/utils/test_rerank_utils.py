@@ -0,0 +1,97 @@
+import pytest
+from qdrant_client.models import PointGroup, ScoredPoint
+
+from app.utils.rerank_utils import collapse_chunks, flatten_groups, mmr_rerank
+
+
+def _point(id: str, score: float, vector=None, **payload) -> ScoredPoint:
+    return ScoredPoint(
+        id=id, version=0, score=score, payload={"id": id, **payload}, vector=vector
+    )
+
+
+def _ids(points: list[ScoredPoint]) -> list[str]:
+    return [point.id for point in points]
+
+
+def test_flatten_groups_orders_every_hit_by_score():
+    groups = [
+        PointGroup(id="s1", hits=[_point("a", 0.9), _point("b", 0.5)]),
+        PointGroup(id="s2", hits=[_point("c", 0.7)]),
+    ]
+
+    assert _ids(flatten_groups(groups)) == ["a", "c", "b"]
+
+
+def test_mmr_pushes_near_duplicates_down():
+    query = [1.0, 0.0]
+    points = [
+        _point("a", 0.99, [1.0, 0.05]),
+        _point("a_copy", 0.98, [1.0, 0.06]),
+        _point("other", 0.6, [0.6, 0.8]),
+    ]
+
+    assert _ids(mmr_rerank(query, points, top_k=2, lambda_=1.0)) == ["a", "a_copy"]
+    assert _ids(mmr_rerank(query, points, top_k=2, lambda_=0.3)) == ["a", "other"]
+
+
+def test_mmr_with_full_relevance_keeps_the_similarity_order():
+    query = [1.0, 0.0]
+    points = [
+        _point("far", 0.1, [0.0, 1.0]),
+        _point("near", 0.9, [1.0, 0.1]),
+        _point("mid", 0.5, [1.0, 1.0]),
+    ]
+
+    reranked = mmr_rerank(query, points, top_k=3, lambda_=1.0)
+
+    assert _ids(reranked) == ["near", "mid", "far"]
+
+
+def test_mmr_returns_at_most_top_k_distinct_points():
+    points = [_point(str(i), 1.0, [1.0, float(i)]) for i in range(5)]
+
+    reranked = mmr_rerank([1.0, 0.0], points, top_k=3)
+
+    assert len(reranked) == 3
+    assert len(set(_ids(reranked))) == 3
+
+
+def test_mmr_reads_the_dense_vector_of_named_vectors():
+    points = [
+        _point("a", 0.9, {"": [1.0, 0.0]}),
+        _point("b", 0.8, {"": [0.0, 1.0]}),
+    ]
+
+    assert _ids(mmr_rerank([0.0, 1.0], points, top_k=2)) == ["b", "a"]
+
+
+def test_mmr_requires_the_vectors():
+    points = [_point("a", 0.9, [1.0, 0.0]), _point("b", 0.8)]
+
+    with pytest.raises(ValueError):
+        mmr_rerank([1.0, 0.0], points, top_k=2)
+
+
+@pytest.mark.parametrize("count", [0, 1])
+def test_mmr_returns_trivial_inputs_unchanged(count):
+    points = [_point("a", 0.9)][:count]
+
+    assert mmr_rerank([1.0, 0.0], points, top_k=5) == points
+
+
+def _chunk(point_id: str, document_id: str, score: float) -> ScoredPoint:
+    return ScoredPoint(id=point_id, version=0, score=score, payload={"id": document_id})
+
+
+def test_collapse_chunks_keeps_the_best_chunk_of_each_document():
+    points = [
+        _chunk("a1", "a", 0.9),
+        _chunk("b0", "b", 0.8),
+        _chunk("a0", "a", 0.7),
+        _chunk("c3", "c", 0.6),
+    ]
+
+    assert _ids(collapse_chunks(points)) == ["a1", "b0", "c3"]
+    assert _ids(collapse_chunks(points, limit=2)) == ["a1", "b0"]
+    assert collapse_chunks([]) == []
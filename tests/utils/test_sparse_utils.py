@@ -0,0 +1,74 @@
+import zlib
+
+import pytest
+
+from app.utils.sparse_utils import (
+    BM25_K1,
+    encode_sparse_document,
+    encode_sparse_query,
+    tokenize,
+)
+
+
+def _weights(vector) -> dict[int, float]:
+    return dict(zip(vector.indices, vector.values))
+
+
+def test_tokenize_lowercases_and_drops_stopwords():
+    assert tokenize("The Quick brown FOX is at the door") == [
+        "quick",
+        "brown",
+        "fox",
+        "door",
+    ]
+
+
+def test_tokenize_keeps_compound_terms_and_their_parts():
+    assert tokenize("Mail jane.doe@acme.io about BRK.B") == [
+        "mail",
+        "jane.doe@acme.io",
+        "jane",
+        "doe",
+        "acme",
+        "io",
+        "about",
+        "brk.b",
+        "brk",
+        "b",
+    ]
+
+
+def test_term_indices_are_stable_crc32_hashes():
+    vector = encode_sparse_query("ticker")
+
+    # The indices must be identical in every process and across restarts
+    assert vector.indices == [zlib.crc32(b"ticker")]
+
+
+def test_document_term_frequencies_saturate():
+    weights = _weights(encode_sparse_document("apple " * 1000))
+
+    (weight,) = weights.values()
+    assert 1 < weight < BM25_K1 + 1
+
+
+def test_longer_documents_weigh_their_terms_less():
+    short = _weights(encode_sparse_document("apple pie"))
+    long = _weights(encode_sparse_document("apple " + "filler " * 500))
+
+    index = zlib.crc32(b"apple")
+    assert long[index] < short[index]
+
+
+def test_query_has_one_unit_weight_per_distinct_term():
+    weights = _weights(encode_sparse_query("apple apple pie"))
+
+    assert sorted(weights) == sorted([zlib.crc32(b"apple"), zlib.crc32(b"pie")])
+    assert set(weights.values()) == {1.0}
+
+
+@pytest.mark.parametrize("text", ["", "the and of"])
+def test_texts_without_terms_encode_to_empty_vectors(text):
+    vector = encode_sparse_document(text)
+
+    assert vector.indices == [] and vector.values == []
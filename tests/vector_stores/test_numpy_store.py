@@ -0,0 +1,237 @@
+import asyncio
+import datetime as dt
+
+import pytest
+from qdrant_client.models import (
+    DatetimeRange,
+    FieldCondition,
+    Filter,
+    GeoPoint,
+    GeoRadius,
+    HasIdCondition,
+    IsEmptyCondition,
+    IsNullCondition,
+    MatchAny,
+    MatchExcept,
+    MatchText,
+    MatchValue,
+    PayloadField,
+    PointStruct,
+    Range,
+)
+
+from app.utils.sparse_utils import (
+    SPARSE_VECTOR_NAME,
+    encode_sparse_document,
+    encode_sparse_query,
+)
+from app.vector_stores.numpy_store import NumpyVectorStore
+
+PAYLOADS = {
+    "a": {
+        "account_id": "acc1",
+        "type": "note",
+        "tags": ["red", "blue"],
+        "size": 1,
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "meta": {"lang": "en"},
+        "title": "Quarterly report",
+    },
+    "b": {
+        "account_id": "acc1",
+        "type": "memo",
+        "tags": ["green"],
+        "size": 5,
+        "created_at": "2025-02-01T00:00:00+00:00",
+        "meta": {"lang": "fr"},
+        "title": "Meeting notes",
+        "parent_id": None,
+    },
+    "c": {
+        "account_id": "acc2",
+        "type": "note",
+        "tags": [],
+        "size": 10,
+        "created_at": "2025-03-01T00:00:00+00:00",
+        "title": "Quarterly forecast",
+    },
+}
+
+
+@pytest.fixture
+def store() -> NumpyVectorStore:
+    store = NumpyVectorStore()
+    for i, (id, payload) in enumerate(PAYLOADS.items()):
+        vector = [0.0, 0.0, 0.0]
+        vector[i] = 1.0
+        asyncio.run(
+            store.upsert("Test", PointStruct(id=id, vector=vector, payload=payload))
+        )
+    return store
+
+
+def _ids(store: NumpyVectorStore, filter: Filter) -> set[str]:
+    points = asyncio.run(store.search("Test", [1.0, 1.0, 1.0], 10, filter=filter))
+    return {point.id for point in points}
+
+
+def _must(*conditions) -> Filter:
+    return Filter(must=list(conditions))
+
+
+@pytest.mark.parametrize(
+    "filter, expected",
+    [
+        (_must(FieldCondition(key="account_id", match=MatchValue(value="acc1"))), "ab"),
+        (_must(FieldCondition(key="type", match=MatchAny(any=["memo", "x"]))), "b"),
+        (_must(FieldCondition(key="tags", match=MatchValue(value="blue"))), "a"),
+        (_must(FieldCondition(key="tags", match=MatchAny(any=["green", "red"]))), "ab"),
+        (
+            _must(
+                FieldCondition(key="type", match=MatchExcept(**{"except": ["note"]}))
+            ),
+            "b",
+        ),
+        (_must(FieldCondition(key="title", match=MatchText(text="Quarterly"))), "ac"),
+        (_must(FieldCondition(key="meta.lang", match=MatchValue(value="fr"))), "b"),
+        (_must(FieldCondition(key="size", range=Range(gte=5))), "bc"),
+        (_must(FieldCondition(key="size", range=Range(gt=1, lt=10))), "b"),
+        (
+            _must(
+                FieldCondition(
+                    key="created_at",
+                    range=DatetimeRange(
+                        lt=dt.datetime(2025, 2, 15, tzinfo=dt.timezone.utc)
+                    ),
+                )
+            ),
+            "ab",
+        ),
+        (_must(HasIdCondition(has_id=["a", "c"])), "ac"),
+        (_must(IsEmptyCondition(is_empty=PayloadField(key="tags"))), "c"),
+        (_must(IsNullCondition(is_null=PayloadField(key="parent_id"))), "b"),
+    ],
+)
+def test_conditions(store, filter, expected):
+    assert _ids(store, filter) == set(expected)
+
+
+def test_must_not_and_should(store):
+    filter = Filter(
+        should=[
+            FieldCondition(key="type", match=MatchValue(value="memo")),
+            FieldCondition(key="account_id", match=MatchValue(value="acc2")),
+        ],
+        must_not=[FieldCondition(key="size", range=Range(gte=10))],
+    )
+
+    assert _ids(store, filter) == {"b"}
+
+
+def test_nested_filters(store):
+    filter = _must(
+        Filter(
+            must_not=[FieldCondition(key="account_id", match=MatchValue(value="acc2"))]
+        )
+    )
+
+    assert _ids(store, filter) == {"a", "b"}
+
+
+def test_filters_see_payload_updates_and_deletions(store):
+    condition = _must(FieldCondition(key="type", match=MatchValue(value="note")))
+    assert _ids(store, condition) == {"a", "c"}
+
+    asyncio.run(store.set_payload("Test", "b", {**PAYLOADS["b"], "type": "note"}))
+    asyncio.run(store.delete("Test", ["a"]))
+
+    assert _ids(store, condition) == {"b", "c"}
+
+
+def test_delete_by_filter(store):
+    filter = _must(FieldCondition(key="account_id", match=MatchValue(value="acc1")))
+
+    deleted = asyncio.run(store.delete_by_filter("Test", filter))
+
+    assert deleted == 2
+    assert _ids(store, Filter()) == {"c"}
+
+
+def test_unsupported_conditions_raise_value_error(store):
+    filter = _must(
+        FieldCondition(
+            key="location",
+            geo_radius=GeoRadius(center=GeoPoint(lon=0.0, lat=0.0), radius=1.0),
+        )
+    )
+
+    with pytest.raises(ValueError, match="Unsupported field condition"):
+        _ids(store, filter)
+
+
+def test_search_orders_by_similarity_and_applies_threshold(store):
+    points = asyncio.run(store.search("Test", [1.0, 0.5, 0.0], 10, score_threshold=0.1))
+
+    assert [point.id for point in points] == ["a", "b"]
+    assert points[0].score > points[1].score
+
+
+def _hybrid_store() -> NumpyVectorStore:
+    store = NumpyVectorStore()
+    asyncio.run(store.initialize())
+    texts = {
+        "dense": "quarterly revenue review",
+        "rare": "acme widgets",
+        "common": "weekly update",
+        "other": "weekly update call",
+        "more": "weekly update notes",
+    }
+    for i, (id, text) in enumerate(texts.items()):
+        vector = [0.0] * len(texts)
+        vector[i] = 1.0
+        asyncio.run(
+            store.upsert(
+                "Artifacts",
+                PointStruct(
+                    id=id,
+                    vector={
+                        "": vector,
+                        SPARSE_VECTOR_NAME: encode_sparse_document(text),
+                    },
+                ),
+            )
+        )
+    return store
+
+
+def _hybrid_ids(store: NumpyVectorStore, **kwargs) -> list[str]:
+    points = asyncio.run(
+        store.hybrid_search(
+            "Artifacts",
+            [1.0, 0.0, 0.0, 0.0, 0.0],
+            encode_sparse_query("acme weekly"),
+            10,
+            score_threshold=0.5,
+            **kwargs,
+        )
+    )
+    return [point.id for point in points]
+
+
+def test_hybrid_search_fuses_dense_and_sparse_candidates():
+    store = _hybrid_store()
+
+    assert _hybrid_ids(store)[0] in {"dense", "rare"}
+    assert set(_hybrid_ids(store)) == {"dense", "rare", "common", "other", "more"}
+
+
+def test_hybrid_search_drops_sparse_candidates_under_the_bm25_threshold():
+    store = _hybrid_store()
+
+    assert set(_hybrid_ids(store, sparse_score_threshold=1.0)) == {"dense", "rare"}
+
+
+def test_hybrid_search_caps_the_sparse_candidates():
+    store = _hybrid_store()
+
+    assert _hybrid_ids(store, sparse_limit=1) == ["dense", "rare"]